@@ -0,0 +1,7 @@
+"""Micro-benchmarks of the compliance pipeline.
+
+Run from the repository root (with the package installed or `src` on
+`PYTHONPATH`):
+
+    $ python -m benchmarks --output results.json
+"""
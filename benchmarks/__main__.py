@@ -0,0 +1,79 @@
+"""Runs the benchmark suite and writes results as JSON.
+
+Typical usage example:
+
+    $ python -m benchmarks --output results.json
+    $ python -m benchmarks -k resolve_schema --rounds 50
+"""
+import argparse
+import json
+import sys
+
+from benchmarks.harness import run
+
+
+def main(args_in=None):  # pylint: disable=C0116
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description="Runs guard-rail benchmarks"
+    )
+    parser.add_argument(
+        "-k",
+        dest="name_filter",
+        type=str,
+        default=None,
+        help="Should specify substring of benchmark names (module::function[case]) to run",
+    )
+    parser.add_argument(
+        "--output",
+        dest="output",
+        type=str,
+        default=None,
+        help="Should specify file to write JSON results to (stdout by default)",
+    )
+    parser.add_argument(
+        "--rounds",
+        dest="rounds",
+        type=int,
+        default=20,
+        help="Number of measured rounds per benchmark",
+    )
+    parser.add_argument(
+        "--min-time",
+        dest="min_time",
+        type=float,
+        default=0.002,
+        help="Minimal duration of a round in seconds",
+    )
+    parser.add_argument(
+        "--max-time",
+        dest="max_time",
+        type=float,
+        default=1.0,
+        help="Time budget per benchmark in seconds",
+    )
+    args = parser.parse_args(args=args_in)
+
+    results = run(
+        name_filter=args.name_filter,
+        rounds=args.rounds,
+        min_time=args.min_time,
+        max_time=args.max_time,
+    )
+    for result in results["benchmarks"]:
+        summary = (
+            f"median {result['stats']['median'] * 1e6:12.1f}us "
+            f"iqr {result['stats']['iqr'] * 1e6:10.1f}us"
+            if "stats" in result
+            else f"error {result['error']}"
+        )
+        print(f"{result['fullname']:<80} {summary}", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+
+
+if __name__ == "__main__":
+    main()
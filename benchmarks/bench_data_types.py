@@ -0,0 +1,77 @@
+"""Benchmarks of compliance result operations"""
+from rpdk.guard_rail.core.data_types import (
+    GuardRuleResult,
+    GuardRuleSetResult,
+    GuardRuleSetResultBuilder,
+    ResultTable,
+)
+
+SIZES = (10, 1000)
+
+
+def _result(rules: int, offset: int = 0) -> GuardRuleSetResult:
+    def __rule_results(prefix):
+        return {
+            f"{prefix}_{index}": {
+                GuardRuleResult(
+                    check_id=f"{prefix.upper()}{index:04d}",
+                    message=f"{prefix} message {index}",
+                    path=f"/properties/Property{index}/{path}",
+                )
+                for path in range(3)
+            }
+            for index in range(offset, offset + rules)
+        }
+
+    return GuardRuleSetResult(
+        compliant=[f"compliant_{index}" for index in range(offset, offset + rules)],
+        non_compliant=__rule_results("non_compliant"),
+        warning=__rule_results("warning"),
+        skipped=[f"skipped_{index}" for index in range(offset, offset + rules)],
+    )
+
+
+def bench_merge(benchmark):
+    """Merges two results of the given number of rules each"""
+    for size in SIZES:
+        other = _result(size, offset=size)
+        benchmark(
+            f"rules={size}",
+            GuardRuleSetResult.merge,
+            setup=lambda size=size, other=other: ((_result(size), other), {}),
+        )
+
+
+def bench_builder(benchmark):
+    """Accumulates the given number of single rule results and builds the result"""
+
+    def __accumulate(results):
+        builder = GuardRuleSetResultBuilder()
+        for result in results:
+            builder.merge(result)
+        return builder.build()
+
+    for size in SIZES:
+        results = [_result(1, offset=index) for index in range(size)]
+        benchmark(f"results={size}", __accumulate, results)
+
+
+def bench_json(benchmark):
+    """Translates result of the given number of rules into JSON document"""
+    for size in SIZES:
+        result = _result(size)
+        benchmark(f"rules={size}", lambda result=result: result.json)
+
+
+def bench_result_table(benchmark):
+    """Stores failed checks of the given number of schema results in columns"""
+
+    def __tabulate(results):
+        table = ResultTable()
+        for schema_idx, result in enumerate(results):
+            table.add(schema_idx, result)
+        return table
+
+    for size in SIZES:
+        results = [_result(10) for _ in range(size)]
+        benchmark(f"results={size}", __tabulate, results)
@@ -0,0 +1,33 @@
+"""Benchmarks of compliance result renderers"""
+import io
+
+from rpdk.guard_rail.core.data_types import GuardRuleResult, GuardRuleSetResult
+from rpdk.guard_rail.utils.render import RENDERERS, render
+
+SIZES = (10, 1000)
+
+
+def _result(checks: int) -> GuardRuleSetResult:
+    non_compliant = {}
+    for index in range(checks):
+        non_compliant.setdefault(f"rule_{index % 40}", set()).add(
+            GuardRuleResult(
+                check_id=f"ID{index % 40:03d}",
+                message=f"property violates rule {index % 40}",
+                path=f"/properties/Property{index}",
+            )
+        )
+    return GuardRuleSetResult(non_compliant=non_compliant)
+
+
+def bench_render(benchmark):
+    """Renders result of the given number of failed checks into a string buffer"""
+    for size in SIZES:
+        result = _result(size)
+        for renderer in RENDERERS:
+            benchmark(
+                f"{renderer}-checks={size}",
+                lambda result=result, renderer=renderer: render(
+                    result, renderer=renderer, stream=io.StringIO()
+                ),
+            )
@@ -0,0 +1,14 @@
+"""Benchmarks of rule set preparation"""
+from rpdk.guard_rail.core.ruleset import RuleSet, prepare_ruleset
+
+
+def bench_prepare_ruleset(benchmark):
+    """Reads built-in rule files of each mode"""
+    benchmark("stateless", prepare_ruleset, "stateless")
+    benchmark("read_only", prepare_ruleset, "stateless", True)
+    benchmark("stateful", prepare_ruleset, "stateful")
+
+
+def bench_ruleset(benchmark):
+    """Compiles built-in rule library"""
+    benchmark("builtin", RuleSet)
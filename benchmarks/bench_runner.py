@@ -0,0 +1,24 @@
+"""Benchmarks of guard evaluation per built-in rule file"""
+from copy import deepcopy
+
+import cfn_guard_rs
+
+from benchmarks.inputs import schemas
+from rpdk.guard_rail.core.ruleset import RuleSet, rule_file_name
+from rpdk.guard_rail.utils.schema_utils import add_paths_to_schema
+
+SCHEMAS = ("sample-schema", "synthetic-1000-recursive")
+
+
+def bench_run_checks(benchmark):
+    """Runs guard with a single built-in rule file over prepared schemas"""
+    rules = sorted(RuleSet().stateless.rules, key=rule_file_name)
+    for schema_name in SCHEMAS:
+        schema = add_paths_to_schema(deepcopy(schemas()[schema_name]))
+        for rule_file in rules:
+            benchmark(
+                f"{rule_file_name(rule_file)}-{schema_name}",
+                cfn_guard_rs.run_checks,
+                schema,
+                rule_file,
+            )
@@ -0,0 +1,49 @@
+"""Scaling curves of resolver, path enumerator and differ over generated schemas"""
+from copy import deepcopy
+
+from rpdk.guard_rail.benchmark.generator import (
+    SchemaShape,
+    generate_schema,
+    next_version,
+)
+from rpdk.guard_rail.core.stateful import schema_diff
+from rpdk.guard_rail.utils.schema_utils import _fetch_all_paths, resolve_schema
+
+SHAPES = {
+    f"properties={properties},depth={depth}": SchemaShape(
+        properties=properties,
+        depth=depth,
+        definitions=properties // 10,
+        fan_out=3,
+        recursive=True,
+    )
+    for properties, depth in ((10, 2), (100, 4), (1000, 4), (1000, 8))
+}
+
+
+def _fresh_copies(*documents):
+    return lambda: (tuple(deepcopy(document) for document in documents), {})
+
+
+def bench_resolve_schema_scaling(benchmark):
+    """Resolves refs of schemas of growing shape"""
+    for name, shape in SHAPES.items():
+        benchmark(name, resolve_schema, setup=_fresh_copies(generate_schema(shape)))
+
+
+def bench_fetch_all_paths_scaling(benchmark):
+    """Collects property paths of schemas of growing shape"""
+    for name, shape in SHAPES.items():
+        benchmark(name, _fetch_all_paths, setup=_fresh_copies(generate_schema(shape)))
+
+
+def bench_schema_diff_scaling(benchmark):
+    """Diffs schemas of growing shape with their next version"""
+    for name, shape in SHAPES.items():
+        schema = generate_schema(shape)
+        setup = _fresh_copies(schema, next_version(schema, changes=20))
+        benchmark(
+            name,
+            schema_diff,
+            setup=lambda setup=setup: (setup()[0], {"print_diff_to_console": False}),
+        )
@@ -0,0 +1,31 @@
+"""Benchmarks of schema resolution and path collection"""
+from copy import deepcopy
+
+from benchmarks.inputs import schemas
+from rpdk.guard_rail.utils.schema_utils import (
+    _fetch_all_paths,
+    add_paths_to_schema,
+    resolve_schema,
+)
+
+
+def _fresh_copy(schema):
+    return lambda: ((deepcopy(schema),), {})
+
+
+def bench_resolve_schema(benchmark):
+    """Resolves refs of each schema"""
+    for name, schema in schemas().items():
+        benchmark(name, resolve_schema, setup=_fresh_copy(schema))
+
+
+def bench_fetch_all_paths(benchmark):
+    """Collects property paths of each schema"""
+    for name, schema in schemas().items():
+        benchmark(name, _fetch_all_paths, setup=_fresh_copy(schema))
+
+
+def bench_add_paths_to_schema(benchmark):
+    """Adds property paths to each schema, as done before running guard"""
+    for name, schema in schemas().items():
+        benchmark(name, add_paths_to_schema, setup=_fresh_copy(schema))
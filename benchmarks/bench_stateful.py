@@ -0,0 +1,32 @@
+"""Benchmarks of schema difference"""
+from copy import deepcopy
+
+from benchmarks.inputs import schema_pairs
+from rpdk.guard_rail.core.stateful import (
+    _structural_diff,
+    _translate_meta_diff,
+    schema_diff,
+)
+from rpdk.guard_rail.utils.schema_utils import resolve_schema
+
+
+def bench_schema_diff(benchmark):
+    """Diffs each schema with its next version, including ref resolution"""
+    for name, (previous, current) in schema_pairs().items():
+        benchmark(
+            name,
+            schema_diff,
+            setup=lambda previous=previous, current=current: (
+                (deepcopy(previous), deepcopy(current)),
+                {"print_diff_to_console": False},
+            ),
+        )
+
+
+def bench_translate_meta_diff(benchmark):
+    """Translates precomputed structural difference into meta diff"""
+    for name, (previous, current) in schema_pairs().items():
+        changes = _structural_diff(
+            resolve_schema(deepcopy(previous)), resolve_schema(deepcopy(current))
+        )
+        benchmark(name, _translate_meta_diff, changes)
@@ -0,0 +1,233 @@
+"""Minimal benchmark harness.
+
+Benchmarks are `bench_*` functions of `bench_*.py` modules in this package.
+Each receives a `Benchmark` and registers cases by calling it, the same way
+pytest-benchmark's fixture is called:
+
+    def bench_resolve_schema(benchmark):
+        for name, schema in schemas().items():
+            benchmark(name, resolve_schema, setup=lambda: ((deepcopy(schema),), {}))
+
+Functions without `setup` are timed in loops of calibrated size, so a round
+takes at least `min_time`; functions with `setup` (e.g. mutating their input)
+are called once per round with fresh arguments. Results are collected as
+JSON documents with per-iteration times of every round and their statistics.
+"""
+import gc
+import importlib
+import os
+import pkgutil
+import platform
+import statistics
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+RESULTS_VERSION = 1
+
+
+def compute_stats(data: List[float]) -> Dict[str, float]:
+    """Computes statistics of per-iteration times in seconds"""
+    if len(data) > 1:
+        first_quartile, median, third_quartile = statistics.quantiles(
+            data, n=4, method="inclusive"
+        )
+    else:
+        first_quartile = median = third_quartile = data[0]
+    mean = statistics.fmean(data)
+    return {
+        "min": min(data),
+        "max": max(data),
+        "mean": mean,
+        "stddev": statistics.stdev(data) if len(data) > 1 else 0.0,
+        "median": median,
+        "q1": first_quartile,
+        "q3": third_quartile,
+        "iqr": third_quartile - first_quartile,
+        "ops": 1 / mean if mean else 0.0,
+        "rounds": len(data),
+    }
+
+
+class Benchmark:
+    """Times registered cases of a single benchmark function.
+
+    Attributes:
+        module: name of the benchmark module without `bench_` prefix
+        group: name of the benchmark function without `bench_` prefix
+        rounds: number of measured rounds per case
+        min_time: minimal duration of a round in seconds
+        max_time: time budget of a case in seconds, fewer rounds are
+            measured if it is exceeded (but at least 3)
+        results: JSON documents of measured cases
+    """
+
+    def __init__(
+        self,
+        module: str,
+        group: str,
+        rounds: int = 20,
+        min_time: float = 0.002,
+        max_time: float = 1.0,
+        name_filter: Optional[str] = None,
+    ):
+        self.module = module
+        self.group = group
+        self.rounds = rounds
+        self.min_time = min_time
+        self.max_time = max_time
+        self.name_filter = name_filter
+        self.results: List[Dict[str, Any]] = []
+
+    def _calibrate(self, func: Callable[[], Any]) -> int:
+        iterations = 1
+        while True:
+            start = time.perf_counter()
+            for _ in range(iterations):
+                func()
+            if time.perf_counter() - start >= self.min_time or iterations >= 1 << 20:
+                return iterations
+            iterations *= 2
+
+    def _measure(
+        self,
+        func: Callable,
+        args: Tuple,
+        kwargs: Dict[str, Any],
+        setup: Optional[Callable[[], Tuple[Tuple, Dict[str, Any]]]],
+    ) -> Tuple[List[float], int]:
+        data = []
+        deadline = time.perf_counter() + self.max_time
+        iterations = 1
+        if setup is None:
+            iterations = self._calibrate(lambda: func(*args, **kwargs))
+
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            while len(data) < self.rounds:
+                if setup is not None:
+                    args, kwargs = setup()
+                start = time.perf_counter()
+                for _ in range(iterations):
+                    func(*args, **kwargs)
+                data.append((time.perf_counter() - start) / iterations)
+                if len(data) >= 3 and time.perf_counter() > deadline:
+                    break
+        finally:
+            if gc_enabled:
+                gc.enable()
+        return data, iterations
+
+    def __call__(
+        self,
+        name: str,
+        func: Callable,
+        *args,
+        setup: Optional[Callable[[], Tuple[Tuple, Dict[str, Any]]]] = None,
+        **kwargs,
+    ):
+        """Measures the case.
+
+        Args:
+            name (str): name of the case within the group
+            func (Callable): function to time
+            args: positional arguments of the function
+            setup (Optional[Callable]): returns fresh (args, kwargs) before
+                every call, which is then timed once per round
+            kwargs: keyword arguments of the function
+        """
+        full_name = f"{self.group}[{name}]"
+        fullname = f"{self.module}::{full_name}"
+        if self.name_filter and self.name_filter not in fullname:
+            return
+        result = {
+            "name": full_name,
+            "fullname": fullname,
+            "group": self.group,
+            "param": name,
+        }
+        try:
+            data, iterations = self._measure(func, args, kwargs, setup)
+        except Exception as ex:
+            # e.g. rule file not supported by installed guard version
+            result["error"] = f"{type(ex).__name__}: {ex}"
+        else:
+            result["stats"] = {**compute_stats(data), "iterations": iterations}
+            result["data"] = data
+        self.results.append(result)
+
+
+def discover() -> List[Tuple[str, str, Callable]]:
+    """Finds `bench_*` functions of `bench_*` modules of this package.
+
+    Returns:
+        List[Tuple[str, str, Callable]]: module and group names (without
+            the prefix) and function
+    """
+    package = __name__.rsplit(".", 1)[0]
+    package_path = os.path.dirname(__file__)
+    functions = []
+    for module_info in sorted(
+        pkgutil.iter_modules([package_path]), key=lambda info: info.name
+    ):
+        if not module_info.name.startswith("bench_"):
+            continue
+        module = importlib.import_module(f"{package}.{module_info.name}")
+        functions.extend(
+            (module_info.name[len("bench_") :], name[len("bench_") :], function)
+            for name, function in sorted(vars(module).items())
+            if name.startswith("bench_") and callable(function)
+        )
+    return functions
+
+
+def machine_info() -> Dict[str, Any]:
+    """Describes the machine and interpreter the benchmarks run on"""
+    from rpdk.guard_rail.core.cache import package_version
+
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "guard_rail": package_version(),
+    }
+
+
+def run(
+    name_filter: Optional[str] = None,
+    rounds: int = 20,
+    min_time: float = 0.002,
+    max_time: float = 1.0,
+) -> Dict[str, Any]:
+    """Runs discovered benchmarks.
+
+    Args:
+        name_filter (Optional[str]): substring of benchmark names to run
+        rounds (int): number of measured rounds per case
+        min_time (float): minimal duration of a round in seconds
+        max_time (float): time budget of a case in seconds
+
+    Returns:
+        Dict[str, Any]: JSON document with results of all cases
+    """
+    results = []
+    for module, group, function in discover():
+        benchmark = Benchmark(
+            module,
+            group,
+            rounds=rounds,
+            min_time=min_time,
+            max_time=max_time,
+            name_filter=name_filter,
+        )
+        function(benchmark)
+        results.extend(benchmark.results)
+    return {
+        "version": RESULTS_VERSION,
+        "datetime": datetime.now(timezone.utc).isoformat(),
+        "machine_info": machine_info(),
+        "benchmarks": results,
+    }
@@ -0,0 +1,59 @@
+"""Inputs of benchmarks: schemas of integration tests and synthetic schemas"""
+import json
+import os
+from functools import lru_cache
+from typing import Any, Dict
+
+from rpdk.guard_rail.benchmark.generator import (
+    SchemaShape,
+    generate_schema,
+    next_version,
+)
+
+DATA_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "tests",
+    "integ",
+    "data",
+)
+
+
+# synthetic schemas: growing number of properties, nesting and shared
+# definitions, with recursive definitions and large permission lists
+SYNTHETIC_SHAPES = {
+    "synthetic-100": SchemaShape(properties=100, depth=4, definitions=10),
+    "synthetic-1000-recursive": SchemaShape(
+        properties=1000,
+        depth=8,
+        definitions=50,
+        fan_out=4,
+        recursive=True,
+        permissions=200,
+    ),
+}
+
+
+@lru_cache(maxsize=None)
+def _load() -> Dict[str, Dict[str, Any]]:
+    loaded = {}
+    for file_name in sorted(os.listdir(DATA_DIR)):
+        if file_name.endswith(".json"):
+            with open(os.path.join(DATA_DIR, file_name), encoding="utf-8") as file:
+                loaded[file_name[: -len(".json")]] = json.load(file)
+    for name, shape in SYNTHETIC_SHAPES.items():
+        loaded[name] = generate_schema(shape)
+    return loaded
+
+
+def schemas() -> Dict[str, Dict[str, Any]]:
+    """Returns benchmark schemas by name.
+
+    Schemas are shared between benchmarks; functions mutating their input
+    must be given a copy.
+    """
+    return _load()
+
+
+def schema_pairs() -> Dict[str, Any]:
+    """Returns (previous, current) schema pairs by name for stateful benchmarks"""
+    return {name: (schema, next_version(schema)) for name, schema in schemas().items()}
@@ -46,12 +46,15 @@ setuptools.setup(
     package_dir={"": "src"},
     py_modules=["cli"],
     install_requires=read_requirements("requirements.txt"),
+    extras_require={"fast": ["orjson>=3"]},
     include_package_data=True,
     python_requires=">=3.7",
     entry_points={
         "console_scripts": [
             "guard-rail-cli = cli:main",
             "guard-rail = cli:main",
+            "guard-rail-lsp = rpdk.guard_rail.lsp:main",
+            "guard-rail-bench = rpdk.guard_rail.benchmark.cli:main",
         ]
     },
     license="Apache License 2.0",
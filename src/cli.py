@@ -7,24 +7,47 @@ command with a prespecified set of arguments.
 Typical usage example:
 
     $ guard-rail --schema file://path1 --schema file://path2 --rule file://path1 --rule file://path2
+    # or keep rules loaded and serve JSON-RPC requests over stdio
+    $ guard-rail serve --stdio
+    # or print time spent per pipeline stage to stderr
+    $ guard-rail --schema file://path1 --timings
+    # or write cProfile stats and collapsed stacks of the run
+    $ guard-rail --schema file://path1 --profile out.prof
+    # or print memory allocated per pipeline stage to stderr
+    $ guard-rail --schema file://path1 --memory-report
+    # or write one JSON result per line as schemas are evaluated
+    $ guard-rail --schema file://path1 --schema file://path2 --output-format ndjson
+    # or print large results as plain text tables, at most 100 rows per schema
+    $ guard-rail --schema file://path1 --format --renderer plain --max-rows 100
+    # or print only counts per rule and check over all schemas
+    $ guard-rail --schema file://path1 --schema file://path2 --summary
 
 Arguments:
     guard-rail - is the name of the package
     schema - is the argument to provide resource schema
     rule - is the argument to provide custom set of rules
 """
-
+import sys
+from contextlib import ExitStack
 from functools import singledispatch
-from typing import List
+from typing import Any, Iterable, Optional
 
 from rpdk.guard_rail.core.data_types import GuardRuleSetResult, Stateful, Stateless
-from rpdk.guard_rail.core.runner import exec_compliance
 from rpdk.guard_rail.utils.arg_handler import (
     argument_validation,
     collect_rules,
     collect_schemas,
+    iter_schemas,
     setup_args,
+    setup_serve_args,
 )
+from rpdk.guard_rail.utils.logger import configure_logging
+from rpdk.guard_rail.utils.memory import record_memory
+from rpdk.guard_rail.utils.output import write_documents
+from rpdk.guard_rail.utils.profiling import profile
+from rpdk.guard_rail.utils.timing import record_timings
+
+SERVE_COMMAND = "serve"
 
 
 def main(args_in=None):
@@ -43,11 +66,42 @@ def main(args_in=None):
         NotImplementedError: An error occurred accessing invoke method
         that has not been implemented yet
     """
+    args_in = sys.argv[1:] if args_in is None else args_in
+    if args_in and args_in[0] == SERVE_COMMAND:
+        serve_main(args_in[1:])
+        return
+
     parser = setup_args()
     args = parser.parse_args(args=args_in)
+    configure_logging(level=args.log_level, log_file=args.log_file)
 
     argument_validation(args)
-    collected_schemas = collect_schemas(schemas=args.schemas)
+
+    with profile(args.profile):
+        with ExitStack() as recorders:
+            timings = (
+                recorders.enter_context(record_timings()) if args.timings else None
+            )
+            memory = (
+                recorders.enter_context(record_memory()) if args.memory_report else None
+            )
+            run(args)
+        for report in (timings, memory):
+            if report is not None:
+                report.display()
+
+
+def run(args):
+    """Runs compliance assessment and prints results as they come.
+
+    Args:
+        args: parsed arguments of the cli module
+    """
+    collected_schemas = (
+        collect_schemas(schemas=args.schemas)
+        if args.stateful
+        else iter_schemas(schemas=args.schemas)
+    )
     collected_rules = collect_rules(rules=args.rules)
 
     compliance_result = None
@@ -58,7 +112,12 @@ def main(args_in=None):
             rules=collected_rules,
             is_read_only=args.is_read_only,
         )
-        compliance_result = invoke(payload)
+        compliance_result = invoke(
+            payload,
+            single_pass=args.single_pass,
+            workers=args.jobs,
+            cache_dir=args.cache_dir,
+        )
     else:
         # should be index safe as argument validation should fail prematurely
         payload: Stateful = Stateful(
@@ -66,33 +125,110 @@ def main(args_in=None):
             current_schema=collected_schemas[1],
             rules=collected_rules,
         )
-        compliance_result = invoke(payload)
+        compliance_result = invoke(
+            payload,
+            single_pass=args.single_pass,
+            workers=args.jobs,
+            cache_dir=args.cache_dir,
+        )
 
-    if args.json:
-        print([rule_results.json for rule_results in compliance_result])
-    elif args.format:
-        display(compliance_result)
+    # results are printed as soon as each schema is evaluated
+    rule_results = (result for _, result in compliance_result)
+    output_format = args.output_format or ("json" if args.json else None)
+    if args.summary:
+        summarize(rule_results, output_format)
+    elif output_format:
+        write_documents((result.json for result in rule_results), output_format)
+    elif args.format or args.renderer:
+        display(rule_results, renderer=args.renderer or "rich", max_rows=args.max_rows)
     else:
-        print(compliance_result)
+        stream_list(rule_results)
+
 
+def summarize(compliance_result: Iterable[GuardRuleSetResult], output_format=None):
+    """Folds results into counts per rule and check, then prints them.
 
-def display(compliance_result: List[GuardRuleSetResult]):  # pylint: disable=C0116
+    Args:
+        compliance_result (Iterable[GuardRuleSetResult]): results of schemas
+        output_format: one of `OUTPUT_FORMATS` to write counts as JSON,
+            histogram tables are displayed otherwise
+    """
+    from rpdk.guard_rail.core.summary import ComplianceAggregator
+
+    aggregator = ComplianceAggregator()
+    aggregator.extend(compliance_result)
+    if output_format:
+        write_documents([aggregator.json], output_format)
+    else:
+        aggregator.display()
+
+
+def serve_main(args_in):
+    """Serves compliance assessments over stdio until shutdown.
+
+    Args:
+        args_in: set of arguments supported by the serve command
+    """
+    args = setup_serve_args().parse_args(args=args_in)
+    configure_logging(level=args.log_level, log_file=args.log_file)
+
+    # imported on demand, so one-off runs do not pay for the server module
+    from rpdk.guard_rail.core.ruleset import RuleSet
+    from rpdk.guard_rail.server import ServerContext, serve
+
+    serve(
+        context=ServerContext(
+            ruleset=RuleSet(),
+            rules=collect_rules(rules=args.rules),
+            single_pass=args.single_pass,
+            cache_dir=args.cache_dir,
+        )
+    )
+
+
+def display(
+    compliance_result: Iterable[GuardRuleSetResult],
+    renderer: str = "rich",
+    max_rows: Optional[int] = None,
+):
+    """Displays a table per result, result by result as they come.
+
+    Args:
+        compliance_result (Iterable[GuardRuleSetResult]): results of schemas
+        renderer (str): one of `RENDERERS`
+        max_rows (Optional[int]): maximum number of rows per result
+    """
     for item in compliance_result:
         print()
-        item.display()
+        item.display(renderer=renderer, max_rows=max_rows)
+        sys.stdout.flush()
     print()
 
 
+def stream_list(items: Iterable[Any]):
+    """Prints items in a form of python list, item by item as they come"""
+    separator = "["
+    for item in items:
+        print(separator + repr(item), end="", flush=True)
+        separator = ", "
+    print("]" if separator == ", " else "[]")
+
+
 @singledispatch
 def invoke(*args, **kwargs):  # pylint: disable=C0116
     raise NotImplementedError("not supported implementation")
 
 
 @invoke.register(Stateless)
-def _(payload):
-    return exec_compliance(payload)
+def _(payload, **kwargs):
+    # runner loads guard and rule library, which `--help`/`--version` do not need
+    from rpdk.guard_rail.core.runner import iter_compliance
+
+    return iter_compliance(payload, ordered=True, **kwargs)
 
 
 @invoke.register(Stateful)
-def _(payload):
-    return exec_compliance(payload)
+def _(payload, **kwargs):
+    from rpdk.guard_rail.core.runner import iter_compliance
+
+    return iter_compliance(payload, ordered=True, **kwargs)
@@ -0,0 +1,43 @@
+"""Entry point of benchmarking tools.
+
+Typical usage example:
+
+    $ guard-rail-bench generate --properties 500 --output schema.json
+    $ guard-rail-bench compare baseline.json current.json --threshold 10
+"""
+import argparse
+import sys
+
+from rpdk.guard_rail.benchmark.compare import add_compare_args, compare_results
+from rpdk.guard_rail.benchmark.generator import add_generate_args, generate
+
+
+def main(args_in=None) -> int:
+    """Entry point of `guard-rail-bench`.
+
+    Returns:
+        int: exit code of the command
+    """
+    parser = argparse.ArgumentParser(
+        prog="guard-rail-bench", description="Benchmarking tools of guard-rail"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    add_generate_args(
+        subparsers.add_parser(
+            "generate", help="Generates synthetic resource provider schemas"
+        )
+    ).set_defaults(func=generate)
+    add_compare_args(
+        subparsers.add_parser(
+            "compare",
+            help="Compares benchmark results with a baseline, "
+            "exits with 1 if any benchmark regressed",
+        )
+    ).set_defaults(func=compare_results)
+
+    args = parser.parse_args(args=args_in)
+    return args.func(args) or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,249 @@
+"""Module to compare benchmark results against a baseline.
+
+Results are JSON documents written by `python -m benchmarks` (or
+pytest-benchmark, which uses the same layout of `benchmarks` entries).
+Benchmarks are matched by name and compared by median time. Benchmark
+timings are noisy, so a benchmark is reported as regressed only if its
+median is slower than the baseline by more than the threshold *and* its
+interquartile range lies entirely above the baseline one; improvements
+are reported the same way in the opposite direction.
+
+Typical usage example:
+
+    $ guard-rail-bench compare baseline.json current.json --threshold 10
+    $ echo $?  # 1 if any benchmark regressed
+"""
+import json
+import statistics
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+REGRESSED = "regressed"
+IMPROVED = "improved"
+UNCHANGED = "unchanged"
+MISSING = "missing"
+NEW = "new"
+FAILED = "failed"
+
+
+@dataclass(frozen=True)
+class Spread:
+    """Median and quartiles of per-iteration times in seconds"""
+
+    median: float
+    q1: float
+    q3: float
+
+    @property
+    def iqr(self) -> float:
+        """Interquartile range"""
+        return self.q3 - self.q1
+
+
+@dataclass(frozen=True)
+class Comparison:
+    """Comparison of a single benchmark.
+
+    Attributes:
+        name: name of the benchmark
+        status: one of regressed, improved, unchanged, missing (only in
+            baseline), new (only in current results), failed (errored)
+        baseline: spread of baseline times
+        current: spread of current times
+    """
+
+    name: str
+    status: str
+    baseline: Optional[Spread] = None
+    current: Optional[Spread] = None
+
+    @property
+    def delta(self) -> Optional[float]:
+        """Change of the median in percent of the baseline median"""
+        if self.baseline is None or self.current is None or not self.baseline.median:
+            return None
+        return (self.current.median - self.baseline.median) / self.baseline.median * 100
+
+    @property
+    def json(self) -> Dict[str, Any]:
+        """Translates comparison into JSON document"""
+
+        def __spread(spread):
+            if spread is None:
+                return None
+            return {"median": spread.median, "q1": spread.q1, "q3": spread.q3}
+
+        return {
+            "name": self.name,
+            "status": self.status,
+            "delta": self.delta,
+            "baseline": __spread(self.baseline),
+            "current": __spread(self.current),
+        }
+
+
+def _spread(entry: Dict[str, Any]) -> Optional[Spread]:
+    """Reads spread of the benchmark entry, preferring raw times if present"""
+    data = entry.get("data") or entry.get("stats", {}).get("data")
+    if data and len(data) > 1:
+        first_quartile, median, third_quartile = statistics.quantiles(
+            data, n=4, method="inclusive"
+        )
+        return Spread(median, first_quartile, third_quartile)
+    stats = entry.get("stats")
+    if not stats or "median" not in stats:
+        return None
+    return Spread(
+        stats["median"],
+        stats.get("q1", stats["median"]),
+        stats.get("q3", stats["median"]),
+    )
+
+
+def load_results(path: str) -> Dict[str, Optional[Spread]]:
+    """Reads benchmark results.
+
+    Args:
+        path (str): path of the JSON results
+
+    Returns:
+        Dict[str, Optional[Spread]]: spread of times per benchmark name,
+            None for benchmarks which failed
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        document = json.load(file)
+    return {
+        entry.get("fullname", entry["name"]): _spread(entry)
+        for entry in document.get("benchmarks", [])
+    }
+
+
+def compare(
+    baseline: Dict[str, Optional[Spread]],
+    current: Dict[str, Optional[Spread]],
+    threshold: float = 10.0,
+) -> List[Comparison]:
+    """Compares current results with the baseline.
+
+    Args:
+        baseline (Dict[str, Optional[Spread]]): baseline results
+        current (Dict[str, Optional[Spread]]): current results
+        threshold (float): change of the median in percent tolerated as noise
+
+    Returns:
+        List[Comparison]: comparisons ordered by benchmark name
+    """
+    comparisons = []
+    for name in sorted(baseline.keys() | current.keys()):
+        if name not in current:
+            comparisons.append(Comparison(name, MISSING, baseline=baseline[name]))
+            continue
+        if name not in baseline:
+            comparisons.append(Comparison(name, NEW, current=current[name]))
+            continue
+        before, after = baseline[name], current[name]
+        if before is None or after is None:
+            comparisons.append(Comparison(name, FAILED, before, after))
+            continue
+        status = UNCHANGED
+        limit = threshold / 100
+        if after.median > before.median * (1 + limit) and after.q1 > before.q3:
+            status = REGRESSED
+        elif after.median < before.median * (1 - limit) and after.q3 < before.q1:
+            status = IMPROVED
+        comparisons.append(Comparison(name, status, before, after))
+    return comparisons
+
+
+def display_comparisons(comparisons: Sequence[Comparison], threshold: float):
+    """Displays a table of compared benchmarks"""
+    from rich.console import Console
+    from rich.markup import escape
+    from rich.table import Table
+
+    styles = {REGRESSED: "red", IMPROVED: "green", FAILED: "red"}
+    table = Table(title=f"Benchmark Comparison (threshold {threshold:g}%)")
+    table.add_column("Benchmark", style="cyan", overflow="fold")
+    table.add_column("Baseline (us)", justify="right")
+    table.add_column("Current (us)", justify="right")
+    table.add_column("Delta", justify="right")
+    table.add_column("Status")
+
+    def __median(spread):
+        if spread is None:
+            return "-"
+        return f"{spread.median * 1e6:.1f} ±{spread.iqr * 1e6 / 2:.1f}"
+
+    for comparison in comparisons:
+        delta = comparison.delta
+        style = styles.get(comparison.status, "")
+        table.add_row(
+            escape(comparison.name),
+            __median(comparison.baseline),
+            __median(comparison.current),
+            "-" if delta is None else f"{delta:+.1f}%",
+            f"[{style}]{comparison.status}[/{style}]" if style else comparison.status,
+        )
+
+    Console().print(table)
+
+
+def add_compare_args(parser):
+    """Adds arguments of `compare` command to the parser"""
+    parser.add_argument("baseline", type=str, help="Baseline benchmark results")
+    parser.add_argument("current", type=str, help="Current benchmark results")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=10.0,
+        help="Change of the median in percent tolerated as noise (10 by default)",
+    )
+    parser.add_argument(
+        "-k",
+        dest="name_filter",
+        type=str,
+        default=None,
+        help="Should specify substring of benchmark names to compare",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        default=False,
+        help="Should print comparisons as JSON instead of a table",
+    )
+    parser.add_argument(
+        "--fail-on-missing",
+        dest="fail_on_missing",
+        action="store_true",
+        default=False,
+        help="Whether benchmarks missing or failed in current results should fail",
+    )
+    return parser
+
+
+def compare_results(args) -> int:
+    """Compares result files from parsed arguments.
+
+    Returns:
+        int: exit code, 1 if any benchmark regressed
+    """
+    baseline = load_results(args.baseline)
+    current = load_results(args.current)
+    if args.name_filter:
+        baseline, current = (
+            {
+                name: spread
+                for name, spread in results.items()
+                if args.name_filter in name
+            }
+            for results in (baseline, current)
+        )
+    comparisons = compare(baseline, current, args.threshold)
+
+    if args.json:
+        print(json.dumps([comparison.json for comparison in comparisons], indent=2))
+    else:
+        display_comparisons(comparisons, args.threshold)
+
+    failing = {REGRESSED} | ({MISSING, FAILED} if args.fail_on_missing else set())
+    return int(any(comparison.status in failing for comparison in comparisons))
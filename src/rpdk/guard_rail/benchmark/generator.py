@@ -0,0 +1,445 @@
+"""Module to generate synthetic resource provider schemas.
+
+Schemas have a controlled shape, so resolver, path enumerator and differ
+can be measured at growing sizes:
+
+* `properties` top level properties, mixing scalars, arrays, refs to
+  shared definitions and inline objects nested `depth` levels deep;
+* `definitions` shared definitions, each with `fan_out` properties,
+  one of them referring to a further definition (and one to the definition
+  itself, forming `$ref` cycles, if `recursive`);
+* `permissions` permissions per handler;
+* tagging variant, one of `TAGGING_VARIANTS`.
+
+With `full` tagging, generated schemas satisfy the built-in stateless
+rules (identifiers, handlers, tagging); other tagging variants exercise
+failing tagging rules (deprecated `taggable`, missing `tagging`).
+The same shape and seed always produce the same schema; `next_version`
+produces a deterministic mutation of it for stateful runs.
+
+Typical usage example:
+
+    $ guard-rail-bench generate --properties 500 --depth 4 --definitions 50 \
+        --output schema.json --next-output next.json
+"""
+import json
+import random
+from copy import deepcopy
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+TAGGING_VARIANTS = ("full", "legacy", "not_taggable", "none")
+
+_SCALAR_TYPES = ("string", "integer", "boolean", "number")
+_HANDLERS = ("create", "read", "update", "delete", "list")
+_TAG_PERMISSIONS = ["{service}:TagResource", "{service}:UntagResource"]
+
+
+@dataclass(frozen=True)
+class SchemaShape:
+    """Shape of a generated schema.
+
+    Attributes:
+        properties: number of top level properties
+        depth: nesting depth of inline object properties
+        definitions: number of shared definitions
+        fan_out: number of properties per definition and per nested object
+        recursive: whether definitions refer back to each other
+        permissions: number of permissions per handler
+        tagging: tagging variant, one of `TAGGING_VARIANTS`
+        seed: seed of the random generator
+    """
+
+    properties: int = 10
+    depth: int = 2
+    definitions: int = 0
+    fan_out: int = 2
+    recursive: bool = False
+    permissions: int = 3
+    tagging: str = "full"
+    seed: int = 0
+
+    def __post_init__(self):
+        if self.tagging not in TAGGING_VARIANTS:
+            raise ValueError(
+                f"tagging must be one of {', '.join(TAGGING_VARIANTS)}, "
+                f"got {self.tagging}"
+            )
+        for name in ("properties", "depth", "definitions", "fan_out", "permissions"):
+            if getattr(self, name) < 0:
+                raise ValueError(f"{name} must not be negative")
+
+
+def _scalar(rng: random.Random, name: str) -> Dict[str, Any]:
+    if name.endswith("Arn"):
+        return {"type": "string", "pattern": "^arn:aws[a-z-]*:[a-z0-9-]+:.*$"}
+    scalar_type = rng.choice(_SCALAR_TYPES)
+    definition = {"type": scalar_type, "description": f"{name} of the resource"}
+    if scalar_type == "string" and rng.random() < 0.3:
+        definition["enum"] = [f"Value{index}" for index in range(rng.randint(2, 5))]
+    elif scalar_type == "string" and rng.random() < 0.3:
+        definition["maxLength"] = rng.choice((64, 256, 1024))
+    elif scalar_type == "integer" and rng.random() < 0.3:
+        definition["minimum"] = 0
+    return definition
+
+
+def _definition_ref(index: int) -> Dict[str, str]:
+    return {"$ref": f"#/definitions/Definition{index}"}
+
+
+def _definitions(shape: SchemaShape, rng: random.Random) -> Dict[str, Any]:
+    definitions = {}
+    for index in range(shape.definitions):
+        properties = {}
+        for field in range(shape.fan_out):
+            name = f"Field{field}"
+            # a single forward ref per definition keeps expanded definitions
+            # chains, so the number of paths grows polynomially with the shape
+            if field == 0 and index + 1 < shape.definitions:
+                properties[name] = _definition_ref(
+                    rng.randrange(index + 1, shape.definitions)
+                )
+            else:
+                properties[name] = _scalar(rng, name)
+        if shape.recursive:
+            # tree-like recursion; refs back to earlier definitions would
+            # branch every expanded chain and make paths grow exponentially
+            properties["Children"] = {
+                "type": "array",
+                "items": _definition_ref(index),
+            }
+        definitions[f"Definition{index}"] = {
+            "type": "object",
+            "properties": properties,
+            "additionalProperties": False,
+        }
+    return definitions
+
+
+def _property(
+    shape: SchemaShape, rng: random.Random, name: str, depth: int
+) -> Dict[str, Any]:
+    """Generates property definition nested at most `depth` levels deep"""
+    roll = rng.random()
+    if depth > 0 and roll < 0.2:
+        return _inline_object(shape, rng, depth)
+    if shape.definitions and roll < 0.45:
+        return _definition_ref(rng.randrange(shape.definitions))
+    if roll < 0.6:
+        items = (
+            _definition_ref(rng.randrange(shape.definitions))
+            if shape.definitions and rng.random() < 0.5
+            else {"type": "string"}
+        )
+        return {
+            "type": "array",
+            "insertionOrder": rng.random() < 0.5,
+            "uniqueItems": rng.random() < 0.5,
+            "items": items,
+        }
+    return _scalar(rng, name)
+
+
+def _inline_object(
+    shape: SchemaShape, rng: random.Random, depth: int
+) -> Dict[str, Any]:
+    """Generates object nested `depth` levels deep through its `Nested` field;
+    other fields are leaves, so the size grows linearly with depth"""
+    if depth <= 0:
+        return _scalar(rng, "Leaf")
+    return {
+        "type": "object",
+        "properties": {
+            "Nested": _inline_object(shape, rng, depth - 1),
+            **{
+                f"Field{field}": _property(shape, rng, f"Field{field}", 0)
+                for field in range(1, shape.fan_out)
+            },
+        },
+        "additionalProperties": False,
+    }
+
+
+def _tagging(shape: SchemaShape, service: str, schema: Dict[str, Any]):
+    tag_permissions = [
+        permission.format(service=service) for permission in _TAG_PERMISSIONS
+    ]
+    if shape.tagging in ("full", "legacy"):
+        schema["definitions"]["Tag"] = {
+            "type": "object",
+            "properties": {
+                "Key": {"type": "string", "minLength": 1, "maxLength": 128},
+                "Value": {"type": "string", "maxLength": 256},
+            },
+            "required": ["Key", "Value"],
+            "additionalProperties": False,
+        }
+        schema["properties"]["Tags"] = {
+            "type": "array",
+            "insertionOrder": False,
+            "uniqueItems": True,
+            "items": {"$ref": "#/definitions/Tag"},
+        }
+    if shape.tagging == "full":
+        schema["tagging"] = {
+            "taggable": True,
+            "tagOnCreate": True,
+            "tagUpdatable": True,
+            "cloudFormationSystemTags": True,
+            "tagProperty": "/properties/Tags",
+            "permissions": tag_permissions,
+        }
+    elif shape.tagging == "legacy":
+        schema["taggable"] = True
+    elif shape.tagging == "not_taggable":
+        schema["tagging"] = {"taggable": False}
+    if shape.tagging in ("full", "legacy"):
+        for handler in ("create", "update"):
+            schema["handlers"][handler]["permissions"].extend(tag_permissions)
+
+
+def generate_schema(shape: SchemaShape) -> Dict[str, Any]:
+    """Generates resource provider schema of the shape.
+
+    Args:
+        shape (SchemaShape): shape of the schema
+
+    Returns:
+        Dict[str, Any]: resource provider schema
+    """
+    rng = random.Random(shape.seed)
+    service = f"bench{shape.seed}"
+    type_name = f"Benchmark::Generated::Resource{shape.seed}"
+
+    definitions = _definitions(shape, rng)
+    properties = {
+        "Id": {"type": "string", "description": "Identifier of the resource"},
+        "Arn": _scalar(rng, "Arn"),
+    }
+    for index in range(shape.properties):
+        name = f"Property{index}"
+        properties[name] = _property(shape, rng, name, shape.depth)
+
+    scalar_names = [
+        name
+        for name, definition in properties.items()
+        if name.startswith("Property") and "type" in definition
+    ]
+    schema = {
+        "typeName": type_name,
+        "description": f"Resource Type definition for {type_name}",
+        "sourceUrl": "https://github.com/aws-cloudformation/resource-schema-guard-rail",
+        "definitions": definitions,
+        "properties": properties,
+        "additionalProperties": False,
+        "required": scalar_names[:1],
+        "createOnlyProperties": [f"/properties/{name}" for name in scalar_names[:2]],
+        "readOnlyProperties": ["/properties/Id", "/properties/Arn"],
+        "primaryIdentifier": ["/properties/Id"],
+        "handlers": {
+            handler: {
+                "permissions": [
+                    f"{service}:{handler.capitalize()}Resource{index}"
+                    for index in range(max(shape.permissions, 1))
+                ]
+            }
+            for handler in _HANDLERS
+        },
+    }
+    _tagging(shape, service, schema)
+    return schema
+
+
+def _top_level_names(schema: Dict[str, Any]) -> List[str]:
+    return [
+        name
+        for name in schema.get("properties", {})
+        if name not in ("Id", "Arn", "Tags")
+    ]
+
+
+def next_version(
+    schema: Dict[str, Any], changes: int = 10, seed: int = 0
+) -> Dict[str, Any]:
+    """Generates the next version of the schema for stateful runs.
+
+    Applies `changes` mutations: added, removed and retyped properties,
+    new create only and required properties, added and removed
+    permissions, changed enum values. The schema is not modified.
+
+    Args:
+        schema (Dict[str, Any]): previous version of the schema
+        changes (int): number of mutations
+        seed (int): seed of the random generator
+
+    Returns:
+        Dict[str, Any]: next version of the schema
+    """
+    rng = random.Random(seed)
+    current = deepcopy(schema)
+    properties = current.setdefault("properties", {})
+
+    def __add_property(index):
+        properties[f"AddedProperty{index}"] = _scalar(rng, f"AddedProperty{index}")
+
+    def __remove_property(index):
+        names = _top_level_names(current)
+        if names:
+            name = rng.choice(names)
+            del properties[name]
+            path = f"/properties/{name}"
+            for key in ("createOnlyProperties", "readOnlyProperties", "required"):
+                if key in current:
+                    current[key] = [
+                        item for item in current[key] if item not in (path, name)
+                    ]
+        else:
+            __add_property(index)
+
+    def __change_type(index):
+        names = [
+            name for name in _top_level_names(current) if "type" in properties[name]
+        ]
+        if not names:
+            __add_property(index)
+            return
+        definition = properties[rng.choice(names)]
+        definition["type"] = rng.choice(
+            [scalar for scalar in _SCALAR_TYPES if scalar != definition["type"]]
+        )
+
+    def __make_create_only(index):
+        name = f"CreateOnlyProperty{index}"
+        properties[name] = {"type": "string"}
+        current.setdefault("createOnlyProperties", []).append(f"/properties/{name}")
+
+    def __make_required(index):
+        names = [
+            name
+            for name in _top_level_names(current)
+            if name not in current.get("required", [])
+        ]
+        if names:
+            current.setdefault("required", []).append(rng.choice(names))
+        else:
+            __add_property(index)
+
+    def __add_permission(index):
+        handlers = current.setdefault("handlers", {})
+        handler = rng.choice(sorted(handlers) or ["create"])
+        handlers.setdefault(handler, {}).setdefault("permissions", []).append(
+            f"bench:AddedPermission{index}"
+        )
+
+    def __remove_permission(index):
+        candidates = [
+            handler
+            for handler, definition in current.get("handlers", {}).items()
+            if len(definition.get("permissions", [])) > 1
+        ]
+        if candidates:
+            permissions = current["handlers"][rng.choice(sorted(candidates))][
+                "permissions"
+            ]
+            permissions.pop(rng.randrange(len(permissions)))
+        else:
+            __add_permission(index)
+
+    def __change_enum(index):
+        names = [
+            name for name in _top_level_names(current) if "enum" in properties[name]
+        ]
+        if names:
+            properties[rng.choice(names)]["enum"].append(f"AddedValue{index}")
+        else:
+            __change_type(index)
+
+    mutations = (
+        __add_property,
+        __remove_property,
+        __change_type,
+        __make_create_only,
+        __make_required,
+        __add_permission,
+        __remove_permission,
+        __change_enum,
+    )
+    for index in range(changes):
+        rng.choice(mutations)(index)
+    return current
+
+
+def add_generate_args(parser):
+    """Adds arguments of `generate` command to the parser"""
+    parser.add_argument(
+        "--properties", type=int, default=10, help="Top level properties"
+    )
+    parser.add_argument("--depth", type=int, default=2, help="Nesting depth")
+    parser.add_argument("--definitions", type=int, default=0, help="Shared definitions")
+    parser.add_argument(
+        "--fan-out",
+        dest="fan_out",
+        type=int,
+        default=2,
+        help="Properties per definition and nested object",
+    )
+    parser.add_argument(
+        "--recursive",
+        action="store_true",
+        default=False,
+        help="Whether definitions should form $ref cycles",
+    )
+    parser.add_argument(
+        "--permissions", type=int, default=3, help="Permissions per handler"
+    )
+    parser.add_argument(
+        "--tagging", choices=TAGGING_VARIANTS, default="full", help="Tagging variant"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generator")
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="Should specify file to write the schema to (stdout by default)",
+    )
+    parser.add_argument(
+        "--next-output",
+        dest="next_output",
+        type=str,
+        default=None,
+        help="Should specify file to write the next version of the schema to",
+    )
+    parser.add_argument(
+        "--changes",
+        type=int,
+        default=10,
+        help="Number of mutations in the next version of the schema",
+    )
+    return parser
+
+
+def generate(args):
+    """Writes schema (and its next version) generated from parsed arguments"""
+    shape = SchemaShape(
+        properties=args.properties,
+        depth=args.depth,
+        definitions=args.definitions,
+        fan_out=args.fan_out,
+        recursive=args.recursive,
+        permissions=args.permissions,
+        tagging=args.tagging,
+        seed=args.seed,
+    )
+    schema = generate_schema(shape)
+    documents = [(args.output, schema)]
+    if args.next_output:
+        documents.append(
+            (args.next_output, next_version(schema, args.changes, args.seed))
+        )
+    for path, document in documents:
+        if path:
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump(document, file, indent=2)
+        else:
+            print(json.dumps(document, indent=2))
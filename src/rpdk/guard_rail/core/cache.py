@@ -0,0 +1,193 @@
+"""Module to persist compliance results on disk.
+
+Results are addressed by the content of evaluated schemas together with
+a namespace, which identifies compliance mode, rules and package version.
+Entries are written atomically, so the cache directory can be shared by
+concurrent runs; least recently used entries are evicted once the cache
+grows over its size limit.
+
+Typical usage example:
+
+    from rpdk.guard_rail.core.cache import ResultCache
+
+    cache = ResultCache("/tmp/guard-rail-cache")
+    key = cache.key(namespace, schema)
+    result = cache.get(key)
+    if result is None:
+        result = ...
+        cache.put(key, result)
+"""
+import hashlib
+import json
+import os
+import tempfile
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from rpdk.guard_rail.core.data_types import GuardRuleSetResult
+from rpdk.guard_rail.utils.logger import LOG
+
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+ENTRY_SUFFIX = ".json"
+PACKAGE_NAME = "resource-schema-guard-rail"
+
+
+@lru_cache(maxsize=1)
+def package_version() -> str:
+    """Returns installed version of the package"""
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        return version(PACKAGE_NAME)
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def cache_namespace(mode: str, fingerprint: str) -> str:
+    """Builds namespace of cache entries for the mode and rules fingerprint"""
+    return "|".join((mode, fingerprint, package_version()))
+
+
+class ResultCache:
+    """Content addressed on-disk cache of compliance results.
+
+    Attributes:
+        cache_dir: directory holding cache entries
+        max_size: size limit of the cache in bytes
+    """
+
+    def __init__(self, cache_dir: str, max_size: int = DEFAULT_MAX_SIZE):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self._size = None
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def __getstate__(self):
+        # size is tracked per process
+        return {"cache_dir": self.cache_dir, "max_size": self.max_size}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    @staticmethod
+    def key(namespace: str, *documents: Any) -> str:
+        """Computes key of the entry from namespace and evaluated documents"""
+        digest = hashlib.sha256(namespace.encode("utf-8"))
+        for document in documents:
+            digest.update(b"\0")
+            digest.update(
+                json.dumps(document, sort_keys=True, separators=(",", ":")).encode(
+                    "utf-8"
+                )
+            )
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key + ENTRY_SUFFIX)
+
+    def get(self, key: str) -> Optional[GuardRuleSetResult]:
+        """Reads the result, marking the entry as recently used.
+
+        Args:
+            key (str): key of the entry
+
+        Returns:
+            Optional[GuardRuleSetResult]: cached result, None if missing
+        """
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                entry = json.load(file)
+            os.utime(path)
+            result = GuardRuleSetResult.from_json(entry["result"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        result.schema_difference = entry.get("schema_difference", {})
+        return result
+
+    def put(self, key: str, result: GuardRuleSetResult):
+        """Atomically writes the result and evicts entries over size limit.
+
+        Args:
+            key (str): key of the entry
+            result (GuardRuleSetResult): result to cache
+        """
+        path = self._path(key)
+        directory = os.path.dirname(path)
+        document = result.json
+        # timings describe the run which produced the result
+        document.pop("timings", None)
+        data = json.dumps(
+            {"result": document, "schema_difference": result.schema_difference}
+        ).encode("utf-8")
+        temp_path = None
+        try:
+            os.makedirs(directory, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "wb", dir=directory, suffix=".tmp", delete=False
+            ) as file:
+                temp_path = file.name
+                file.write(data)
+            replaced_size = self._entry_size(path)
+            os.replace(temp_path, path)
+        except OSError as ex:
+            LOG.info("failed to write cache entry %s: %s", path, str(ex))
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
+            return
+
+        if self._size is None:
+            self._size = self._entries_size()
+        else:
+            self._size += len(data) - replaced_size
+        if self._size > self.max_size:
+            self.evict()
+
+    @staticmethod
+    def _entry_size(path: str) -> int:
+        try:
+            return os.stat(path).st_size
+        except OSError:
+            return 0
+
+    def _entries(self):
+        for directory in os.scandir(self.cache_dir):
+            if not directory.is_dir():
+                continue
+            for entry in os.scandir(directory.path):
+                if entry.name.endswith(ENTRY_SUFFIX):
+                    yield entry
+
+    def _entries_stats(self) -> Dict[str, os.stat_result]:
+        # entries might be removed concurrently by other runs
+        stats = {}
+        for entry in self._entries():
+            try:
+                stats[entry.path] = entry.stat()
+            except OSError:
+                continue
+        return stats
+
+    def _entries_size(self) -> int:
+        return sum(stat.st_size for stat in self._entries_stats().values())
+
+    def evict(self, target_size: Optional[int] = None):
+        """Removes least recently used entries down to the target size.
+
+        Args:
+            target_size (Optional[int]): size to shrink cache to,
+                80% of the size limit by default
+        """
+        if target_size is None:
+            target_size = int(self.max_size * 0.8)
+        entries = self._entries_stats()
+        size = sum(stat.st_size for stat in entries.values())
+        for path, stat in sorted(entries.items(), key=lambda item: item[1].st_mtime):
+            if size <= target_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            size -= stat.st_size
+        self._size = size
@@ -5,6 +5,12 @@ Provides custom data types:
 - Stateless
 - GuardRuleSet
 - GuardRuleSetResult
+- GuardRuleSetResultBuilder
+- ResultTable
+
+Result types are slotted on Python 3.10+ and share a single copy of
+rule names, check ids and messages, which repeat across schemas,
+so results of large batches take a fraction of the memory.
 
 Typical usage example:
 
@@ -18,11 +24,32 @@ Typical usage example:
             rules=list_of_rules,
         )
 """
+import sys
+from array import array
+from collections import Counter
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    MutableMapping,
+    Optional,
+    Set,
+    TextIO,
+    Tuple,
+)
+
+from rpdk.guard_rail.utils.timing import timed
+
+# slotted dataclasses are available since Python 3.10
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-from rich.console import Console
-from rich.table import Table
+
+def _intern(value: Any) -> Any:
+    """Interns strings, so equal rule names and messages share a single copy"""
+    return sys.intern(value) if type(value) is str else value  # pylint: disable=C0123
 
 
 @dataclass
@@ -57,7 +84,7 @@ class Stateful:
     print_diff_to_console: bool = field(default=True)
 
 
-@dataclass(unsafe_hash=True)
+@dataclass(unsafe_hash=True, **_SLOTS)
 class GuardRuleResult:
     # making this class hashable as guard return output on
     # multiple unmatched properties
@@ -69,8 +96,29 @@ class GuardRuleResult:
     message: str = field(default="unidentified")
     path: str = field(default="unidentified")
 
-
-@dataclass
+    def __post_init__(self):
+        # check ids and messages come from the rule catalog and repeat
+        # for every schema, paths are mostly unique and are not interned
+        self.check_id = _intern(self.check_id)
+        self.message = _intern(self.message)
+
+
+def _merge_rule_results(
+    target: MutableMapping[str, Set[GuardRuleResult]],
+    source: Dict[str, Iterable[GuardRuleResult]],
+):
+    """Unites results of every rule of the source into the target in place"""
+    for rule_name, results in source.items():
+        existing = target.get(rule_name)
+        if existing is None:
+            target[rule_name] = set(results)
+        elif isinstance(existing, set):
+            existing.update(results)
+        else:
+            target[rule_name] = set(existing).union(results)
+
+
+@dataclass(**_SLOTS)
 class GuardRuleSetResult:
     """Represents a result of the compliance run.
 
@@ -82,6 +130,8 @@ class GuardRuleSetResult:
         warning: rules, that schema(s) failed but it's not a hard requirement
         skipped: rules, that are not applicable to the schema(s)
         schema_difference: optional dictionary containing schema difference
+        timings: optional wall/CPU time per pipeline stage, recorded
+            when timings are enabled
     """
 
     compliant: List[str] = field(default_factory=list)
@@ -89,10 +139,14 @@ class GuardRuleSetResult:
     warning: Dict[str, List[GuardRuleResult]] = field(default_factory=dict)
     skipped: List[str] = field(default_factory=list)
     schema_difference: Optional[dict] = field(default_factory=dict)
+    timings: Optional[dict] = field(default_factory=dict, repr=False, compare=False)
 
     def merge(self, guard_ruleset_result: Any):
         """Merges the result into a nice mutual set.
 
+        Results of a rule reported by both are united, not replaced.
+        For many results accumulate them with `GuardRuleSetResultBuilder`.
+
         Args:
             guard_ruleset_result (Any): result in a raw form
         """
@@ -101,19 +155,35 @@ class GuardRuleSetResult:
 
         self.compliant.extend(guard_ruleset_result.compliant)
         self.skipped.extend(guard_ruleset_result.skipped)
-        self.non_compliant = {
-            **self.non_compliant,
-            **guard_ruleset_result.non_compliant,
-        }
-        self.warning = {
-            **self.warning,
-            **guard_ruleset_result.warning,
-        }
+        _merge_rule_results(self.non_compliant, guard_ruleset_result.non_compliant)
+        _merge_rule_results(self.warning, guard_ruleset_result.warning)
+
+    @classmethod
+    def from_json(cls, document: Dict[str, Any]):
+        """Restores result from its JSON document
+
+        Args:
+            document (Dict[str, Any]): output of `GuardRuleSetResult.json`
+        """
+
+        def __rule_results(rule_results: Dict[str, List[Dict[str, str]]]):
+            return {
+                rule_name: {GuardRuleResult(**result) for result in results}
+                for rule_name, results in rule_results.items()
+            }
+
+        return cls(
+            compliant=list(document.get("compliant", [])),
+            non_compliant=__rule_results(document.get("non_compliant", {})),
+            warning=__rule_results(document.get("warning", {})),
+            skipped=list(document.get("skipped", [])),
+            timings=dict(document.get("timings", {})),
+        )
 
     @property
     def json(self):
         """Translates raw output into JSON document"""
-        return {
+        document = {
             "compliant": self.compliant,
             "non_compliant": {
                 rule_name: [
@@ -139,9 +209,27 @@ class GuardRuleSetResult:
             },
             "skipped": self.skipped,
         }
+        if self.timings:
+            document["timings"] = self.timings
+        return document
+
+    @timed("display")
+    def display(
+        self,
+        renderer: str = "rich",
+        max_rows: Optional[int] = None,
+        stream: Optional[TextIO] = None,
+    ):
+        """Displays a table with compliance results.
+
+        Args:
+            renderer (str): `rich` table, `plain` text table or `stream`
+                of rows, see `rpdk.guard_rail.utils.render`
+            max_rows (Optional[int]): maximum number of rows, all by default
+            stream (Optional[TextIO]): stream to write to, stdout by default
+        """
+        from rpdk.guard_rail.utils.render import render
 
-    def display(self):
-        """Displays a table with compliance results."""
         if (
             not self.compliant
             and not self.non_compliant
@@ -150,39 +238,222 @@ class GuardRuleSetResult:
         ):
             raise ValueError("No Rules have been executed")
 
-        table = Table(title="Schema Compliance Report")
-
-        table.add_column("Rule Name", justify="right", style="cyan", no_wrap=True)
-        table.add_column("Check Id", style="magenta")
-        table.add_column("Message", style="magenta")
-        table.add_column("Path", style="magenta")
-        table.add_column("Status", justify="right", style="green")
-
-        for rule in self.skipped:
-            table.add_row(rule, "-", "-", "-", "[white]skipped")
-
-        for rule in self.compliant:
-            table.add_row(rule, "-", "-", "-", "[green]passed")
-
-        for rule, checks in self.warning.items():
-            for check in checks:
-                table.add_row(
-                    rule,
-                    f"[b]{check.check_id}[/b]",
-                    f"[b]{check.message}[/b]",
-                    "-",
-                    "[yellow]warning",
-                )
-
-        for rule, checks in self.non_compliant.items():
-            for check in checks:
-                table.add_row(
-                    rule,
-                    f"[b]{check.check_id}[/b]",
-                    f"[b]{check.message}[/b]",
-                    "-" if not check.path else f"[b][red]{check.path}[/b]",
-                    "[red]failed",
-                )
-
-        console = Console()
-        console.print(table)
+        render(self, renderer=renderer, max_rows=max_rows, stream=stream)
+
+
+class GuardRuleSetResultBuilder:
+    """Accumulates results of rule files evaluated over a schema.
+
+    Results are added in place, in amortized constant time per result,
+    and results of a rule reported by several rule files are united.
+    `build` freezes accumulated results into a `GuardRuleSetResult`.
+
+    Typical usage example:
+
+        builder = GuardRuleSetResultBuilder()
+        builder.add_compliant(["rule_a"])
+        builder.add_non_compliant("rule_b", GuardRuleResult(check_id="ID001"))
+        result = builder.build()
+    """
+
+    def __init__(self):
+        self._compliant: List[str] = []
+        self._skipped: List[str] = []
+        self._non_compliant: Dict[str, Set[GuardRuleResult]] = {}
+        self._warning: Dict[str, Set[GuardRuleResult]] = {}
+
+    def add_compliant(self, rule_names: Iterable[str]):
+        """Adds rules, that schema passed"""
+        self._compliant.extend(map(_intern, rule_names))
+
+    def add_skipped(self, rule_names: Iterable[str]):
+        """Adds rules, that are not applicable to the schema"""
+        self._skipped.extend(map(_intern, rule_names))
+
+    def add_non_compliant(self, rule_name: str, result: GuardRuleResult):
+        """Adds failed check of the rule"""
+        results = self._non_compliant.get(rule_name)
+        if results is None:
+            results = self._non_compliant[_intern(rule_name)] = set()
+        results.add(result)
+
+    def add_warning(self, rule_name: str, result: GuardRuleResult):
+        """Adds failed check of the rule, which is not a hard requirement"""
+        results = self._warning.get(rule_name)
+        if results is None:
+            results = self._warning[_intern(rule_name)] = set()
+        results.add(result)
+
+    def merge(self, guard_ruleset_result: Any):
+        """Adds all rules of the result.
+
+        Args:
+            guard_ruleset_result (Any): result in a raw form
+        """
+        if not isinstance(guard_ruleset_result, GuardRuleSetResult):
+            raise TypeError("cannot merge with non GuardRuleSetResult type")
+        self.add_compliant(guard_ruleset_result.compliant)
+        self.add_skipped(guard_ruleset_result.skipped)
+        _merge_rule_results(self._non_compliant, guard_ruleset_result.non_compliant)
+        _merge_rule_results(self._warning, guard_ruleset_result.warning)
+
+    def build(self) -> GuardRuleSetResult:
+        """Freezes accumulated results.
+
+        The result does not share containers with the builder, which
+        can keep accumulating.
+
+        Returns:
+            GuardRuleSetResult: accumulated results
+        """
+        return GuardRuleSetResult(
+            compliant=list(self._compliant),
+            non_compliant={
+                rule_name: set(results)
+                for rule_name, results in self._non_compliant.items()
+            },
+            warning={
+                rule_name: set(results) for rule_name, results in self._warning.items()
+            },
+            skipped=list(self._skipped),
+        )
+
+
+STATUS_NON_COMPLIANT = 0
+STATUS_WARNING = 1
+
+
+class _Pool:
+    """Assigns consecutive ids to distinct strings"""
+
+    __slots__ = ("ids", "values")
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.values: List[str] = []
+
+    def index(self, value: str) -> int:
+        """Returns id of the value, assigning a new one to unseen values"""
+        value_id = self.ids.get(value)
+        if value_id is None:
+            value_id = self.ids[value] = len(self.values)
+            self.values.append(value)
+        return value_id
+
+
+class ResultTable:
+    """Columnar store of failed checks over many schemas for bulk analytics.
+
+    Every failed check is a row of integer columns: `schema_idx`, `status`
+    (`STATUS_NON_COMPLIANT` or `STATUS_WARNING`), `rule_id`, `check_id`,
+    `message_id` and `path_id`. Strings are stored once per table and
+    referenced by ids, so a row takes a few dozen bytes instead of
+    a `GuardRuleResult` instance. Passed and skipped rules are not stored.
+
+    Typical usage example:
+
+        table = ResultTable()
+        for schema_idx, result in enumerate(results):
+            table.add(schema_idx, result)
+        table.counts("check_id").most_common(10)
+    """
+
+    COLUMNS = ("schema_idx", "status", "rule_id", "check_id", "message_id", "path_id")
+
+    def __init__(self):
+        self._columns: Dict[str, array] = {
+            name: array("B" if name == "status" else "I") for name in self.COLUMNS
+        }
+        self._pools: Dict[str, _Pool] = {
+            "rule_id": _Pool(),
+            "check_id": _Pool(),
+            "message_id": _Pool(),
+            "path_id": _Pool(),
+        }
+
+    def __len__(self) -> int:
+        return len(self._columns["schema_idx"])
+
+    def add(self, schema_idx: int, result: GuardRuleSetResult):
+        """Appends failed checks of the schema result.
+
+        Args:
+            schema_idx (int): index of the evaluated schema
+            result (GuardRuleSetResult): result of the schema
+        """
+        columns, pools = self._columns, self._pools
+        for status, rule_results in (
+            (STATUS_NON_COMPLIANT, result.non_compliant),
+            (STATUS_WARNING, result.warning),
+        ):
+            for rule_name, checks in rule_results.items():
+                rule_id = pools["rule_id"].index(rule_name)
+                for check in checks:
+                    columns["schema_idx"].append(schema_idx)
+                    columns["status"].append(status)
+                    columns["rule_id"].append(rule_id)
+                    columns["check_id"].append(pools["check_id"].index(check.check_id))
+                    columns["message_id"].append(
+                        pools["message_id"].index(check.message)
+                    )
+                    columns["path_id"].append(pools["path_id"].index(check.path))
+
+    def column(self, name: str) -> array:
+        """Returns integer column by name, one of `COLUMNS`"""
+        if name not in self._columns:
+            raise KeyError(f"column must be one of {', '.join(self.COLUMNS)}")
+        return self._columns[name]
+
+    def values(self, name: str) -> List[str]:
+        """Returns strings referenced by ids of the column, indexed by id"""
+        if name not in self._pools:
+            raise KeyError(f"column of strings must be one of {', '.join(self._pools)}")
+        return self._pools[name].values
+
+    def counts(self, name: str) -> Counter:
+        """Counts rows per value of the column.
+
+        Args:
+            name (str): one of `COLUMNS`
+
+        Returns:
+            Counter: number of rows per column value, strings for
+                columns of string ids
+        """
+        counts = Counter(self.column(name))
+        if name not in self._pools:
+            return counts
+        values = self.values(name)
+        return Counter({values[value_id]: count for value_id, count in counts.items()})
+
+    def rows(self) -> Iterator[Tuple[int, int, str, GuardRuleResult]]:
+        """Yields rows as schema index, status, rule name and failed check"""
+        columns = [self._columns[name] for name in self.COLUMNS]
+        rules, check_ids, messages, paths = (
+            pool.values for pool in self._pools.values()
+        )
+        for schema_idx, status, rule_id, check_id, message_id, path_id in zip(*columns):
+            yield schema_idx, status, rules[rule_id], GuardRuleResult(
+                check_id=check_ids[check_id],
+                message=messages[message_id],
+                path=paths[path_id],
+            )
+
+    def failures(self, schema_idx: int) -> GuardRuleSetResult:
+        """Restores failed and warning checks of the schema.
+
+        Args:
+            schema_idx (int): index of the schema
+
+        Returns:
+            GuardRuleSetResult: result without passed and skipped rules
+        """
+        builder = GuardRuleSetResultBuilder()
+        for row_schema_idx, status, rule_name, check in self.rows():
+            if row_schema_idx != schema_idx:
+                continue
+            if status == STATUS_WARNING:
+                builder.add_warning(rule_name, check)
+            else:
+                builder.add_non_compliant(rule_name, check)
+        return builder.build()
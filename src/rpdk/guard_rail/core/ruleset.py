@@ -0,0 +1,373 @@
+"""Module to load and hold guard rules.
+
+Built-in rules are shipped as `.guard` files in the rule library packages.
+RuleSet loads them once, deduplicates them together with custom rules
+and exposes read-only views per compliance mode, so the same compiled
+collection of rules can be reused across many compliance runs.
+
+Typical usage example:
+
+    from rpdk.guard_rail.core.ruleset import RuleSet
+    from rpdk.guard_rail.core.runner import exec_compliance
+
+    ruleset = RuleSet(rules=list_of_custom_rules)
+    for payload in payloads:
+        exec_compliance(payload, ruleset=ruleset)
+"""
+import hashlib
+import importlib.resources as pkg_resources
+import re
+from ast import literal_eval
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import FrozenSet, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+from rpdk.guard_rail.rule_library import combiners, core, mutable, stateful, tags
+from rpdk.guard_rail.utils.common import is_guard_rule
+from rpdk.guard_rail.utils.logger import logdebug
+
+RULE_NAME_PATTERN = re.compile(r"^\s*rule\s+([A-Za-z_][A-Za-z0-9_]*)", re.MULTILINE)
+TOP_LEVEL_LET_PATTERN = re.compile(
+    r"^let\s+([A-Za-z_][A-Za-z0-9_]*)\s*=\s*(.*?)\s*$", re.MULTILINE
+)
+
+MESSAGE_PATTERN = re.compile(r"<<(.*?)>>", re.DOTALL)
+RULE_HEADER_PATTERN = re.compile(
+    r"^[ \t]*rule[ \t]+([A-Za-z_][A-Za-z0-9_]*)(?:[ \t]+when[ \t]+([^{\n]*?))?\s*\{",
+    re.MULTILINE,
+)
+EXISTS_CONDITION_PATTERN = re.compile(
+    r"^([A-Za-z_][A-Za-z0-9_]*)(?:\.[A-Za-z0-9_]+)*[ \t]+exists$"
+)
+
+RULE_MODULES = {
+    "stateless": [core, mutable, combiners, tags],
+    "stateful": [stateful],
+}
+
+
+def _read_module_rules(module: object):
+    """Reads all guard rule files of the rule library module"""
+    return {
+        pkg_resources.read_text(module, content)
+        for content in pkg_resources.contents(module)
+        if is_guard_rule(content)
+    }
+
+
+@logdebug
+def prepare_ruleset(mode: str = "stateless", is_read_only: bool = False):
+    """Fetches module level schema rules based on mode.
+
+    Iterates over provided modules (core, combiners, permissions, tags) or (stateful)
+    and checks if content is a guard rule-set, ten adds it to the list
+    `to-run`
+
+    Args:
+        is_read_only: whether the calling resource schema is read only or not
+        mode: The mode (stateless or stateful)
+
+    Returns:
+        Set[str]: set of rules in a string form
+    """
+    rule_set = set()
+    for module in RULE_MODULES[mode]:
+        module_name = module.__name__.split(".")[-1]
+        if is_read_only and module_name == "mutable":
+            continue
+        rule_set |= _read_module_rules(module)
+    return rule_set
+
+
+@logdebug
+def bundle_ruleset(ruleset: Iterable[str]) -> List[List[str]]:
+    """Groups rule files into bundles which can be evaluated in a single pass.
+
+    Rule files are concatenated into one guard document per bundle.
+    A rule file joins a bundle only if none of its rule names is already
+    defined there and its top level variables do not redefine existing
+    ones with a different value, so every rule result is still attributed
+    to exactly one rule file.
+
+    Args:
+        ruleset (Iterable[str]): collection of rules in a string form
+
+    Returns:
+        List[List[str]]: rule files grouped into bundles
+    """
+    bundles = []
+    for rules in ruleset:
+        rule_names = set(RULE_NAME_PATTERN.findall(rules))
+        variables = dict(TOP_LEVEL_LET_PATTERN.findall(rules))
+        for bundle in bundles:
+            if bundle["rule_names"] & rule_names:
+                continue
+            if any(
+                bundle["variables"].get(name, value) != value
+                for name, value in variables.items()
+            ):
+                continue
+            bundle["files"].append(rules)
+            bundle["rule_names"] |= rule_names
+            bundle["variables"].update(variables)
+            break
+        else:
+            bundles.append(
+                {"files": [rules], "rule_names": rule_names, "variables": variables}
+            )
+    return [bundle["files"] for bundle in bundles]
+
+
+@lru_cache(maxsize=256)
+def rule_file_name(rules: str) -> str:
+    """Names the rule file after its first rule"""
+    match = RULE_NAME_PATTERN.search(rules)
+    return match.group(1) if match else "unnamed"
+
+
+class RuleMessage(NamedTuple):
+    """Parsed custom message of the guard rule check"""
+
+    check_id: str
+    message: str
+    result: Optional[str] = None
+
+
+@lru_cache(maxsize=4096)
+def parse_rule_message(raw_message: str) -> RuleMessage:
+    """Parses custom message of the rule check.
+
+    Messages are static literals in the rule files, so the same
+    text is parsed only once and reused for every failing check.
+
+    Args:
+        raw_message (str): message emitted by guard for the failed check
+
+    Returns:
+        RuleMessage: check id, message and result of the check
+
+    Raises:
+        SyntaxError: message is not a valid literal
+    """
+    message = literal_eval(raw_message.strip())
+    return RuleMessage(
+        check_id=message["check_id"],
+        message=message["message"],
+        result=message.get("result"),
+    )
+
+
+def _preparse_messages(rules: str):
+    """Warms up message cache with all messages found in the rule file"""
+    for raw_message in MESSAGE_PATTERN.findall(rules):
+        try:
+            parse_rule_message(raw_message.strip())
+        except (SyntaxError, ValueError, KeyError, TypeError):
+            continue
+
+
+class RuleBlock(NamedTuple):
+    """Rule block gated on the existence of a top level key"""
+
+    name: str
+    key: str
+    start: int
+    end: int
+
+
+class RuleDependencies(NamedTuple):
+    """Static analysis of the rule file"""
+
+    rule_count: int = 0
+    blocks: Tuple[RuleBlock, ...] = ()
+
+
+def _find_block_end(rules: str, start: int) -> int:
+    """Finds the end of the block opened by the brace at `start` position.
+
+    Braces inside messages, strings and comments are ignored.
+
+    Returns:
+        int: position after the closing brace, -1 if block is not closed
+    """
+    depth = 0
+    position = start
+    while position < len(rules):
+        char = rules[position]
+        if rules.startswith("<<", position):
+            closing = rules.find(">>", position + 2)
+            if closing < 0:
+                return -1
+            position = closing + 2
+            continue
+        if char in "\"'":
+            closing = rules.find(char, position + 1)
+            if closing < 0:
+                return -1
+            position = closing + 1
+            continue
+        if char == "#":
+            closing = rules.find("\n", position)
+            position = len(rules) if closing < 0 else closing + 1
+            continue
+        if char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return position + 1
+        position += 1
+    return -1
+
+
+@lru_cache(maxsize=256)
+def analyze_rule_dependencies(rules: str) -> RuleDependencies:
+    """Extracts top level keys that rule blocks depend on.
+
+    Only blocks gated with `when <key> exists` and not referenced
+    by other rules of the file are considered; guard reports such
+    blocks as skipped whenever the key is absent from the document.
+    If the file cannot be reliably split into blocks, e.g. a `when`
+    clause spans several lines, no block is reported.
+
+    Args:
+        rules (str): rule file in a string form
+
+    Returns:
+        RuleDependencies: number of rules and gated rule blocks
+    """
+    headers = list(RULE_HEADER_PATTERN.finditer(rules))
+    rule_count = len(RULE_NAME_PATTERN.findall(rules))
+    if rule_count != len(headers):
+        # some rules are not recognized by the header pattern,
+        # pruning the recognized ones could drop the others
+        return RuleDependencies(rule_count=rule_count)
+    blocks = []
+    previous_end = 0
+    for header in headers:
+        end = _find_block_end(rules, header.end() - 1)
+        if end < 0 or header.start() < previous_end:
+            return RuleDependencies(rule_count=len(headers))
+        previous_end = end
+
+        name, condition = header.group(1), (header.group(2) or "").strip()
+        gating_key = EXISTS_CONDITION_PATTERN.match(condition)
+        if not gating_key:
+            continue
+        if len(re.findall(rf"\b{name}\b", rules)) > 1:
+            continue
+        blocks.append(
+            RuleBlock(name=name, key=gating_key.group(1), start=header.start(), end=end)
+        )
+    return RuleDependencies(rule_count=len(headers), blocks=tuple(blocks))
+
+
+def prune_rules(rules: str, document: Mapping) -> Tuple[Optional[str], Tuple[str, ...]]:
+    """Removes rule blocks whose gating keys are absent from the document.
+
+    Args:
+        rules (str): rule file in a string form
+        document (Mapping): document the rules are evaluated against
+
+    Returns:
+        Tuple[Optional[str], Tuple[str, ...]]: rules left to evaluate
+            (None if no rule is left) and names of skipped rules
+    """
+    dependencies = analyze_rule_dependencies(rules)
+    pruned = [block for block in dependencies.blocks if block.key not in document]
+    if not pruned:
+        return rules, ()
+
+    skipped = tuple(block.name for block in pruned)
+    if len(pruned) == dependencies.rule_count:
+        return None, skipped
+
+    remaining = []
+    position = 0
+    for block in pruned:
+        remaining.append(rules[position : block.start])
+        position = block.end
+    remaining.append(rules[position:])
+    return "".join(remaining), skipped
+
+
+def fingerprint_rules(rules: Iterable[str]) -> str:
+    """Computes order independent fingerprint of the collection of rules"""
+    digest = hashlib.sha256()
+    for rule_hash in sorted(
+        hashlib.sha256(rule.encode("utf-8")).hexdigest() for rule in set(rules)
+    ):
+        digest.update(rule_hash.encode("ascii"))
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True)
+class RuleSetView:
+    """Immutable collection of rules for a single compliance mode.
+
+    Attributes:
+        rules: deduplicated rule files in a string form
+        bundles: rule files grouped for single pass evaluation
+        fingerprint: order independent hash of the rules
+    """
+
+    rules: FrozenSet[str] = field(default_factory=frozenset)
+    bundles: Tuple[Tuple[str, ...], ...] = field(default_factory=tuple)
+    fingerprint: str = field(default="")
+
+    @classmethod
+    def from_rules(cls, rules: Iterable[str]):
+        """Builds the view, deduplicating rules and precomputing bundles"""
+        rules = frozenset(rules)
+        for rule in rules:
+            _preparse_messages(rule)
+            analyze_rule_dependencies(rule)
+        return cls(
+            rules=rules,
+            bundles=tuple(tuple(bundle) for bundle in bundle_ruleset(rules)),
+            fingerprint=fingerprint_rules(rules),
+        )
+
+    def extend(self, rules: Iterable[str]):
+        """Returns the view with additional rules; self if nothing is added"""
+        rules = frozenset(rules)
+        if rules <= self.rules:
+            return self
+        return RuleSetView.from_rules(self.rules | rules)
+
+
+class RuleSet:
+    """Compiled set of built-in and custom rules.
+
+    Rule library is read once on construction; views are immutable
+    and can be shared between compliance runs and threads.
+
+    Attributes:
+        stateless: rules for stateless compliance assessment
+        read_only: rules for stateless assessment of read only resources
+        stateful: rules for stateful compliance assessment
+    """
+
+    def __init__(self, rules: Iterable[str] = ()):
+        custom_rules = frozenset(rules)
+        library = {
+            module.__name__.split(".")[-1]: _read_module_rules(module)
+            for modules in RULE_MODULES.values()
+            for module in modules
+        }
+
+        def __view(*module_names):
+            return RuleSetView.from_rules(
+                set().union(*(library[name] for name in module_names)) | custom_rules
+            )
+
+        self.stateless = __view("core", "mutable", "combiners", "tags")
+        self.read_only = __view("core", "combiners", "tags")
+        self.stateful = __view("stateful")
+
+    def __repr__(self):
+        return (
+            f"RuleSet(stateless={self.stateless.fingerprint[:12]}, "
+            f"read_only={self.read_only.fingerprint[:12]}, "
+            f"stateful={self.stateful.fingerprint[:12]})"
+        )
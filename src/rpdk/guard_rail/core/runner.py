@@ -3,66 +3,106 @@
 Main function is __exec_rules__, which is a factory function. It uses closure
 to run multiple schemas over multiple sets of rules. There is an abstraction function
 on top of lower level (__exec_rules__) - exec_compliance. This function invokes factory function
-in stateless and stateful mode
+in stateless and stateful mode. iter_compliance is a streaming counterpart of
+exec_compliance, which yields result of each schema as soon as it is evaluated.
 
 Typical usage example:
 
-    from guard_rail.core.runner import exec_compliance
+    from guard_rail.core.runner import exec_compliance, iter_compliance
     payload: Stateless|Stateful = ...
     exec_compliance(payload)
+    # or
+    for schema_index, result in iter_compliance(payload):
+        ...
 """
-import importlib.resources as pkg_resources
-from ast import literal_eval
+from concurrent.futures import FIRST_COMPLETED, wait
 from functools import singledispatch
-from typing import Any, Dict, Mapping
+from itertools import islice
+from typing import Dict, Iterable, Optional, Sequence, Tuple, Union
 
 import cfn_guard_rs
 
+from rpdk.guard_rail.core.cache import ResultCache, cache_namespace
 from rpdk.guard_rail.core.data_types import (
     GuardRuleResult,
     GuardRuleSetResult,
+    GuardRuleSetResultBuilder,
     Stateful,
     Stateless,
 )
-from rpdk.guard_rail.core.stateful import schema_diff
-from rpdk.guard_rail.rule_library import combiners, core, mutable, stateful, tags
-from rpdk.guard_rail.utils.common import is_guard_rule
+from rpdk.guard_rail.core.ruleset import (
+    RuleSet,
+    RuleSetView,
+    parse_rule_message,
+    prepare_ruleset,
+    prune_rules,
+    rule_file_name,
+)
+from rpdk.guard_rail.core.stateful import print_schema_diff, schema_diff
 from rpdk.guard_rail.utils.logger import LOG, logdebug
+from rpdk.guard_rail.utils.profiling import profiled
 from rpdk.guard_rail.utils.schema_utils import add_paths_to_schema
+from rpdk.guard_rail.utils.timing import (
+    add_timings,
+    record_timings,
+    stage,
+    stages_enabled,
+    timings_enabled,
+)
 
 NON_COMPLIANT = "NON_COMPLIANT"
 WARNING = "WARNING"
 
+# rules, result cache and timings switch preloaded into process pool workers
+# by __init_worker__
+_WORKER_CONTEXT = ((), None, "", False)
 
-@logdebug
-def prepare_ruleset(mode: str = "stateless", is_read_only: bool = False):
-    """Fetches module level schema rules based on mode.
 
-    Iterates over provided modules (core, combiners, permissions, tags) or (stateful)
-    and checks if content is a guard rule-set, ten adds it to the list
-    `to-run`
+def __run_checks__(schema: Dict, rules: Union[str, Sequence[str]]):
+    """Runs guard over the schema for a single rule file or a bundle of files.
+
+    Rule blocks gated on top level keys absent from the schema are not
+    evaluated, they are reported as skipped (as guard does); rule files
+    without any block left are not evaluated at all.
+    A bundle is evaluated in a single pass; if guard cannot evaluate
+    the concatenated document, files are evaluated one by one instead.
 
     Args:
-        is_read_only: whether the calling resource schema is read only or not
-        mode: The mode (stateless or stateful)
+        schema (Dict): Resource Provider Schema
+        rules (Union[str, Sequence[str]]): rule file or bundle of rule files
 
     Returns:
-        Set[str]: set of rules in a string form
+        Tuple[List, List[str]]: guard evaluation results and skipped rules
     """
-    rule_modules = {
-        "stateless": [core, mutable, combiners, tags],
-        "stateful": [stateful],
-    }
-    rule_set = set()
-    for module in rule_modules[mode]:
-        module_name = module.__name__.split(".")[-1]
-        if is_read_only and module_name == "mutable":
-            continue
-        for content in pkg_resources.contents(module):
-            if not is_guard_rule(content):
-                continue
-            rule_set.add(pkg_resources.read_text(module, content))
-    return rule_set
+    skipped = []
+    files_to_run = []
+    file_names = []
+    for file_rules in [rules] if isinstance(rules, str) else rules:
+        pruned_rules, skipped_rules = prune_rules(file_rules, schema)
+        skipped.extend(skipped_rules)
+        if pruned_rules is not None:
+            files_to_run.append(pruned_rules)
+            file_names.append(file_rules)
+
+    def __run__(rules_to_run: str, names: Sequence[str]):
+        if not stages_enabled():
+            return cfn_guard_rs.run_checks(schema, rules_to_run)
+        with stage("run_checks:" + "+".join(map(rule_file_name, names))):
+            return cfn_guard_rs.run_checks(schema, rules_to_run)
+
+    if len(files_to_run) <= 1:
+        return [
+            __run__(file_rules, [name])
+            for file_rules, name in zip(files_to_run, file_names)
+        ], skipped
+    try:
+        return [__run__("\n".join(files_to_run), file_names)], skipped
+    except Exception as ex:
+        LOG.info("single pass evaluation failed, falling back: %s", str(ex))
+        return [
+            __run__(file_rules, [name])
+            for file_rules, name in zip(files_to_run, file_names)
+        ], skipped
 
 
 @logdebug
@@ -70,64 +110,122 @@ def __exec_rules__(schema: Dict):
     """Closure factory function for schema compliace execution -
     Read rule compliance status and output guard rule set result
     Creates closure, modifies, and retains the previous state between calls (rule set evaluations)
+    Results of all calls are accumulated in a single builder, returned by every call;
+    `build` it once all rules are evaluated.
     Args:
         schema ([Dict]): Resource Provider Schema
     Returns:
         [function]: Closure
     """
-    exec_result = GuardRuleSetResult()
+    exec_result = GuardRuleSetResultBuilder()
 
-    @logdebug
-    def __exec__(rules: str):
-        guard_result = cfn_guard_rs.run_checks(schema, rules)
+    def __exec__(rules: Union[str, Sequence[str]]):
         tag_path = schema.get("TaggingPath")
 
         def __render_output(evaluation_result: object):
-            def __add_item__(rule_name: str, mapping: Mapping, result: Any):
-                if rule_name in mapping:
-                    mapping[rule_name].add(result)
-                    return
-                mapping[rule_name] = {result}
-
-            non_compliant = {}
-            warning = {}
-            for rule_name, checks in guard_result.not_compliant.items():
+            exec_result.add_compliant(evaluation_result.compliant)
+            exec_result.add_skipped(evaluation_result.not_applicable)
+            for rule_name, checks in evaluation_result.not_compliant.items():
                 for check in checks:
                     try:
                         if check.message:
-                            _message_dict = literal_eval(check.message.strip())
-                            _check_id = _message_dict["check_id"]
+                            _rule_message = parse_rule_message(check.message.strip())
+                            _check_id = _rule_message.check_id
                             _path = check.path
                             if _check_id == "TAG016" and tag_path:
                                 _path = tag_path
 
                             rule_result = GuardRuleResult(
                                 check_id=_check_id,
-                                message=_message_dict["message"],
+                                message=_rule_message.message,
                                 path=_path,
                             )
 
-                            if _message_dict.get("result", NON_COMPLIANT) == WARNING:
-                                __add_item__(rule_name, warning, rule_result)
+                            if _rule_message.result == WARNING:
+                                exec_result.add_warning(rule_name, rule_result)
                             else:
-                                __add_item__(rule_name, non_compliant, rule_result)
+                                exec_result.add_non_compliant(rule_name, rule_result)
                     except SyntaxError as ex:
                         LOG.info("%s %s", str(ex), check.message)
-                        __add_item__(rule_name, non_compliant, GuardRuleResult())
+                        exec_result.add_non_compliant(rule_name, GuardRuleResult())
 
-            return GuardRuleSetResult(
-                compliant=evaluation_result.compliant,
-                warning=warning,
-                non_compliant=non_compliant,
-                skipped=evaluation_result.not_applicable,
-            )
-
-        exec_result.merge(__render_output(guard_result))
+        guard_results, skipped_rules = __run_checks__(schema, rules)
+        with stage("render"):
+            for guard_result in guard_results:
+                __render_output(guard_result)
+        exec_result.add_skipped(skipped_rules)
         return exec_result
 
     return __exec__
 
 
+def __evaluate_schema__(
+    schema: Dict,
+    rules_to_run: Sequence,
+    cache: Optional[ResultCache] = None,
+    namespace: str = "",
+    record: bool = False,
+):
+    """Runs stateless compliance assessment of a single schema.
+
+    Args:
+        schema (Dict): Resource Provider Schema
+        rules_to_run (Sequence): rule files or bundles of rule files
+        cache (Optional[ResultCache]): cache of results, if enabled
+        namespace (str): namespace of cache entries
+        record (bool): whether to attach stage timings to the result,
+            implied by an active timings recorder
+    Returns:
+        GuardRuleSetResult: Rule Result
+    """
+
+    def __evaluate__():
+        cache_key = None
+        if cache is not None:
+            with stage("cache"):
+                cache_key = cache.key(namespace, schema)
+                output = cache.get(cache_key)
+            if output is not None:
+                return output
+
+        schema_with_paths = add_paths_to_schema(schema=schema)
+        schema_to_execute = __exec_rules__(schema=schema_with_paths)
+        builder = None
+        for rules in rules_to_run:
+            builder = schema_to_execute(rules)
+        output = builder.build() if builder is not None else None
+
+        if cache is not None and output is not None:
+            with stage("cache"):
+                cache.put(cache_key, output)
+        return output
+
+    if not record and not timings_enabled():
+        return __evaluate__()
+
+    with record_timings() as timings:
+        output = __evaluate__()
+    if output is not None:
+        output.timings = timings.json
+    return output
+
+
+def __init_worker__(
+    rules_to_run: Sequence,
+    cache: Optional[ResultCache] = None,
+    namespace: str = "",
+    record: bool = False,
+):
+    """Preloads rules, result cache and timings switch into the process pool worker"""
+    global _WORKER_CONTEXT  # pylint: disable=W0603
+    _WORKER_CONTEXT = (rules_to_run, cache, namespace, record)
+
+
+def __evaluate_in_worker__(schema: Dict):
+    """Evaluates schema with the rules preloaded into the worker"""
+    return __evaluate_schema__(schema, *_WORKER_CONTEXT)
+
+
 @singledispatch
 def exec_compliance(*args, **kwards):
     """Placeholder for exec_compliance
@@ -141,66 +239,254 @@ def exec_compliance(*args, **kwards):
     raise NotImplementedError("not supported implementation")
 
 
+def __iter_in_pool__(
+    schemas: Iterable[Dict], worker_context: Tuple, workers: int, ordered: bool
+):
+    """Evaluates schemas in a process pool yielding results as they complete.
+
+    At most `2 * workers` schemas are in flight (or awaiting their turn
+    when results are ordered), so memory does not grow with the number
+    of schemas.
+
+    Args:
+        schemas (Iterable[Dict]): Resource Provider Schemas
+        worker_context (Tuple): rules, result cache, its namespace and
+            whether to record timings
+        workers (int): number of worker processes
+        ordered (bool): whether to yield results in the order of schemas
+    Yields:
+        Tuple[int, GuardRuleSetResult]: schema index and its Rule Result
+    """
+    # multiprocessing is loaded only when schemas are evaluated in parallel
+    from concurrent.futures import ProcessPoolExecutor
+
+    window = workers * 2
+    indexed_schemas = enumerate(schemas)
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=__init_worker__,
+        initargs=worker_context,
+    ) as executor:
+        pending = {}
+        completed = {}
+        next_index = 0
+
+        def __submit__():
+            for index, schema in islice(
+                indexed_schemas, max(0, window - len(pending) - len(completed))
+            ):
+                pending[executor.submit(__evaluate_in_worker__, schema)] = index
+
+        __submit__()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                output = future.result()
+                if output is not None and output.timings:
+                    # stages measured in the worker add up in the caller
+                    add_timings(output.timings)
+                if not ordered:
+                    yield index, output
+                    continue
+                completed[index] = output
+                while next_index in completed:
+                    yield next_index, completed.pop(next_index)
+                    next_index += 1
+            __submit__()
+
+
+@singledispatch
+def iter_compliance(*args, **kwargs):
+    """Placeholder for iter_compliance
+    Streaming counterpart of exec_compliance, yields
+    (schema_index, GuardRuleSetResult) pairs as each schema is evaluated
+    Raises:
+        NotImplementedError: not supported implementation
+    """
+    raise NotImplementedError("not supported implementation")
+
+
+@iter_compliance.register(Stateless)
+def _(
+    payload,
+    single_pass: bool = False,
+    ruleset: Optional[RuleSet] = None,
+    workers: int = 1,
+    ordered: bool = False,
+    cache_dir: Optional[str] = None,
+):
+    """Implements iter_compliance for stateless compliance assessment
+    over specified list of schemas/rules
+
+    Schemas are consumed lazily, so `payload.schemas` can be any iterable.
+
+    Args:
+        payload (Stateless): Stateless payload
+        single_pass (bool): whether to bundle rule files and evaluate
+            each schema in a single guard run
+        ruleset (Optional[RuleSet]): preloaded rules; rule library is read
+            on every call if not provided
+        workers (int): number of worker processes evaluating schemas
+            in parallel
+        ordered (bool): whether to yield results in the order of schemas;
+            otherwise results are yielded as soon as they complete
+        cache_dir (Optional[str]): directory of the persistent result cache;
+            results of previously evaluated schemas are read from it
+    Yields:
+        Tuple[int, GuardRuleSetResult]: schema index and its Rule Result
+    """
+    if ruleset is None:
+        rules_view = RuleSetView.from_rules(
+            prepare_ruleset(is_read_only=payload.is_read_only)
+        )
+    else:
+        rules_view = ruleset.read_only if payload.is_read_only else ruleset.stateless
+    rules_view = rules_view.extend(payload.rules)
+    rules_to_run = rules_view.bundles if single_pass else rules_view.rules
+    worker_context = (
+        rules_to_run,
+        ResultCache(cache_dir) if cache_dir else None,
+        cache_namespace(
+            "read_only" if payload.is_read_only else "stateless",
+            rules_view.fingerprint,
+        ),
+        timings_enabled(),
+    )
+
+    if workers > 1:
+        yield from __iter_in_pool__(payload.schemas, worker_context, workers, ordered)
+        return
+
+    for index, schema in enumerate(payload.schemas):
+        yield index, __evaluate_schema__(schema, *worker_context)
+
+
+@iter_compliance.register(Stateful)
+def _(payload, ordered: bool = False, **kwargs):
+    """Implements iter_compliance for stateful compliance assessment,
+    there is a single schema difference to evaluate
+
+    Args:
+        payload (Stateful): Stateful payload
+        ordered (bool): accepted for interface parity
+        kwargs: arguments of exec_compliance
+    Yields:
+        Tuple[int, GuardRuleSetResult]: index and Rule Result
+    """
+    yield from enumerate(exec_compliance(payload, **kwargs))
+
+
 # https://stackoverflow.com/questions/62700774/singledispatchmethod-with-typing-types
 # Have to switch to class type instead of typing due to functools known bug
 @exec_compliance.register(Stateless)
-def _(payload):
+@profiled
+def _(
+    payload,
+    single_pass: bool = False,
+    ruleset: Optional[RuleSet] = None,
+    workers: int = 1,
+    cache_dir: Optional[str] = None,
+):
     """Implements exec_compliance for stateless compliance assessment
     over specified list of schemas/rules
 
     Args:
         payload (Stateless): Stateless payload
+        single_pass (bool): whether to bundle rule files and evaluate
+            each schema in a single guard run
+        ruleset (Optional[RuleSet]): preloaded rules; rule library is read
+            on every call if not provided
+        workers (int): number of worker processes evaluating schemas
+            in parallel; results are returned in the order of schemas
+        cache_dir (Optional[str]): directory of the persistent result cache
     Returns:
         [GuardRuleSetResult]: Collection of Rule Results
     """
-
-    compliance_output = []
-    ruleset = prepare_ruleset(is_read_only=payload.is_read_only) | set(payload.rules)
-
-    def __execute_rules__(schema_exec, ruleset):
-        output = None
-        for rules in ruleset:
-            output = schema_exec(rules)
-        return output
-
-    for schema in payload.schemas:
-        schema_with_paths = add_paths_to_schema(schema=schema)
-        schema_to_execute = __exec_rules__(schema=schema_with_paths)
-        output = __execute_rules__(schema_exec=schema_to_execute, ruleset=ruleset)
-
-        compliance_output.append(output)
-    return compliance_output
+    return [
+        output
+        for _, output in iter_compliance(
+            payload,
+            single_pass=single_pass,
+            ruleset=ruleset,
+            workers=workers,
+            ordered=True,
+            cache_dir=cache_dir,
+        )
+    ]
 
 
 @exec_compliance.register(Stateful)
-def _(payload):
+@profiled
+def _(
+    payload,
+    single_pass: bool = False,
+    ruleset: Optional[RuleSet] = None,
+    workers: int = 1,
+    cache_dir: Optional[str] = None,
+):
     """Implements exec_compliance for stateful compliance assessment
     over specified list of rules
 
     Args:
         payload (Stateful): Stateful payload
+        single_pass (bool): whether to bundle rule files and evaluate
+            schema difference in a single guard run
+        ruleset (Optional[RuleSet]): preloaded rules; rule library is read
+            on every call if not provided
+        workers (int): accepted for interface parity; a single schema
+            difference is always evaluated in process
+        cache_dir (Optional[str]): directory of the persistent result cache
     Returns:
         GuardRuleSetResult: Rule Result
     """
-    compliance_output = []
-    ruleset = prepare_ruleset("stateful") | set(payload.rules)
+    if ruleset is None:
+        rules_view = RuleSetView.from_rules(prepare_ruleset("stateful"))
+    else:
+        rules_view = ruleset.stateful
+    rules_view = rules_view.extend(payload.rules)
+    rules_to_run = rules_view.bundles if single_pass else rules_view.rules
 
     def __execute__(schema_exec, ruleset):
-        output = None
+        builder = None
         for rules in ruleset:
-            output = schema_exec(rules)
+            builder = schema_exec(rules)
+        return builder.build() if builder is not None else GuardRuleSetResult()
+
+    def __evaluate__():
+        cache = ResultCache(cache_dir) if cache_dir else None
+        if cache is not None:
+            with stage("cache"):
+                cache_key = cache.key(
+                    cache_namespace("stateful", rules_view.fingerprint),
+                    payload.previous_schema,
+                    payload.current_schema,
+                )
+                output = cache.get(cache_key)
+            if output is not None:
+                if payload.print_diff_to_console:
+                    print_schema_diff(output.schema_difference)
+                return output
+
+        schema_difference = schema_diff(
+            previous_json=payload.previous_schema,
+            current_json=payload.current_schema,
+            print_diff_to_console=payload.print_diff_to_console,
+        )
+
+        schema_to_execute = __exec_rules__(schema=schema_difference)
+        output = __execute__(schema_exec=schema_to_execute, ruleset=rules_to_run)
+
+        output.schema_difference = schema_difference
+        if cache is not None:
+            with stage("cache"):
+                cache.put(cache_key, output)
         return output
 
-    schema_difference = schema_diff(
-        previous_json=payload.previous_schema,
-        current_json=payload.current_schema,
-        print_diff_to_console=payload.print_diff_to_console,
-    )
-
-    schema_to_execute = __exec_rules__(schema=schema_difference)
-    output = __execute__(schema_exec=schema_to_execute, ruleset=ruleset)
-
-    output.schema_difference = schema_difference
-    compliance_output.append(output)
+    if not timings_enabled():
+        return [__evaluate__()]
 
-    return compliance_output
+    with record_timings() as timings:
+        output = __evaluate__()
+    output.timings = timings.json
+    return [output]
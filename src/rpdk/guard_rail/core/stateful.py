@@ -1,6 +1,6 @@
 """Module to perform stateful schema diff.
 
-The main idea is to run two json blobs (v1, v2) over deepdiff module;
+The main idea is to walk two resolved json blobs (v1, v2) in lockstep;
 This module will generate a metadiff, which will have three main categories:
 1. iterable
 2. values change
@@ -11,6 +11,8 @@ This module will generate a metadiff, which will have three main categories:
 #2 covers arbitrary changes in values
 #3 covers any new item added/removed
 
+Lists are compared as sets, except primary identifier, which is ordered.
+
 
 Typical usage example:
 
@@ -18,28 +20,25 @@ Typical usage example:
     schema_v2 = ...
     schema_meta_diff = schema_diff(schema_v1, schema_v2)
 """
-import re
 from copy import copy
-from enum import auto
+from enum import Enum
 from functools import partial
-from typing import Any, Dict, Iterable
-
-from deepdiff import DeepDiff
-from rich.console import Console
+from typing import Any, Dict, Iterable, List, Tuple
 
-import strenum
 from rpdk.guard_rail.utils.schema_utils import resolve_schema
+from rpdk.guard_rail.utils.timing import timed
 
-console = Console()
 
+class METADIFF(str, Enum):
+    ITERABLE_ITEM_ADDED = "iterable_item_added"
+    ITERABLE_ITEM_REMOVED = "iterable_item_removed"
+    VALUES_CHANGED = "values_changed"
+    TYPE_CHANGES = "type_changes"
+    DICTIONARY_ITEM_ADDED = "dictionary_item_added"
+    DICTIONARY_ITEM_REMOVED = "dictionary_item_removed"
 
-class METADIFF(strenum.LowercaseStrEnum):
-    ITERABLE_ITEM_ADDED = auto()
-    ITERABLE_ITEM_REMOVED = auto()
-    VALUES_CHANGED = auto()
-    TYPE_CHANGES = auto()
-    DICTIONARY_ITEM_ADDED = auto()
-    DICTIONARY_ITEM_REMOVED = auto()
+    def __str__(self):
+        return self.value
 
 
 class DIFFKEYS:
@@ -52,6 +51,8 @@ class DIFFKEYS:
 
 
 PROPERTIES = "properties"
+ITEMS = "items"
+ORDERED_CONSTRUCT = "primaryIdentifier"
 cfn_list_constructs = {
     "primaryIdentifier",
     "readOnlyProperties",
@@ -98,37 +99,40 @@ native_constructs = {
 }
 
 
+@timed("schema_diff")
 def schema_diff(
     previous_json: Dict[str, Any],
     current_json: Dict[str, Any],
     print_diff_to_console: bool = True,
 ):
-    """schema diff function to get formatted schema diff from deep diff"""
+    """schema diff function to get formatted schema diff between two schemas"""
 
     previous_schema = resolve_schema(previous_json)
     current_schema = resolve_schema(current_json)
 
-    deep_diff = DeepDiff(
-        previous_schema,
-        current_schema,
-        ignore_order_func=lambda level: "primaryIdentifier" not in level.path(),
-        verbose_level=2,
-        ignore_type_in_groups=DeepDiff.numbers,
-    )
-
-    meta_diff = _translate_meta_diff(deep_diff.to_dict())
+    meta_diff = _translate_meta_diff(_structural_diff(previous_schema, current_schema))
     if print_diff_to_console:
-        console.rule("[bold red][GENERATED DIFF BETWEEN SCHEMAS]")
-        console.print(
-            meta_diff,
-            style="link https://google.com",
-            highlight=True,
-            justify="left",
-            soft_wrap=True,
-        )
+        print_schema_diff(meta_diff)
     return meta_diff
 
 
+@timed("display")
+def print_schema_diff(meta_diff: Dict[str, Any]):
+    """prints formatted schema diff to console"""
+    # rich is loaded only when diff is printed
+    from rich.console import Console
+
+    console = Console()
+    console.rule("[bold red][GENERATED DIFF BETWEEN SCHEMAS]")
+    console.print(
+        meta_diff,
+        style="link https://google.com",
+        highlight=True,
+        justify="left",
+        soft_wrap=True,
+    )
+
+
 def _is_combiner_property(path_list):
     """This method accepts an array of steps.
     If set is not empty and it starts with `properties`
@@ -182,13 +186,187 @@ def _get_path(path_list):
     return "/".join([""] + path_list)
 
 
-def _cast_path(value: str):
-    """cast the path of the change to process constructs"""
-    pattern = r"(?<=\[)'?([\s\S]+?)'?(?=\])"
-    value = value.replace("items']['properties", "*")
-    value = value.replace("]['properties'][", "][")
-    value = re.sub(r"[0-9]+]", "", value)
-    return re.findall(pattern, value)
+def _meta_path(path: Tuple[Any, ...]) -> List[str]:
+    """Converts path of the change into list of steps to process constructs.
+
+    Array items with nested properties are squashed into `*` and
+    `properties` keywords between two steps are omitted, e.g.
+    (properties, Foo, items, properties, Bar) -> [properties, Foo, *, Bar]
+    """
+    steps = []
+    index = 0
+    while index < len(path):
+        if path[index] == ITEMS and path[index + 1 : index + 2] == (PROPERTIES,):
+            steps.append("*")
+            index += 2
+            continue
+        steps.append(path[index])
+        index += 1
+
+    meta_path = []
+    index = 0
+    while index < len(steps):
+        meta_path.append(steps[index])
+        if 0 < index < len(steps) - 1 and steps[index] == PROPERTIES:
+            # keyword is omitted together with the check of the step after it
+            meta_path[-1] = steps[index + 1]
+            index += 1
+        index += 1
+    return meta_path
+
+
+def _is_number(value: Any):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _is_same_type(previous: Any, current: Any):
+    """Numbers are compared by value regardless of int/float type"""
+    return type(previous) is type(current) or (
+        _is_number(previous) and _is_number(current)
+    )
+
+
+def _item_key(value: Any):
+    """Builds hashable key of the list item, ignoring order of nested lists"""
+    if isinstance(value, dict):
+        return (dict, frozenset((key, _item_key(val)) for key, val in value.items()))
+    if isinstance(value, list):
+        return (list, frozenset(_item_key(item) for item in value))
+    if _is_number(value):
+        return (float, float(value))
+    return (type(value), value)
+
+
+def _new_items(items: List[Any], other_items: List[Any]) -> List[Any]:
+    """Returns distinct items missing from other items"""
+    seen = {_item_key(item) for item in other_items}
+    new_items = []
+    for item in items:
+        key = _item_key(item)
+        if key not in seen:
+            seen.add(key)
+            new_items.append(item)
+    return new_items
+
+
+def _paired_items(
+    removed: List[Dict[str, Any]], added: List[Dict[str, Any]]
+) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """Pairs removed and added sub schemas, most similar first.
+
+    Items sharing no keys are not paired; unpaired items are reported
+    as plainly removed or added.
+
+    Args:
+        removed (List[Dict[str, Any]]): sub schemas missing from the current list
+        added (List[Dict[str, Any]]): sub schemas missing from the previous list
+
+    Returns:
+        List[Tuple[Dict[str, Any], Dict[str, Any]]]: previous and current sub schema
+    """
+    candidates = sorted(
+        (
+            sum(map(len, _structural_diff(previous, current).values())),
+            removed_index,
+            added_index,
+        )
+        for removed_index, previous in enumerate(removed)
+        for added_index, current in enumerate(added)
+        if previous.keys() & current.keys()
+    )
+    pairs = []
+    paired_removed, paired_added = set(), set()
+    for _, removed_index, added_index in candidates:
+        if removed_index in paired_removed or added_index in paired_added:
+            continue
+        paired_removed.add(removed_index)
+        paired_added.add(added_index)
+        pairs.append((removed[removed_index], added[added_index]))
+    return pairs
+
+
+def _structural_diff(
+    previous_schema: Dict[str, Any], current_schema: Dict[str, Any]
+) -> Dict[METADIFF, List[Tuple[List[str], Any]]]:
+    """Walks both resolved schemas in lockstep and collects changes.
+
+    Args:
+        previous_schema (Dict[str, Any]): resolved previous version of the schema
+        current_schema (Dict[str, Any]): resolved current version of the schema
+
+    Returns:
+        Dict[METADIFF, List[Tuple[List[str], Any]]]: changes by category,
+            each change is a path of the change and a changed value
+    """
+    changes = {
+        METADIFF.TYPE_CHANGES: [],
+        METADIFF.DICTIONARY_ITEM_ADDED: [],
+        METADIFF.DICTIONARY_ITEM_REMOVED: [],
+        METADIFF.VALUES_CHANGED: [],
+        METADIFF.ITERABLE_ITEM_ADDED: [],
+        METADIFF.ITERABLE_ITEM_REMOVED: [],
+    }
+
+    def __report(category, path, value):
+        changes[category].append((_meta_path(path), value))
+
+    def __report_changed(category, path, previous, current):
+        __report(
+            category, path, {DIFFKEYS.OLD_VALUE: previous, DIFFKEYS.NEW_VALUE: current}
+        )
+
+    def __diff_lists(previous, current, path):
+        if any(ORDERED_CONSTRUCT in step for step in path if isinstance(step, str)):
+            for index in range(max(len(previous), len(current))):
+                if index >= len(current):
+                    __report(METADIFF.ITERABLE_ITEM_REMOVED, path, previous[index])
+                elif index >= len(previous):
+                    __report(METADIFF.ITERABLE_ITEM_ADDED, path, current[index])
+                else:
+                    __diff(previous[index], current[index], path)
+            return
+
+        added = _new_items(current, previous)
+        removed = _new_items(previous, current)
+        # sub schemas changed in place are compared with each other
+        # rather than reported as replaced
+        modified = _paired_items(
+            [item for item in removed if isinstance(item, dict)],
+            [item for item in added if isinstance(item, dict)],
+        )
+        paired = {id(item) for pair in modified for item in pair}
+        for item in added:
+            if id(item) not in paired:
+                __report(METADIFF.ITERABLE_ITEM_ADDED, path, item)
+        for item in removed:
+            if id(item) not in paired:
+                __report(METADIFF.ITERABLE_ITEM_REMOVED, path, item)
+        for previous_item, current_item in modified:
+            __diff(previous_item, current_item, path)
+
+    def __diff(previous, current, path):
+        if previous is current:
+            return
+        if not _is_same_type(previous, current):
+            __report_changed(METADIFF.TYPE_CHANGES, path, previous, current)
+        elif isinstance(previous, dict):
+            for key, value in current.items():
+                if key not in previous:
+                    __report(METADIFF.DICTIONARY_ITEM_ADDED, path + (key,), value)
+            for key, value in previous.items():
+                if key not in current:
+                    __report(METADIFF.DICTIONARY_ITEM_REMOVED, path + (key,), value)
+            for key, value in current.items():
+                if key in previous:
+                    __diff(previous[key], value, path + (key,))
+        elif isinstance(previous, list):
+            if previous != current:
+                __diff_lists(previous, current, path)
+        elif previous != current:
+            __report_changed(METADIFF.VALUES_CHANGED, path, previous, current)
+
+    __diff(previous_schema, current_schema, ())
+    return changes
 
 
 def _add_item(
@@ -287,8 +465,7 @@ def _translate_iterable_change(
     """
 
     def __translate_iter_added_diff(diffkey, schema_meta_diff, diff_value):
-        for key, value in diff_value.items():
-            path_list = _cast_path(key)
+        for path_list, value in diff_value:
             if _is_combiner_property(path_list):
                 raise NotImplementedError(
                     "Schemas with combiners are not yet supported for stateful evaluation"
@@ -340,8 +517,7 @@ def _translate_dict_change(
     """
 
     def __translate_dict_diff(diffkey, schema_meta_diff, diff_value):
-        for key, value in diff_value.items():
-            path_list = _cast_path(key)
+        for path_list, value in diff_value:
 
             if _is_combiner_property(path_list):
                 raise NotImplementedError(
@@ -427,8 +603,7 @@ def _translate_values_changed_diff_(schema_meta_diff, diff_value):
         schema_meta_diff (Dict[str, Any]): dictionary of translated schema diff
         diff_value (Any): arbitrary diff
     """
-    for key, value in diff_value.items():
-        path_list = _cast_path(key)
+    for path_list, value in diff_value:
         if _is_cfn_construct(path_list):
             _add_item(
                 schema_meta_diff,
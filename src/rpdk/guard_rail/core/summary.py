@@ -0,0 +1,183 @@
+"""Module to aggregate compliance results into running counters.
+
+`ComplianceAggregator` folds the result of every schema into counts per
+rule (passed, failed, warning, skipped) and per check id (failed,
+warning) as soon as the result is produced; details of failed checks are
+discarded. Memory stays bounded by the number of distinct rules and
+checks, regardless of the number of evaluated schemas.
+
+Typical usage example:
+
+    from rpdk.guard_rail.core.summary import ComplianceAggregator
+
+    aggregator = ComplianceAggregator()
+    aggregator.extend(result for _, result in iter_compliance(payload))
+    aggregator.display()
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Set
+
+from rpdk.guard_rail.core.data_types import GuardRuleSetResult
+
+HISTOGRAM_WIDTH = 20
+
+
+@dataclass
+class RuleCounts:
+    """Number of schemas per status of a rule"""
+
+    passed: int = 0
+    failed: int = 0
+    warning: int = 0
+    skipped: int = 0
+
+
+@dataclass
+class CheckCounts:
+    """Number of schemas in which a check failed"""
+
+    failed: int = 0
+    warning: int = 0
+
+
+class ComplianceAggregator:
+    """Accumulates counts of compliance results over many schemas.
+
+    Statuses are counted once per schema: a rule failing on several
+    paths of a schema counts as a single failure.
+
+    Attributes:
+        schemas: number of aggregated results
+        compliant_schemas: number of results without failed rules
+        rules: counts per rule name
+        checks: counts per check id
+    """
+
+    def __init__(self):
+        self.schemas = 0
+        self.compliant_schemas = 0
+        self.rules: Dict[str, RuleCounts] = {}
+        self.checks: Dict[str, CheckCounts] = {}
+
+    def _rule(self, rule_name: str) -> RuleCounts:
+        counts = self.rules.get(rule_name)
+        if counts is None:
+            counts = self.rules[rule_name] = RuleCounts()
+        return counts
+
+    def _check(self, check_id: str) -> CheckCounts:
+        counts = self.checks.get(check_id)
+        if counts is None:
+            counts = self.checks[check_id] = CheckCounts()
+        return counts
+
+    def add(self, result: GuardRuleSetResult):
+        """Folds result of a single schema into the counters.
+
+        Args:
+            result (GuardRuleSetResult): result of the schema
+        """
+        if not isinstance(result, GuardRuleSetResult):
+            raise TypeError("cannot aggregate non GuardRuleSetResult type")
+
+        self.schemas += 1
+        if not result.non_compliant:
+            self.compliant_schemas += 1
+        for rule_name in set(result.compliant):
+            self._rule(rule_name).passed += 1
+        for rule_name in set(result.skipped):
+            self._rule(rule_name).skipped += 1
+
+        failed: Set[str] = set()
+        for rule_name, checks in result.non_compliant.items():
+            self._rule(rule_name).failed += 1
+            failed.update(check.check_id for check in checks)
+        for check_id in failed:
+            self._check(check_id).failed += 1
+
+        warning: Set[str] = set()
+        for rule_name, checks in result.warning.items():
+            self._rule(rule_name).warning += 1
+            warning.update(check.check_id for check in checks)
+        for check_id in warning:
+            self._check(check_id).warning += 1
+
+    def extend(self, results: Iterable[GuardRuleSetResult]):
+        """Folds results one by one, as they come"""
+        for result in results:
+            self.add(result)
+
+    @property
+    def json(self) -> Dict[str, Any]:
+        """Translates counters into JSON document"""
+        return {
+            "schemas": self.schemas,
+            "compliant_schemas": self.compliant_schemas,
+            "rules": {
+                rule_name: {
+                    "passed": counts.passed,
+                    "failed": counts.failed,
+                    "warning": counts.warning,
+                    "skipped": counts.skipped,
+                }
+                for rule_name, counts in sorted(self.rules.items())
+            },
+            "checks": {
+                check_id: {"failed": counts.failed, "warning": counts.warning}
+                for check_id, counts in sorted(self.checks.items())
+            },
+        }
+
+    def display(self):
+        """Displays histograms of rules and checks, most failing first."""
+        # rich is loaded only when results are displayed
+        from rich.console import Console
+        from rich.table import Table
+
+        def __bar(count):
+            if not self.schemas:
+                return ""
+            return "█" * round(count / self.schemas * HISTOGRAM_WIDTH)
+
+        rules = Table(
+            title=f"Compliance Summary ({self.compliant_schemas} of "
+            f"{self.schemas} schemas compliant)"
+        )
+        rules.add_column("Rule Name", style="cyan", overflow="fold")
+        rules.add_column("Passed", justify="right", style="green")
+        rules.add_column("Failed", justify="right", style="red")
+        rules.add_column("Warning", justify="right", style="yellow")
+        rules.add_column("Skipped", justify="right")
+        rules.add_column("Failed Schemas", style="red", no_wrap=True)
+        for rule_name, counts in sorted(
+            self.rules.items(),
+            key=lambda item: (-item[1].failed, -item[1].warning, item[0]),
+        ):
+            rules.add_row(
+                rule_name,
+                str(counts.passed),
+                str(counts.failed),
+                str(counts.warning),
+                str(counts.skipped),
+                __bar(counts.failed),
+            )
+
+        checks = Table(title="Failed Checks")
+        checks.add_column("Check Id", style="magenta")
+        checks.add_column("Failed", justify="right", style="red")
+        checks.add_column("Warning", justify="right", style="yellow")
+        checks.add_column("Failed Schemas", style="red", no_wrap=True)
+        for check_id, counts in sorted(
+            self.checks.items(),
+            key=lambda item: (-item[1].failed, -item[1].warning, str(item[0])),
+        ):
+            checks.add_row(
+                str(check_id),
+                str(counts.failed),
+                str(counts.warning),
+                __bar(counts.failed),
+            )
+
+        console = Console()
+        console.print(rules)
+        console.print(checks)
@@ -0,0 +1,571 @@
+"""Module to serve stateless compliance assessment over Language Server Protocol.
+
+The language server keeps open schema documents in memory and publishes
+compliance results as diagnostics, ranged at the JSON element pointed to
+by the result path. Validation runs in stages:
+
+    1. parse: document text is parsed, syntax errors are reported
+       at the position of the error without evaluating rules
+    2. evaluate: rules are evaluated only when the parsed schema differs
+       from the previously evaluated one; formatting edits and undo
+       reuse results kept per schema content
+    3. locate: result paths are mapped to ranges of the current text
+
+Changes are applied incrementally and validation is debounced, so a burst
+of `textDocument/didChange` notifications results in a single evaluation.
+Rules are loaded once on startup.
+
+Messages are framed with `Content-Length` headers as defined by the
+protocol. Supported initialization options:
+    rules: list of custom rule paths (`file://...guard`)
+    singlePass: whether to evaluate rule files in a single guard run
+    debounce: delay of validation after the last change in milliseconds
+
+Typical usage example:
+
+    $ guard-rail-lsp
+    # or
+    $ python -m rpdk.guard_rail.lsp
+"""
+import argparse
+import json
+import re
+import sys
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+from rpdk.guard_rail.core.data_types import GuardRuleSetResult, Stateless
+from rpdk.guard_rail.core.ruleset import RuleSet
+from rpdk.guard_rail.core.runner import exec_compliance
+from rpdk.guard_rail.server import (
+    INVALID_PARAMS,
+    INVALID_REQUEST,
+    JSONRPC_VERSION,
+    METHOD_NOT_FOUND,
+    JsonRpcError,
+    error_response,
+)
+from rpdk.guard_rail.utils.arg_handler import add_logging_args, collect_rules
+from rpdk.guard_rail.utils.logger import LOG, configure_logging, logdebug
+
+DEFAULT_DEBOUNCE = 0.3
+RESULTS_CACHE_SIZE = 32
+SOURCE = "guard-rail"
+
+# TextDocumentSyncKind.Incremental
+INCREMENTAL_SYNC = 2
+# DiagnosticSeverity
+SEVERITY_ERROR = 1
+SEVERITY_WARNING = 2
+
+TOKEN_PATTERN = re.compile(r'"(?:[^"\\]|\\.)*"|[{}\[\]:,]|[^\s{}\[\]:,"]+')
+
+
+def _escape_pointer_token(token: str) -> str:
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+def locate_pointers(text: str) -> Dict[str, Tuple[int, int]]:
+    """Maps JSON pointers of the document elements to their offsets.
+
+    Members of objects are located by their keys, array items and
+    the root document by their values. The document is expected to be
+    a valid JSON.
+
+    Args:
+        text (str): JSON document
+
+    Returns:
+        Dict[str, Tuple[int, int]]: start and end offset per JSON pointer
+    """
+    locations = {}
+    # frames of open containers: [pointer, start, is_object, next index, key]
+    stack: List[list] = []
+    expect_key = False
+    for token in TOKEN_PATTERN.finditer(text):
+        value, start, end = token.group(), token.start(), token.end()
+        if value in ",:":
+            expect_key = value == "," and stack[-1][2]
+            continue
+        if value in "}]":
+            frame = stack.pop()
+            locations.setdefault(frame[0], (frame[1], end))
+            expect_key = False
+            continue
+        if expect_key:
+            key_pointer = f"{stack[-1][0]}/{_escape_pointer_token(json.loads(value))}"
+            stack[-1][4] = key_pointer
+            locations[key_pointer] = (start, end)
+            expect_key = False
+            continue
+
+        is_member = bool(stack) and stack[-1][2]
+        if not stack:
+            pointer = ""
+        elif is_member:
+            pointer = stack[-1][4]
+        else:
+            pointer = f"{stack[-1][0]}/{stack[-1][3]}"
+            stack[-1][3] += 1
+        if value in "{[":
+            stack.append([pointer, start, value == "{", 0, None])
+            expect_key = value == "{"
+        elif not is_member:
+            locations[pointer] = (start, end)
+    return locations
+
+
+def _utf16_length(text: str) -> int:
+    return len(text.encode("utf-16-le")) // 2
+
+
+def _line_starts(text: str) -> List[int]:
+    return [0] + [match.end() for match in re.finditer(r"\r\n|\r|\n", text)]
+
+
+def offset_to_position(
+    text: str, offset: int, line_starts: Optional[List[int]] = None
+) -> Dict[str, int]:
+    """Converts offset in the text to LSP position (UTF-16 based)"""
+    line_starts = line_starts if line_starts is not None else _line_starts(text)
+    line = bisect_right(line_starts, offset) - 1
+    return {
+        "line": line,
+        "character": _utf16_length(text[line_starts[line] : offset]),
+    }
+
+
+def position_to_offset(text: str, position: Dict[str, int]) -> int:
+    """Converts LSP position (UTF-16 based) to offset in the text"""
+    starts = _line_starts(text)
+    line = position["line"]
+    if line >= len(starts):
+        return len(text)
+    offset = starts[line]
+    line_end = starts[line + 1] if line + 1 < len(starts) else len(text)
+    units = position["character"]
+    while offset < line_end and units > 0 and text[offset] not in "\r\n":
+        units -= 2 if ord(text[offset]) > 0xFFFF else 1
+        offset += 1
+    return offset
+
+
+def apply_change(text: str, change: Dict[str, Any]) -> str:
+    """Applies `TextDocumentContentChangeEvent` to the text"""
+    if "range" not in change:
+        return change["text"]
+    start = position_to_offset(text, change["range"]["start"])
+    end = position_to_offset(text, change["range"]["end"])
+    return text[:start] + change["text"] + text[end:]
+
+
+def _locate(
+    locations: Dict[str, Tuple[int, int]], path: str
+) -> Optional[Tuple[int, int]]:
+    """Finds offsets of the path, falls back to its closest located parent"""
+    while True:
+        if path in locations:
+            return locations[path]
+        if not path:
+            return None
+        path = path.rsplit("/", 1)[0]
+
+
+@dataclass
+class Document:
+    """Open text document.
+
+    Attributes:
+        uri: document identifier
+        text: current content of the document
+        version: version reported by the client
+        schema_key: content of the last evaluated schema
+        result: result of the last evaluated schema
+    """
+
+    uri: str
+    text: str
+    version: Optional[int] = None
+    schema_key: Optional[str] = None
+    result: Optional[GuardRuleSetResult] = field(default=None, repr=False)
+
+
+class LanguageServer:
+    """Language server publishing compliance results as diagnostics.
+
+    Attributes:
+        documents: open documents by uri
+        ruleset: rules loaded once on startup
+        rules: custom rules applied to every document
+        single_pass: whether to evaluate rule files in a single guard run
+        debounce: delay of validation after the last change in seconds,
+            validation runs synchronously if not positive
+        running: whether server keeps reading messages
+    """
+
+    def __init__(
+        self,
+        output_stream: BinaryIO,
+        ruleset: Optional[RuleSet] = None,
+        debounce: float = DEFAULT_DEBOUNCE,
+    ):
+        self.output_stream = output_stream
+        self.documents: Dict[str, Document] = {}
+        self.ruleset = ruleset
+        self.rules: List[str] = []
+        self.single_pass = False
+        self.debounce = debounce
+        self.running = True
+        self._shutdown = False
+        self._results: "OrderedDict[str, GuardRuleSetResult]" = OrderedDict()
+        self._timers: Dict[str, threading.Timer] = {}
+        self._documents_lock = threading.Lock()
+        self._evaluation_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._handlers = {
+            "initialize": self._initialize,
+            "initialized": lambda params: None,
+            "shutdown": self._shutdown_request,
+            "exit": self._exit,
+            "textDocument/didOpen": self._did_open,
+            "textDocument/didChange": self._did_change,
+            "textDocument/didSave": self._did_save,
+            "textDocument/didClose": self._did_close,
+        }
+
+    def send(self, message: Dict[str, Any]):
+        """Writes the message framed with `Content-Length` header"""
+        body = json.dumps(message).encode("utf-8")
+        with self._write_lock:
+            self.output_stream.write(
+                f"Content-Length: {len(body)}\r\n\r\n".encode("ascii") + body
+            )
+            self.output_stream.flush()
+
+    def handle(self, message: Dict[str, Any]):
+        """Handles a single request or notification, sending the response"""
+        method = message.get("method")
+        request_id = message.get("id")
+        try:
+            if not isinstance(method, str):
+                raise JsonRpcError(INVALID_REQUEST, "invalid request")
+            if self._shutdown and method != "exit":
+                raise JsonRpcError(INVALID_REQUEST, "server is shut down")
+            if method not in self._handlers:
+                raise JsonRpcError(METHOD_NOT_FOUND, f"method not found: {method}")
+            result = self._handlers[method](message.get("params") or {})
+        except JsonRpcError as ex:
+            response = error_response(request_id, ex.code, ex.message)
+        except (KeyError, ValueError, TypeError, OSError) as ex:
+            response = error_response(request_id, INVALID_PARAMS, str(ex))
+        else:
+            response = {"jsonrpc": JSONRPC_VERSION, "id": request_id, "result": result}
+        # notifications are not answered
+        if "id" in message:
+            self.send(response)
+
+    def _initialize(self, params: Dict[str, Any]):
+        options = params.get("initializationOptions") or {}
+        self.rules = collect_rules(rules=options.get("rules"))
+        self.single_pass = bool(options.get("singlePass", False))
+        if "debounce" in options:
+            self.debounce = float(options["debounce"]) / 1000
+        if self.ruleset is None:
+            self.ruleset = RuleSet()
+        return {
+            "capabilities": {
+                "textDocumentSync": {
+                    "openClose": True,
+                    "change": INCREMENTAL_SYNC,
+                    "save": True,
+                }
+            },
+            "serverInfo": {"name": SOURCE},
+        }
+
+    def _shutdown_request(self, params: Dict[str, Any]):
+        self._shutdown = True
+        self.cancel_pending()
+
+    def _exit(self, params: Dict[str, Any]):
+        self.cancel_pending()
+        self.running = False
+
+    def _did_open(self, params: Dict[str, Any]):
+        document = params["textDocument"]
+        with self._documents_lock:
+            self.documents[document["uri"]] = Document(
+                uri=document["uri"],
+                text=document["text"],
+                version=document.get("version"),
+            )
+        self.schedule(document["uri"], debounce=False)
+
+    def _did_change(self, params: Dict[str, Any]):
+        uri = params["textDocument"]["uri"]
+        with self._documents_lock:
+            document = self.documents.get(uri)
+            if document is None:
+                return
+            for change in params["contentChanges"]:
+                document.text = apply_change(document.text, change)
+            document.version = params["textDocument"].get("version")
+        self.schedule(uri)
+
+    def _did_save(self, params: Dict[str, Any]):
+        self.schedule(params["textDocument"]["uri"], debounce=False)
+
+    def _did_close(self, params: Dict[str, Any]):
+        uri = params["textDocument"]["uri"]
+        self._cancel(uri)
+        with self._documents_lock:
+            self.documents.pop(uri, None)
+        self.publish(uri, [])
+
+    def _cancel(self, uri: str):
+        timer = self._timers.pop(uri, None)
+        if timer is not None:
+            timer.cancel()
+
+    def cancel_pending(self):
+        """Cancels all pending validations"""
+        for uri in list(self._timers):
+            self._cancel(uri)
+
+    def schedule(self, uri: str, debounce: bool = True):
+        """Schedules validation of the document, replacing pending one.
+
+        Args:
+            uri (str): document identifier
+            debounce (bool): whether to wait for further changes
+        """
+        self._cancel(uri)
+        if not debounce or self.debounce <= 0:
+            self.validate(uri)
+            return
+        timer = threading.Timer(self.debounce, self.validate, args=(uri,))
+        timer.daemon = True
+        self._timers[uri] = timer
+        timer.start()
+
+    def _evaluate(self, schema: Dict[str, Any], schema_key: str) -> GuardRuleSetResult:
+        """Evaluates the schema, reusing results of recently seen schemas"""
+        with self._evaluation_lock:
+            if schema_key in self._results:
+                self._results.move_to_end(schema_key)
+                return self._results[schema_key]
+            result = exec_compliance(
+                Stateless(schemas=[schema], rules=self.rules),
+                single_pass=self.single_pass,
+                ruleset=self.ruleset,
+            )[0]
+            self._results[schema_key] = result
+            if len(self._results) > RESULTS_CACHE_SIZE:
+                self._results.popitem(last=False)
+            return result
+
+    @logdebug
+    def validate(self, uri: str):
+        """Validates the document and publishes its diagnostics.
+
+        Diagnostics are not published if the document was changed
+        or closed during validation, as newer validation is pending.
+
+        Args:
+            uri (str): document identifier
+        """
+        with self._documents_lock:
+            document = self.documents.get(uri)
+            if document is None:
+                return
+            text, version = document.text, document.version
+
+        try:
+            schema = json.loads(text)
+        except ValueError as ex:
+            diagnostics = [_syntax_diagnostic(text, ex)]
+        else:
+            if not isinstance(schema, dict):
+                diagnostics = [
+                    _diagnostic(
+                        text, (0, len(text)), SEVERITY_ERROR, "schema must be an object"
+                    )
+                ]
+            else:
+                schema_key = json.dumps(schema, sort_keys=True)
+                if document.schema_key == schema_key:
+                    result = document.result
+                else:
+                    result = self._evaluate(schema, schema_key)
+                    document.schema_key, document.result = schema_key, result
+                diagnostics = result_diagnostics(text, result)
+
+        with self._documents_lock:
+            current = self.documents.get(uri)
+            if current is not document or current.version != version:
+                return
+        self.publish(uri, diagnostics, version)
+
+    def publish(
+        self,
+        uri: str,
+        diagnostics: List[Dict[str, Any]],
+        version: Optional[int] = None,
+    ):
+        """Sends `textDocument/publishDiagnostics` notification"""
+        params = {"uri": uri, "diagnostics": diagnostics}
+        if version is not None:
+            params["version"] = version
+        self.send(
+            {
+                "jsonrpc": JSONRPC_VERSION,
+                "method": "textDocument/publishDiagnostics",
+                "params": params,
+            }
+        )
+
+
+def _diagnostic(
+    text: str,
+    offsets: Tuple[int, int],
+    severity: int,
+    message: str,
+    *,
+    code: Optional[str] = None,
+    line_starts: Optional[List[int]] = None,
+) -> Dict[str, Any]:
+    line_starts = line_starts if line_starts is not None else _line_starts(text)
+    diagnostic = {
+        "range": {
+            "start": offset_to_position(text, offsets[0], line_starts),
+            "end": offset_to_position(text, offsets[1], line_starts),
+        },
+        "severity": severity,
+        "source": SOURCE,
+        "message": message,
+    }
+    if code is not None:
+        diagnostic["code"] = code
+    return diagnostic
+
+
+def _syntax_diagnostic(text: str, error: ValueError) -> Dict[str, Any]:
+    position = min(getattr(error, "pos", 0), len(text))
+    return _diagnostic(
+        text,
+        (position, min(position + 1, len(text))),
+        SEVERITY_ERROR,
+        getattr(error, "msg", str(error)),
+    )
+
+
+def result_diagnostics(text: str, result: GuardRuleSetResult) -> List[Dict[str, Any]]:
+    """Translates compliance result into diagnostics of the document.
+
+    Args:
+        text (str): document the result was evaluated for
+        result (GuardRuleSetResult): compliance result
+
+    Returns:
+        List[Dict[str, Any]]: diagnostics ranged at the result paths
+    """
+    locations, line_starts = None, None
+    diagnostics = []
+    for severity, rule_results in (
+        (SEVERITY_ERROR, result.non_compliant),
+        (SEVERITY_WARNING, result.warning),
+    ):
+        for rule_name, checks in sorted(rule_results.items()):
+            for check in sorted(checks, key=lambda check: (check.path, check.check_id)):
+                if locations is None:
+                    locations, line_starts = locate_pointers(text), _line_starts(text)
+                offsets = _locate(locations, check.path) or (0, 0)
+                diagnostics.append(
+                    _diagnostic(
+                        text,
+                        offsets,
+                        severity,
+                        f"{check.message} ({rule_name})",
+                        code=check.check_id,
+                        line_starts=line_starts,
+                    )
+                )
+    return diagnostics
+
+
+def read_message(input_stream: BinaryIO) -> Optional[Dict[str, Any]]:
+    """Reads a message framed with `Content-Length` header.
+
+    Args:
+        input_stream (BinaryIO): stream to read from
+
+    Returns:
+        Optional[Dict[str, Any]]: message, None at the end of the stream
+    """
+    content_length = None
+    while True:
+        line = input_stream.readline()
+        if not line:
+            return None
+        line = line.strip()
+        if not line:
+            if content_length is None:
+                continue
+            break
+        name, _, value = line.decode("ascii").partition(":")
+        if name.strip().lower() == "content-length":
+            content_length = int(value.strip())
+    return json.loads(input_stream.read(content_length).decode("utf-8"))
+
+
+@logdebug
+def serve(
+    input_stream: Optional[BinaryIO] = None,
+    output_stream: Optional[BinaryIO] = None,
+    server: Optional[LanguageServer] = None,
+):
+    """Serves messages until exit or end of the input stream.
+
+    Args:
+        input_stream (Optional[BinaryIO]): stream of framed messages,
+            stdin by default
+        output_stream (Optional[BinaryIO]): stream to write framed messages to,
+            stdout by default
+        server (Optional[LanguageServer]): server state, created if not provided
+    """
+    input_stream = input_stream if input_stream is not None else sys.stdin.buffer
+    output_stream = output_stream if output_stream is not None else sys.stdout.buffer
+    server = server if server is not None else LanguageServer(output_stream)
+    while server.running:
+        try:
+            message = read_message(input_stream)
+        except ValueError as ex:
+            LOG.info("failed to read message: %s", str(ex))
+            continue
+        if message is None:
+            break
+        try:
+            server.handle(message)
+        except Exception:
+            LOG.exception("failed to handle %s message", message.get("method"))
+    server.cancel_pending()
+
+
+def main(args_in=None):
+    """Entry point of the language server"""
+    parser = add_logging_args(
+        argparse.ArgumentParser(
+            prog="guard-rail-lsp",
+            description="Serves compliance assessments over Language Server Protocol",
+        )
+    )
+    args = parser.parse_args(args=args_in)
+    configure_logging(level=args.log_level, log_file=args.log_file)
+    serve()
+
+
+if __name__ == "__main__":
+    main()
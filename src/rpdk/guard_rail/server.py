@@ -0,0 +1,230 @@
+"""Module to serve compliance assessments over JSON-RPC.
+
+Starting the interpreter and loading the rule library dominates the
+time of a single compliance run. The server keeps rules loaded and
+answers newline-delimited JSON-RPC 2.0 requests read from an input
+stream, one response line per request, so editors and hooks can run
+many assessments in a single long-lived process.
+
+Supported methods:
+    stateless: {"schemas": [...], "rules": [...], "is_read_only": false}
+        returns list of results, one per schema
+    stateful: {"previous_schema": ..., "current_schema": ..., "rules": [...]}
+        returns list with a single result
+    validate: parameters of both methods; runs stateless assessment
+        of `schemas` and/or stateful assessment of previous/current
+        schemas and returns {"stateless": [...], "stateful": [...]}
+    shutdown: stops the server
+
+Schemas are provided inline (as json objects) or as paths (`file://...json`),
+rules as paths of `.guard` files. Results are `GuardRuleSetResult.json` documents.
+
+Typical usage example:
+
+    $ guard-rail serve --stdio
+    {"jsonrpc": "2.0", "id": 1, "method": "stateless", "params": {"schemas": [{...}]}}
+"""
+import json
+import sys
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, TextIO
+
+from rpdk.guard_rail.core.data_types import Stateful, Stateless
+from rpdk.guard_rail.core.ruleset import RuleSet
+from rpdk.guard_rail.core.runner import exec_compliance
+from rpdk.guard_rail.utils.arg_handler import collect_rules, collect_schemas
+from rpdk.guard_rail.utils.logger import LOG, logdebug
+
+JSONRPC_VERSION = "2.0"
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+
+class JsonRpcError(Exception):
+    """Error reported back to the client as JSON-RPC error object"""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+@dataclass
+class ServerContext:
+    """State shared between requests.
+
+    Attributes:
+        ruleset: rules loaded once at startup
+        rules: custom rules applied to every request
+        single_pass: whether to evaluate rule files in a single guard run
+        cache_dir: directory of the persistent result cache
+        running: whether server keeps reading requests
+    """
+
+    ruleset: RuleSet = field(default_factory=RuleSet)
+    rules: List[str] = field(default_factory=list)
+    single_pass: bool = False
+    cache_dir: Optional[str] = None
+    running: bool = True
+
+
+def _collect_schema(schema: Any) -> Dict[str, Any]:
+    if isinstance(schema, dict):
+        return schema
+    if isinstance(schema, str):
+        return collect_schemas(schemas=[schema])[0]
+    raise JsonRpcError(INVALID_PARAMS, "schema must be an object or `file://` path")
+
+
+def _collect_rules(context: ServerContext, params: Dict[str, Any]) -> List[str]:
+    return context.rules + collect_rules(rules=params.get("rules"))
+
+
+def _stateless(context: ServerContext, params: Dict[str, Any]):
+    schemas = params.get("schemas")
+    if not isinstance(schemas, list):
+        raise JsonRpcError(INVALID_PARAMS, "`schemas` must be a list")
+    payload = Stateless(
+        schemas=[_collect_schema(schema) for schema in schemas],
+        rules=_collect_rules(context, params),
+        is_read_only=bool(params.get("is_read_only", False)),
+    )
+    return [
+        result.json
+        for result in exec_compliance(
+            payload,
+            single_pass=context.single_pass,
+            ruleset=context.ruleset,
+            cache_dir=context.cache_dir,
+        )
+    ]
+
+
+def _stateful(context: ServerContext, params: Dict[str, Any]):
+    if "previous_schema" not in params or "current_schema" not in params:
+        raise JsonRpcError(
+            INVALID_PARAMS, "`previous_schema` and `current_schema` must be provided"
+        )
+    payload = Stateful(
+        previous_schema=_collect_schema(params["previous_schema"]),
+        current_schema=_collect_schema(params["current_schema"]),
+        rules=_collect_rules(context, params),
+        print_diff_to_console=False,
+    )
+    return [
+        result.json
+        for result in exec_compliance(
+            payload,
+            single_pass=context.single_pass,
+            ruleset=context.ruleset,
+            cache_dir=context.cache_dir,
+        )
+    ]
+
+
+def _validate(context: ServerContext, params: Dict[str, Any]):
+    result = {}
+    if "schemas" in params:
+        result["stateless"] = _stateless(context, params)
+    if "previous_schema" in params or "current_schema" in params:
+        result["stateful"] = _stateful(context, params)
+    if not result:
+        raise JsonRpcError(INVALID_PARAMS, "no schemas to evaluate")
+    return result
+
+
+def _shutdown(context: ServerContext, params: Dict[str, Any]):
+    context.running = False
+
+
+METHODS: Dict[str, Callable[[ServerContext, Dict[str, Any]], Any]] = {
+    "stateless": _stateless,
+    "stateful": _stateful,
+    "validate": _validate,
+    "shutdown": _shutdown,
+}
+
+
+def error_response(request_id: Any, code: int, message: str):
+    """Builds JSON-RPC error response"""
+    return {
+        "jsonrpc": JSONRPC_VERSION,
+        "id": request_id,
+        "error": {"code": code, "message": message},
+    }
+
+
+def handle_request(context: ServerContext, message: str) -> Optional[Dict[str, Any]]:
+    """Handles a single JSON-RPC request.
+
+    Args:
+        context (ServerContext): server state
+        message (str): request in a string form
+
+    Returns:
+        Optional[Dict[str, Any]]: response, None for notifications
+    """
+    try:
+        request = json.loads(message)
+    except ValueError as ex:
+        return error_response(None, PARSE_ERROR, f"parse error: {ex}")
+
+    if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+        return error_response(None, INVALID_REQUEST, "invalid request")
+
+    request_id = request.get("id")
+    params = request.get("params", {})
+    try:
+        if request["method"] not in METHODS:
+            raise JsonRpcError(
+                METHOD_NOT_FOUND, f"method not found: {request['method']}"
+            )
+        if not isinstance(params, dict):
+            raise JsonRpcError(INVALID_PARAMS, "`params` must be an object")
+        result = METHODS[request["method"]](context, params)
+    except JsonRpcError as ex:
+        response = error_response(request_id, ex.code, ex.message)
+    except (AssertionError, ValueError, TypeError, OSError) as ex:
+        response = error_response(request_id, INVALID_PARAMS, str(ex))
+    except Exception as ex:
+        LOG.exception("failed to handle %s request", request["method"])
+        response = error_response(request_id, INTERNAL_ERROR, str(ex))
+    else:
+        response = {"jsonrpc": JSONRPC_VERSION, "id": request_id, "result": result}
+
+    # notifications are not answered
+    return response if "id" in request else None
+
+
+@logdebug
+def serve(
+    input_stream: Optional[TextIO] = None,
+    output_stream: Optional[TextIO] = None,
+    context: Optional[ServerContext] = None,
+):
+    """Serves requests until shutdown or end of the input stream.
+
+    Args:
+        input_stream (Optional[TextIO]): stream of newline-delimited requests,
+            stdin by default
+        output_stream (Optional[TextIO]): stream to write newline-delimited
+            responses to, stdout by default
+        context (Optional[ServerContext]): server state, rules are loaded
+            if not provided
+    """
+    input_stream = input_stream if input_stream is not None else sys.stdin
+    output_stream = output_stream if output_stream is not None else sys.stdout
+    context = context if context is not None else ServerContext()
+    for line in input_stream:
+        if not line.strip():
+            continue
+        response = handle_request(context, line)
+        if response is not None:
+            output_stream.write(json.dumps(response) + "\n")
+            output_stream.flush()
+        if not context.running:
+            break
@@ -27,7 +27,10 @@ from .common import (
     read_file,
     read_json,
 )
-from .logger import LOG, logdebug
+from .logger import LOG, LOG_LEVELS, logdebug
+from .output import OUTPUT_FORMATS
+from .render import RENDERERS
+from .timing import timed
 
 
 def apply_rule(execute_rule, msg, /):
@@ -54,6 +57,34 @@ def argument_validation(
     pass
 
 
+def add_logging_args(parser: argparse.ArgumentParser):
+    """Adds arguments enabling logging, which is off by default"""
+    parser.add_argument(
+        "--log-level",
+        dest="log_level",
+        type=str.upper,
+        choices=LOG_LEVELS,
+        default=None,
+        help="Should specify level of logging (logs to stderr unless `--log-file` is set)",
+    )
+
+    parser.add_argument(
+        "--log-file",
+        dest="log_file",
+        type=str,
+        default=None,
+        help="Should specify file to write logs to (INFO level unless `--log-level` is set)",
+    )
+    return parser
+
+
+def positive_int(value: str) -> int:  # pylint: disable=C0116
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"{value} is not a positive integer")
+    return number
+
+
 @logdebug
 def setup_args():  # pylint: disable=C0116
     parser = argparse.ArgumentParser(description=__doc__)
@@ -86,12 +117,47 @@ def setup_args():  # pylint: disable=C0116
         help="Should specify schema for CFN compliance evaluation (path or plain value)",
     )
 
+    parser.add_argument(
+        "--renderer",
+        dest="renderer",
+        choices=RENDERERS,
+        default=None,
+        help="Should specify table renderer of `--format` (implied): `rich` (default), "
+        "`plain` text columns or `stream` of tab separated rows for large outputs",
+    )
+
+    parser.add_argument(
+        "--max-rows",
+        dest="max_rows",
+        type=positive_int,
+        default=None,
+        help="Should specify maximum number of table rows displayed per schema",
+    )
+
     parser.add_argument(
         "--json",
         dest="json",
         action="store_true",
         default=False,
-        help="Should output json format",
+        help="Should output json format (same as `--output-format json`)",
+    )
+
+    parser.add_argument(
+        "--output-format",
+        dest="output_format",
+        choices=OUTPUT_FORMATS,
+        default=None,
+        help="Should specify machine readable output: `json` array or "
+        "`ndjson` with one result per line, written as schemas are evaluated",
+    )
+
+    parser.add_argument(
+        "--summary",
+        dest="summary",
+        action="store_true",
+        default=False,
+        help="If specified will print only counts of passed, failed, warning and "
+        "skipped schemas per rule and check id, aggregated over all schemas",
     )
 
     parser.add_argument(
@@ -111,7 +177,100 @@ def setup_args():  # pylint: disable=C0116
         help="If specified will run only read resource checks",
     )
 
-    return parser
+    parser.add_argument(
+        "--single-pass",
+        dest="single_pass",
+        action="store_true",
+        default=False,
+        help="If specified will evaluate all rule files over a schema in a single guard run",
+    )
+
+    parser.add_argument(
+        "--jobs",
+        dest="jobs",
+        type=positive_int,
+        default=1,
+        help="Number of worker processes to evaluate schemas in parallel",
+    )
+
+    parser.add_argument(
+        "--cache-dir",
+        dest="cache_dir",
+        type=str,
+        default=None,
+        help="Directory to cache compliance results of unchanged schemas in",
+    )
+
+    parser.add_argument(
+        "--timings",
+        dest="timings",
+        action="store_true",
+        default=False,
+        help="If specified will record time per pipeline stage and print a summary to stderr",
+    )
+
+    parser.add_argument(
+        "--memory-report",
+        dest="memory_report",
+        action="store_true",
+        default=False,
+        help="If specified will trace memory per pipeline stage and print "
+        "peak, retained memory and top allocation sites to stderr",
+    )
+
+    parser.add_argument(
+        "--profile",
+        dest="profile",
+        type=str,
+        default=None,
+        help="Should specify file to write cProfile stats of the run to; "
+        "collapsed stacks for flamegraphs are written next to it (`.collapsed`)",
+    )
+
+    return add_logging_args(parser)
+
+
+@logdebug
+def setup_serve_args():  # pylint: disable=C0116
+    parser = argparse.ArgumentParser(
+        prog="guard-rail serve",
+        description="Serves compliance assessments as newline-delimited JSON-RPC",
+    )
+
+    parser.add_argument(
+        "--stdio",
+        dest="stdio",
+        action="store_true",
+        required=True,
+        help="Should read requests from stdin and write responses to stdout",
+    )
+
+    parser.add_argument(
+        "--rules",
+        dest="rules",
+        action="extend",
+        nargs="+",
+        type=str,
+        help="Should specify additional rules applied to every request (path of `.guard` file)",
+    )
+
+    parser.add_argument(
+        "--single-pass",
+        dest="single_pass",
+        action="store_true",
+        default=False,
+        help="If specified will evaluate all rule files over a schema in a single guard run",
+    )
+
+    parser.add_argument(
+        "--cache-dir",
+        dest="cache_dir",
+        type=str,
+        default=None,
+        help="Directory to cache compliance results of unchanged schemas in",
+    )
+
+    return add_logging_args(parser)
 
 
 @logdebug
@@ -148,18 +307,37 @@ def collect_schemas(schemas: Sequence[str] = None):
     Returns:
         List: list of deserialized schemas
     """
+    return list(iter_schemas(schemas=schemas))
 
-    if not schemas:
-        return []
 
-    _schemas = []
+@logdebug
+def iter_schemas(schemas: Sequence[str] = None):
+    """Lazily collecting schemas.
+
+    Validates all schema paths upfront, then reads each schema
+    only when it is requested, so a batch of schemas is never
+    held in memory at once.
+
+    Args:
+        schemas (Sequence[str], optional): list of schemas
 
+    Returns:
+        Iterator: iterator of deserialized schemas
+    """
+    if not schemas:
+        return iter(())
+
+    paths = []
     for schema_item in schemas:
         LOG.info(schema_item)
         schema_input_path_validation(schema_item)
-        path = "/" + re.search(JSON_PATH_EXTRACT_PATTERN, schema_item).group(2)
-        _schemas.append(read_json(path))
-    return _schemas
+        paths.append("/" + re.search(JSON_PATH_EXTRACT_PATTERN, schema_item).group(2))
+    return (_read_schema(path) for path in paths)
+
+
+@timed("collect_schemas")
+def _read_schema(path: str):
+    return read_json(path)
 
 
 @logdebug
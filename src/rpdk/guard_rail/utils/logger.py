@@ -1,36 +1,102 @@
-"""Module to perform logging."""
+"""Module to perform logging.
+
+Logging is off by default: the package logger has no handlers and
+records below WARNING are dropped by level check, before any message
+is formatted. `configure_logging` enables it for the package; records
+are put on a queue and written to the file (or stderr) by a listener
+thread, so callers do not wait for I/O.
+
+Typical usage example:
+
+    from rpdk.guard_rail.utils.logger import configure_logging
+
+    configure_logging(level="DEBUG", log_file="guard-rail.log")
+"""
+import atexit
 import logging
+import sys
 from functools import wraps
 
-logging.basicConfig(
-    level=logging.DEBUG,
-    format="%(asctime)s - %(levelname)-12s %(message)s",
-    datefmt="%m-%d %H:%M",
-    filename="guard-rail.log",
-    filemode="w",
-)
+PACKAGE_LOGGER = "rpdk.guard_rail"
+LOG_FORMAT = "%(asctime)s - %(levelname)-12s %(message)s"
+LOG_DATE_FORMAT = "%m-%d %H:%M"
+LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
 
+LOG = logging.getLogger(__name__)
 
-console = logging.StreamHandler()
-console.setLevel(logging.ERROR)
-formatter = logging.Formatter("%(asctime)s: %(levelname)-8s - %(message).500s")
-console.setFormatter(formatter)
-logging.getLogger("").addHandler(console)
+# queue listener and handler, set while logging is enabled
+_LISTENER = None
+_QUEUE_HANDLER = None
 
-LOG = logging.getLogger(__name__)
+
+def stop_logging():
+    """Flushes queued records and detaches handlers set by `configure_logging`"""
+    global _LISTENER, _QUEUE_HANDLER  # pylint: disable=W0603
+    if _QUEUE_HANDLER is not None:
+        package_logger = logging.getLogger(PACKAGE_LOGGER)
+        package_logger.removeHandler(_QUEUE_HANDLER)
+        package_logger.setLevel(logging.NOTSET)
+        _QUEUE_HANDLER = None
+    if _LISTENER is not None:
+        _LISTENER.stop()
+        for handler in _LISTENER.handlers:
+            handler.close()
+        _LISTENER = None
+
+
+def configure_logging(level: str = None, log_file: str = None):
+    """Enables logging of the package through a queue.
+
+    Logging stays off if neither level nor file is provided.
+
+    Args:
+        level (str): name of the logging level, INFO by default
+        log_file (str): file to write records to, stderr by default
+    """
+    global _LISTENER, _QUEUE_HANDLER  # pylint: disable=W0603
+    stop_logging()
+    if level is None and log_file is None:
+        return
+
+    # handlers are loaded only when logging is enabled
+    from logging.handlers import QueueHandler, QueueListener
+    from queue import SimpleQueue
+
+    handler = (
+        logging.FileHandler(log_file, mode="w", delay=True)
+        if log_file
+        else logging.StreamHandler(sys.stderr)
+    )
+    handler.setFormatter(logging.Formatter(LOG_FORMAT, datefmt=LOG_DATE_FORMAT))
+
+    records = SimpleQueue()
+    _QUEUE_HANDLER = QueueHandler(records)
+    _LISTENER = QueueListener(records, handler)
+    _LISTENER.start()
+
+    package_logger = logging.getLogger(PACKAGE_LOGGER)
+    package_logger.setLevel((level or "INFO").upper())
+    package_logger.addHandler(_QUEUE_HANDLER)
+
+
+atexit.register(stop_logging)
 
 
 def logdebug(func: object):
-    """Logging annotation to each function inside the package"""
+    """Logging annotation to each function inside the package.
+
+    Entry and exit are logged at DEBUG level; if it is disabled
+    the function is called directly.
+    """
+    name = func.__name__
 
     @wraps(func)
     def wrapper(*args, **kwargs):
-        log_msg = func.__name__
-        entry_message = f"{log_msg} started"
-        LOG.info(entry_message)
+        if not LOG.isEnabledFor(logging.DEBUG):
+            return func(*args, **kwargs)
+        LOG.debug("%s started", name)
         result = func(*args, **kwargs)
-        exit_message = f"{log_msg} complete"
-        LOG.info(exit_message)
+        LOG.debug("%s complete", name)
         return result
 
     return wrapper
@@ -0,0 +1,263 @@
+"""Module to report memory allocated by pipeline stages.
+
+`record_memory` traces allocations with tracemalloc and observes the
+stages measured by `utils.timing`. Per stage it records:
+
+* peak: highest traced memory above the level at stage enter, i.e. how
+  much the stage needs on top of what is already allocated;
+* retained: memory still allocated at stage exit (e.g. refs inlined
+  by `resolve_schema` into the schema), summed over calls;
+* allocation sites of the retained memory, from tracemalloc snapshots
+  taken at enter and exit of outermost stages (snapshots held by nested
+  stages would count towards peaks of outer ones).
+
+Stages nest, so memory of a nested stage is included in the outer one.
+Snapshots make traced code several times slower, the report is meant for
+sizing memory limits rather than for timing. Only the calling process
+is traced; schemas evaluated in worker processes (`--jobs`) are not.
+Before Python 3.9 tracemalloc peak cannot be reset, so stage peaks are
+upper bounds.
+
+Typical usage example:
+
+    from rpdk.guard_rail.utils.memory import record_memory
+
+    with record_memory() as report:
+        results = exec_compliance(payload)
+    report.display()
+"""
+import os
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .timing import observe_stages
+
+TOP_SITES = 10
+
+_ACTIVE_REPORT = None
+
+
+@dataclass
+class StageMemory:
+    """Memory allocated by a single stage.
+
+    Attributes:
+        calls: number of times the stage was entered
+        peak: highest traced memory above the stage enter level in bytes
+        retained: memory allocated and not freed by the stage in bytes,
+            summed over calls
+        sites: retained bytes per allocation site (`file:line`)
+    """
+
+    calls: int = 0
+    peak: int = 0
+    retained: int = 0
+    sites: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class _Frame:
+    start: int
+    snapshot: Optional[Any] = None
+    peak: int = 0
+
+
+def _site(statistic: Any) -> str:
+    frame = statistic.traceback[0]
+    return f"{frame.filename}:{frame.lineno}"
+
+
+class MemoryReport:
+    """Stage observer recording traced memory per stage.
+
+    Attributes:
+        stages: recorded memory per stage name
+        peak: highest traced memory of the whole report in bytes
+    """
+
+    def __init__(self, top: int = TOP_SITES):
+        self.top = top
+        self.stages: Dict[str, StageMemory] = {}
+        self.peak = 0
+        self._frames: List[_Frame] = []
+
+    @staticmethod
+    def _snapshot():
+        import tracemalloc
+
+        return tracemalloc.take_snapshot().filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+            )
+        )
+
+    def _traced(self) -> Tuple[int, int]:
+        import tracemalloc
+
+        current, peak = tracemalloc.get_traced_memory()
+        self.peak = max(self.peak, peak)
+        return current, peak
+
+    def _reset_peak(self):
+        import tracemalloc
+
+        # available since Python 3.9
+        reset_peak = getattr(tracemalloc, "reset_peak", None)
+        if reset_peak is not None:
+            reset_peak()
+
+    def enter(self, name: str) -> _Frame:  # pylint: disable=W0613
+        """Starts measuring the stage"""
+        snapshot = None if self._frames else self._snapshot()
+        _, peak = self._traced()
+        if self._frames:
+            # peak is reset for the nested stage, the outer one keeps its own
+            self._frames[-1].peak = max(self._frames[-1].peak, peak)
+        self._reset_peak()
+        current, _ = self._traced()
+        frame = _Frame(start=current, snapshot=snapshot)
+        self._frames.append(frame)
+        return frame
+
+    def exit(self, name: str, token: _Frame):
+        """Finishes measuring the stage"""
+        current, peak = self._traced()
+        if self._frames and self._frames[-1] is token:
+            self._frames.pop()
+        peak = max(token.peak, peak)
+        if self._frames:
+            self._frames[-1].peak = max(self._frames[-1].peak, peak)
+
+        memory = self.stages.get(name)
+        if memory is None:
+            memory = self.stages[name] = StageMemory()
+        memory.calls += 1
+        memory.peak = max(memory.peak, peak - token.start)
+        memory.retained += current - token.start
+        if token.snapshot is None:
+            return
+        for statistic in self._snapshot().compare_to(token.snapshot, "lineno"):
+            if statistic.size_diff > 0:
+                site = _site(statistic)
+                memory.sites[site] = memory.sites.get(site, 0) + statistic.size_diff
+
+    def top_sites(self, limit: Optional[int] = None) -> List[Tuple[str, str, int]]:
+        """Returns allocation sites retaining most memory.
+
+        Args:
+            limit (Optional[int]): number of sites, `top` by default
+
+        Returns:
+            List[Tuple[str, str, int]]: stage, site and retained bytes
+        """
+        sites = [
+            (name, site, size)
+            for name, memory in self.stages.items()
+            for site, size in memory.sites.items()
+        ]
+        sites.sort(key=lambda item: item[2], reverse=True)
+        return sites[: self.top if limit is None else limit]
+
+    @property
+    def json(self) -> Dict[str, Any]:
+        """Translates report into JSON document"""
+        return {
+            "peak": self.peak,
+            "stages": {
+                name: {
+                    "calls": memory.calls,
+                    "peak": memory.peak,
+                    "retained": memory.retained,
+                }
+                for name, memory in self.stages.items()
+            },
+            "top_sites": [
+                {"stage": name, "site": site, "retained": size}
+                for name, site, size in self.top_sites()
+            ],
+        }
+
+    def display(self, stderr: bool = True):
+        """Displays tables of stages, highest peak first, and top allocation sites.
+
+        Args:
+            stderr (bool): whether to print to stderr, so results printed
+                to stdout stay machine readable
+        """
+        from rich.console import Console
+        from rich.table import Table
+
+        def __mib(size):
+            return f"{size / (1 << 20):.3f}"
+
+        stages = Table(title=f"Stage Memory (peak {__mib(self.peak)} MiB traced)")
+        stages.add_column("Stage", style="cyan", overflow="fold")
+        stages.add_column("Calls", justify="right")
+        stages.add_column("Peak (MiB)", justify="right", style="magenta")
+        stages.add_column("Retained (MiB)", justify="right", style="magenta")
+        for name, memory in sorted(
+            self.stages.items(), key=lambda item: item[1].peak, reverse=True
+        ):
+            stages.add_row(
+                name, str(memory.calls), __mib(memory.peak), __mib(memory.retained)
+            )
+
+        sites = Table(title="Top Allocation Sites (retained)")
+        sites.add_column("Site", style="cyan", overflow="fold")
+        sites.add_column("Stage", overflow="fold")
+        sites.add_column("Retained (MiB)", justify="right", style="magenta")
+        for name, site, size in self.top_sites():
+            sites.add_row(_short_site(site), name, __mib(size))
+
+        console = Console(stderr=stderr)
+        console.print(stages)
+        console.print(sites)
+
+
+def _short_site(site: str) -> str:
+    """Shortens site path relative to the package or working directory"""
+    filename, _, lineno = site.rpartition(":")
+    marker = os.sep + "rpdk" + os.sep
+    if marker in filename:
+        filename = "rpdk" + os.sep + filename.split(marker, 1)[1]
+    elif filename.startswith(os.getcwd() + os.sep):
+        filename = os.path.relpath(filename)
+    return f"{filename}:{lineno}"
+
+
+@contextmanager
+def record_memory(top: int = TOP_SITES) -> Iterator[MemoryReport]:
+    """Traces memory allocated by stages of the enclosed code.
+
+    Only one report is recorded at a time; nested calls yield the
+    active report.
+
+    Args:
+        top (int): number of allocation sites to report
+
+    Yields:
+        MemoryReport: active report
+    """
+    global _ACTIVE_REPORT  # pylint: disable=W0603
+    if _ACTIVE_REPORT is not None:
+        yield _ACTIVE_REPORT
+        return
+
+    import tracemalloc
+
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    report = _ACTIVE_REPORT = MemoryReport(top=top)
+    try:
+        with observe_stages(report):
+            yield report
+    finally:
+        _ACTIVE_REPORT = None
+        report.peak = max(report.peak, tracemalloc.get_traced_memory()[1])
+        if started:
+            tracemalloc.stop()
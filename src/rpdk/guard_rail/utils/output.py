@@ -0,0 +1,86 @@
+"""Module to write results as JSON documents.
+
+Documents are encoded and written one by one as they come, so results
+of a large batch are never held in memory as a whole and every result
+reaches the reader as soon as its schema is evaluated:
+
+* `json` writes a single JSON array;
+* `ndjson` writes one JSON document per line (newline delimited JSON),
+  which `jq`, log shippers and line based tools consume incrementally.
+
+Documents are encoded with orjson if it is installed
+(`pip install resource-schema-guard-rail[fast]`), with the standard
+library encoder otherwise; both produce compact JSON.
+
+Typical usage example:
+
+    $ guard-rail --schema file://schema.json --output-format ndjson | jq .non_compliant
+"""
+import json
+import sys
+from typing import Any, Callable, Iterable, Optional, TextIO
+
+OUTPUT_FORMATS = ("json", "ndjson")
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def json_encoder() -> Callable[[Any], str]:
+    """Returns the fastest available JSON encoder.
+
+    Returns:
+        Callable[[Any], str]: function encoding document into compact JSON
+    """
+    try:
+        import orjson
+    except ImportError:
+        return json.JSONEncoder(
+            ensure_ascii=False, separators=(",", ":"), default=_default
+        ).encode
+
+    def __encode(document: Any) -> str:
+        # pylint: disable=E1101
+        return orjson.dumps(
+            document, default=_default, option=orjson.OPT_NON_STR_KEYS
+        ).decode("utf-8")
+
+    return __encode
+
+
+def write_documents(
+    documents: Iterable[Any],
+    output_format: str = "json",
+    stream: Optional[TextIO] = None,
+    encode: Optional[Callable[[Any], str]] = None,
+):
+    """Writes documents one by one, flushing each of them.
+
+    Args:
+        documents (Iterable[Any]): JSON serializable documents
+        output_format (str): one of `OUTPUT_FORMATS`
+        stream (Optional[TextIO]): stream to write to, stdout by default
+        encode (Optional[Callable[[Any], str]]): JSON encoder,
+            `json_encoder()` by default
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"output format must be one of {', '.join(OUTPUT_FORMATS)}")
+    stream = sys.stdout if stream is None else stream
+    encode = json_encoder() if encode is None else encode
+
+    if output_format == "ndjson":
+        for document in documents:
+            stream.write(encode(document) + "\n")
+            stream.flush()
+        return
+
+    separator = "["
+    for document in documents:
+        stream.write(separator + encode(document))
+        stream.flush()
+        separator = ","
+    stream.write("]\n" if separator == "," else "[]\n")
+    stream.flush()
@@ -0,0 +1,155 @@
+"""Module to profile compliance runs.
+
+`profile` wraps the enclosed code in cProfile and writes two files:
+the pstats dump (readable with `python -m pstats`, snakeviz, etc.) and
+collapsed stacks next to it (`<name>.collapsed`), one `frame;frame;... value`
+line per stack, which flamegraph tools (flamegraph.pl, speedscope, inferno)
+ingest directly. Values are microseconds of self time.
+
+cProfile records caller/callee pairs rather than full stacks, so time of
+a function called from several places is split between its callers in
+proportion to the time spent on behalf of each of them.
+
+Profiling is enabled by the path argument or by `GUARD_RAIL_PROFILE`
+environment variable, so library users can profile `exec_compliance`
+without code changes. Only the calling process is profiled; schemas
+evaluated in worker processes (`--jobs`) are not.
+
+Typical usage example:
+
+    $ guard-rail --schema file://schema.json --profile out.prof
+    # or
+    $ GUARD_RAIL_PROFILE=out.prof python my_script.py
+"""
+import os
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, Optional, Tuple
+
+PROFILE_ENV = "GUARD_RAIL_PROFILE"
+COLLAPSED_SUFFIX = ".collapsed"
+# stacks contributing less than this share of the profiled time are dropped,
+# which bounds the number of walked call paths
+MIN_STACK_SHARE = 1e-5
+
+_PROFILING = False
+
+
+def collapsed_path(path: str) -> str:
+    """Returns path of collapsed stacks written next to the pstats file"""
+    return os.path.splitext(path)[0] + COLLAPSED_SUFFIX
+
+
+def _frame_name(function: Tuple[str, int, str]) -> str:
+    filename, lineno, name = function
+    if filename == "~":
+        label = name
+    else:
+        label = f"{name} ({os.path.basename(filename)}:{lineno})"
+    return label.replace(";", ":")
+
+
+def collapse_stacks(stats_data: Dict) -> Dict[str, int]:
+    """Builds collapsed stacks from the pstats call graph.
+
+    Args:
+        stats_data (Dict): `pstats.Stats.stats` mapping of function to
+            (primitive calls, calls, self time, cumulative time, callers)
+
+    Returns:
+        Dict[str, int]: self time in microseconds per `;` joined stack
+    """
+    callees = {function: [] for function in stats_data}
+    for function, (_, _, _, _, callers) in stats_data.items():
+        for caller, edge in callers.items():
+            if caller in callees:
+                # edge: (primitive calls, calls, self time, cumulative time)
+                callees[caller].append((function, edge[3]))
+
+    roots = [
+        function
+        for function, (_, _, _, _, callers) in stats_data.items()
+        if not any(caller in stats_data for caller in callers)
+    ]
+
+    min_time = sum(entry[2] for entry in stats_data.values()) * MIN_STACK_SHARE
+    stacks: Dict[str, int] = {}
+    # explicit stack of (function, path of frames, share of function time)
+    pending = [(root, (), 1.0) for root in roots]
+    while pending:
+        function, frames, share = pending.pop()
+        frames = frames + (_frame_name(function),)
+        self_time = stats_data[function][2]
+
+        value = int(self_time * share * 1_000_000)
+        if value > 0:
+            key = ";".join(frames)
+            stacks[key] = stacks.get(key, 0) + value
+
+        for callee, edge_time in callees[function]:
+            callee_time = stats_data[callee][3]
+            if _frame_name(callee) in frames or callee_time <= 0:
+                continue
+            callee_share = share * edge_time / callee_time
+            if callee_time * callee_share < min_time:
+                continue
+            pending.append((callee, frames, callee_share))
+    return stacks
+
+
+def write_profile(profiler, path: str):
+    """Writes pstats dump and collapsed stacks of the profiler.
+
+    Args:
+        profiler (cProfile.Profile): finished profiler
+        path (str): path of the pstats file
+    """
+    import pstats
+
+    profiler.dump_stats(path)
+    stacks = collapse_stacks(pstats.Stats(profiler).stats)
+    with open(collapsed_path(path), "w", encoding="utf-8") as file:
+        for stack, value in sorted(stacks.items()):
+            file.write(f"{stack} {value}\n")
+
+
+@contextmanager
+def profile(path: Optional[str] = None):
+    """Profiles the enclosed code if path or `GUARD_RAIL_PROFILE` is set.
+
+    Nested profiling is not supported by cProfile, so only the outermost
+    profiled code writes the profile.
+
+    Args:
+        path (Optional[str]): path of the pstats file
+    """
+    global _PROFILING  # pylint: disable=W0603
+    path = path or os.environ.get(PROFILE_ENV)
+    if not path or _PROFILING:
+        yield
+        return
+
+    import cProfile
+
+    profiler = cProfile.Profile()
+    _PROFILING = True
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        _PROFILING = False
+        write_profile(profiler, path)
+
+
+def profiled(func: object):
+    """Annotation profiling each call if `GUARD_RAIL_PROFILE` is set"""
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if _PROFILING or not os.environ.get(PROFILE_ENV):
+            return func(*args, **kwargs)
+        with profile():
+            return func(*args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,188 @@
+"""Module to render compliance results as text tables.
+
+Renderers write one row per rule (passed, skipped) or failed check
+(warning, failed):
+
+* `rich` builds a styled `rich` table, pretty but slow to lay out for
+  results of hundreds of checks;
+* `plain` writes a columnar table of plain text, columns padded to
+  the widest value; values of short columns (rule name, check id,
+  status) longer than `MAX_COLUMN_WIDTH` are truncated with an
+  ellipsis, path and message close the line and are written in full;
+* `stream` writes tab separated rows as they are produced, without
+  laying out columns, for pipes and results of any size; tabs, newlines
+  and backslashes within values are escaped (`\\t`, `\\n`, `\\\\`), so
+  every row is a single line.
+
+Every renderer can cap the number of rows per result (`max_rows`),
+omitted rows are counted in a closing line.
+
+Typical usage example:
+
+    from rpdk.guard_rail.utils.render import render
+
+    render(result, renderer="plain", max_rows=100)
+"""
+import sys
+from typing import Any, Iterator, Optional, TextIO, Tuple
+
+RENDERERS = ("rich", "plain", "stream")
+COLUMNS = ("Rule Name", "Check Id", "Message", "Path", "Status")
+# plain table puts path and message, which are never truncated, last
+PLAIN_COLUMNS = ("Rule Name", "Check Id", "Status", "Path", "Message")
+_PLAIN_ORDER = tuple(COLUMNS.index(column) for column in PLAIN_COLUMNS)
+TITLE = "Schema Compliance Report"
+MAX_COLUMN_WIDTH = 60
+ELLIPSIS = "…"
+_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+Row = Tuple[str, str, str, str, str]
+
+
+def rows(result: Any) -> Iterator[Row]:
+    """Yields rows of the result: skipped, passed, warning and failed rules.
+
+    Args:
+        result (GuardRuleSetResult): result to render
+
+    Yields:
+        Row: rule name, check id, message, path and status
+    """
+    for rule in result.skipped:
+        yield rule, "-", "-", "-", "skipped"
+    for rule in result.compliant:
+        yield rule, "-", "-", "-", "passed"
+    for rule, checks in result.warning.items():
+        for check in checks:
+            yield rule, str(check.check_id), str(check.message), "-", "warning"
+    for rule, checks in result.non_compliant.items():
+        for check in checks:
+            yield rule, str(check.check_id), str(check.message), str(
+                check.path or "-"
+            ), "failed"
+
+
+def _capped(result_rows: Iterator[Row], max_rows: Optional[int]):
+    """Splits rows into the first `max_rows` and number of the omitted ones"""
+    if max_rows is None:
+        return list(result_rows), 0
+    shown = [row for _, row in zip(range(max_rows), result_rows)]
+    return shown, sum(1 for _ in result_rows)
+
+
+def _omitted_line(omitted: int) -> str:
+    return f"... {omitted} more rows not shown (--max-rows)"
+
+
+def _truncate(value: str, width: int) -> str:
+    """Truncates value to the width, marking truncation with an ellipsis"""
+    if len(value) <= width:
+        return value
+    return value[: width - 1] + ELLIPSIS
+
+
+def _escape(value: str) -> str:
+    """Escapes characters which would split a tab separated row"""
+    return value.translate(_ESCAPES)
+
+
+def render_rich(result: Any, max_rows: Optional[int] = None, stream=None):
+    """Renders result as a styled `rich` table"""
+    # rich is loaded only when results are displayed
+    from rich.console import Console
+    from rich.table import Table
+
+    styles = {
+        "skipped": "[white]skipped",
+        "passed": "[green]passed",
+        "warning": "[yellow]warning",
+        "failed": "[red]failed",
+    }
+    shown, omitted = _capped(rows(result), max_rows)
+
+    table = Table(title=TITLE, caption=_omitted_line(omitted) if omitted else None)
+    table.add_column(COLUMNS[0], justify="right", style="cyan", no_wrap=True)
+    table.add_column(COLUMNS[1], style="magenta")
+    table.add_column(COLUMNS[2], style="magenta")
+    table.add_column(COLUMNS[3], style="magenta")
+    table.add_column(COLUMNS[4], justify="right", style="green")
+
+    for rule, check_id, message, path, status in shown:
+        if status in ("warning", "failed"):
+            check_id, message = f"[b]{check_id}[/b]", f"[b]{message}[/b]"
+        if status == "failed" and path != "-":
+            path = f"[b][red]{path}[/b]"
+        table.add_row(rule, check_id, message, path, styles[status])
+
+    Console(file=stream).print(table)
+
+
+def render_plain(result: Any, max_rows: Optional[int] = None, stream=None):
+    """Renders result as a columnar table of plain text"""
+    stream = sys.stdout if stream is None else stream
+    shown, omitted = _capped(rows(result), max_rows)
+
+    # short columns are truncated, path and message are written in full
+    shown = [
+        tuple(
+            _truncate(row[index], MAX_COLUMN_WIDTH) if position < 3 else row[index]
+            for position, index in enumerate(_PLAIN_ORDER)
+        )
+        for row in shown
+    ]
+    # the last column, message, is not padded
+    widths = [len(column) for column in PLAIN_COLUMNS[:-1]]
+    for row in shown:
+        for index, width in enumerate(widths):
+            if width < len(row[index]):
+                widths[index] = len(row[index])
+
+    def __line(row):
+        cells = [value.ljust(width) for value, width in zip(row, widths)]
+        cells.append(row[-1])
+        return "  ".join(cells).rstrip()
+
+    lines = [
+        TITLE,
+        __line(PLAIN_COLUMNS),
+        __line(["-" * width for width in widths] + ["-" * len(PLAIN_COLUMNS[-1])]),
+    ]
+    lines.extend(__line(row) for row in shown)
+    if omitted:
+        lines.append(_omitted_line(omitted))
+    stream.write("\n".join(lines) + "\n")
+
+
+def render_stream(result: Any, max_rows: Optional[int] = None, stream=None):
+    """Renders result as tab separated rows, written as they are produced"""
+    stream = sys.stdout if stream is None else stream
+    stream.write("\t".join(COLUMNS) + "\n")
+    result_rows = rows(result)
+    for count, row in enumerate(result_rows):
+        if max_rows is not None and count >= max_rows:
+            omitted = 1 + sum(1 for _ in result_rows)
+            stream.write(_omitted_line(omitted) + "\n")
+            break
+        stream.write("\t".join(_escape(value) for value in row) + "\n")
+
+
+_RENDERERS = {"rich": render_rich, "plain": render_plain, "stream": render_stream}
+
+
+def render(
+    result: Any,
+    renderer: str = "rich",
+    max_rows: Optional[int] = None,
+    stream: Optional[TextIO] = None,
+):
+    """Renders result with the renderer.
+
+    Args:
+        result (GuardRuleSetResult): result to render
+        renderer (str): one of `RENDERERS`
+        max_rows (Optional[int]): maximum number of rows, all by default
+        stream (Optional[TextIO]): stream to write to, stdout by default
+    """
+    if renderer not in _RENDERERS:
+        raise ValueError(f"renderer must be one of {', '.join(RENDERERS)}")
+    _RENDERERS[renderer](result, max_rows=max_rows, stream=stream)
@@ -1,8 +1,8 @@
 """Module to handle schema manipulations."""
-from copy import deepcopy
-from typing import Any, Dict, List, Sequence, Set, Tuple
+from typing import Any, Dict, List, Optional
+from urllib.parse import unquote
 
-from jsonschema import RefResolver
+from rpdk.guard_rail.utils.timing import timed
 
 _PROPERTIES = "properties"
 _DEFINITIONS = "definitions"
@@ -12,68 +12,176 @@ _PATTERN_PROPERTIES = "patternProperties"
 _ANY_OF = "anyOf"
 _ONE_OF = "oneOf"
 _ALL_OF = "allOf"
+# keys holding sub schemas, in order of expansion
+_SCHEMA_KEYS = (
+    _PROPERTIES,
+    _REF,
+    _PATTERN_PROPERTIES,
+    _ITEMS,
+    _ALL_OF,
+    _ANY_OF,
+    _ONE_OF,
+)
+_NESTED_KEYS = frozenset(
+    (_PROPERTIES, _REF, _ITEMS, _PATTERN_PROPERTIES, _ANY_OF, _ONE_OF, _ALL_OF)
+)
+
+
+def _resolve_local_ref(schema: Dict, reference_path: str) -> Optional[Any]:
+    """Resolves ref pointing into the schema itself, e.g. `#/definitions/Tag`.
 
-
+    Returns:
+        Optional[Any]: referenced definition, None if ref is not local
+            or cannot be resolved
+    """
+    if not reference_path.startswith("#"):
+        return None
+    node = schema
+    pointer = unquote(reference_path[1:])
+    if not pointer:
+        return node
+    if not pointer.startswith("/"):
+        return None
+    for token in pointer[1:].split("/"):
+        token = token.replace("~1", "/").replace("~0", "~")
+        try:
+            node = node[int(token)] if isinstance(node, list) else node[token]
+        except (KeyError, IndexError, TypeError, ValueError):
+            return None
+    return node
+
+
+@timed("resolve_schema")
 def resolve_schema(schema: Dict):
     """Resolving schema into a nested object.
     Json schema allows recursive and chained
     $refs, which is hard to analyze and get diff
     between two schemas. This method resolves refs;
+
+    Definitions are expanded in place and shared by all
+    refs pointing to them, so every distinct ref is resolved
+    once and a subtree expanded without hitting a recursive
+    ref is reused as is instead of being walked again.
+    Schema is walked with an explicit stack, so its depth
+    is not limited by the recursion limit.
     Args:
         schema (Dict): _description_
     Returns:
         _type_: _description_
     """
-    resolver = RefResolver.from_schema(schema)
-
-    def _internal_resolver(schema: Dict, resolver: Any, resolved_refs: Set):
-        if _PROPERTIES in schema:
-            for key, val in schema[_PROPERTIES].items():
-                schema[_PROPERTIES][key] = _internal_resolver(
-                    val, resolver, resolved_refs
-                )
-        if _REF in schema:
-            reference_path = schema.pop(_REF, None)
-            if reference_path in resolved_refs:
-                return schema
-            resolved = resolver.resolve(reference_path)[1]
-            schema.update(resolved)
-            return _internal_resolver(
-                schema, resolver, resolved_refs | {reference_path}
-            )
-        if _PATTERN_PROPERTIES in schema:
-            for key, val in schema[_PATTERN_PROPERTIES].items():
-                schema[_PATTERN_PROPERTIES][key] = _internal_resolver(
-                    val, resolver, resolved_refs
-                )
-        if _ITEMS in schema:
-            schema[_ITEMS] = _internal_resolver(schema[_ITEMS], resolver, resolved_refs)
-        if _ALL_OF in schema:
-            for index, element in enumerate(schema[_ALL_OF]):
-                schema[_ALL_OF][index] = _internal_resolver(
-                    element, resolver, resolved_refs
-                )
-        if _ANY_OF in schema:
-            for index, element in enumerate(schema[_ANY_OF]):
-                schema[_ANY_OF][index] = _internal_resolver(
-                    element, resolver, resolved_refs
-                )
-        if _ONE_OF in schema:
-            for index, element in enumerate(schema[_ONE_OF]):
-                schema[_ONE_OF][index] = _internal_resolver(
-                    element, resolver, resolved_refs
-                )
-        return schema
+    resolver = None
+    resolved_definitions = {}
+    expanded_nodes = {}
+    expanded_get = expanded_nodes.get
+    cutoffs = 0
+
+    def _resolve(reference_path: str):
+        nonlocal resolver
+        if reference_path in resolved_definitions:
+            return resolved_definitions[reference_path]
+        definition = _resolve_local_ref(schema, reference_path)
+        if definition is None:
+            # jsonschema is loaded only for refs outside of the schema
+            from jsonschema import RefResolver
+
+            if resolver is None:
+                resolver = RefResolver.from_schema(schema)
+            definition = resolver.resolve(reference_path)[1]
+        resolved_definitions[reference_path] = definition
+        return definition
+
+    def _is_expanded(node: Any):
+        return expanded_get(id(node)) is node
+
+    def _mark_expanded(node: Any, cutoffs_before: int):
+        # subtree which hit recursive ref might expand differently
+        # when reached from another ref, so it is walked again
+        if cutoffs == cutoffs_before:
+            expanded_nodes[id(node)] = node
+
+    def _needs_resolver(node: Any):
+        if _is_expanded(node):
+            return False
+        if isinstance(node, dict) and _NESTED_KEYS.isdisjoint(node):
+            # leafs, the bulk of properties, are expanded as they are
+            expanded_nodes[id(node)] = node
+            return False
+        return True
+
+    def _expand(root: Dict):
+        # schema is expanded in place with an explicit stack of frames instead
+        # of recursion, so its depth is not limited by the recursion limit;
+        # frame is [node, resolved refs, cutoffs at enter, next], where next is
+        # index of the next key of a schema, in `_SCHEMA_KEYS` order, or
+        # iterator of sub schemas of a container (properties, combiner)
+        nonlocal cutoffs
+        stack = [] if _is_expanded(root) else [[root, set(), cutoffs, 0]]
+        while stack:
+            frame = stack[-1]
+            node, resolved_refs = frame[0], frame[1]
+
+            if not isinstance(frame[3], int):
+                for sub_schema in frame[3]:
+                    # inlined `_needs_resolver`, containers are mostly leafs
+                    if expanded_get(id(sub_schema)) is sub_schema:
+                        continue
+                    if isinstance(sub_schema, dict) and _NESTED_KEYS.isdisjoint(
+                        sub_schema
+                    ):
+                        expanded_nodes[id(sub_schema)] = sub_schema
+                        continue
+                    stack.append([sub_schema, resolved_refs, cutoffs, 0])
+                    break
+                else:
+                    stack.pop()
+                    _mark_expanded(node, frame[2])
+                continue
+
+            for index in range(frame[3], len(_SCHEMA_KEYS)):
+                key = _SCHEMA_KEYS[index]
+                if key not in node:
+                    continue
+                if key == _REF:
+                    # schema is expanded again with the referenced definition
+                    stack.pop()
+                    reference_path = node.pop(_REF, None)
+                    if reference_path in resolved_refs:
+                        cutoffs += 1
+                    else:
+                        node.update(_resolve(reference_path))
+                        if not _is_expanded(node):
+                            stack.append(
+                                [node, resolved_refs | {reference_path}, cutoffs, 0]
+                            )
+                    break
+                nested = node[key]
+                if key == _ITEMS:
+                    if _needs_resolver(nested):
+                        frame[3] = index + 1
+                        stack.append([nested, resolved_refs, cutoffs, 0])
+                        break
+                elif not _is_expanded(nested):
+                    frame[3] = index + 1
+                    values = nested.values() if isinstance(nested, dict) else nested
+                    stack.append([nested, resolved_refs, cutoffs, iter(values)])
+                    break
+            else:
+                stack.pop()
+                _mark_expanded(node, frame[2])
 
-    resolved_schema = _internal_resolver(schema, resolver, set())
-    resolved_schema.pop(_DEFINITIONS, None)
-    return resolved_schema
+    _expand(schema)
+    schema.pop(_DEFINITIONS, None)
+    return schema
 
 
+@timed("fetch_all_paths")
 def _fetch_all_paths(schema: Dict):
     """Traversing resolved schema and fetching
     all properties paths.
 
+    Schema is walked with an explicit stack and is not modified,
+    so deeply nested schemas neither get copied nor hit recursion limit.
+
     Example:
     {"properties": {"foo": {"properties": {"bar": {...}}}}}
     translated into -> ["/properties/foo", "/properties/foo/bar"]
@@ -82,55 +190,40 @@ def _fetch_all_paths(schema: Dict):
     Returns:
         Sequence: list of traversed paths
     """
-
-    def __traverse(
-        prop_name: str, prop_definition: Dict, cur_path: Tuple[str], all_paths: Sequence
-    ):
-        # need to add parents/leafs
-        all_paths.add(cur_path if cur_path[-1] != "*" else cur_path[:-1])
-        definition_replica = deepcopy(prop_definition)
-
-        if _ITEMS in definition_replica:
-            __traverse(
-                prop_name, definition_replica[_ITEMS], cur_path + ("*",), all_paths
-            )
-        else:
-            # if combiners are specified then we need to squash variants
-            # and iterate over each sub schema
-
-            if _PROPERTIES in definition_replica:
-                nested_properties = definition_replica[_PROPERTIES]
-                while nested_properties:
-                    _prop_name, _prop_definition = nested_properties.popitem()
-                    __traverse(
-                        _prop_name,
-                        _prop_definition,
-                        cur_path + (_prop_name,),
-                        all_paths,
-                    )
-
-            if _ALL_OF in definition_replica:
-                for sub_schema in definition_replica[_ALL_OF]:
-                    __traverse(prop_name, sub_schema, cur_path, all_paths)
-            elif _ANY_OF in definition_replica:
-                for sub_schema in definition_replica[_ANY_OF]:
-                    __traverse(prop_name, sub_schema, cur_path, all_paths)
-            elif _ONE_OF in definition_replica:
-                for sub_schema in definition_replica[_ONE_OF]:
-                    __traverse(prop_name, sub_schema, cur_path, all_paths)
-            else:
-                pass
-
     resolved_schema = resolve_schema(schema)
-    properties_replica = deepcopy(resolved_schema.get(_PROPERTIES, {}))
     traversed_paths = set()
-    path = tuple()
+    stack = [
+        ((property_name,), property_definition)
+        for property_name, property_definition in resolved_schema.get(
+            _PROPERTIES, {}
+        ).items()
+    ]
+
+    while stack:
+        cur_path, prop_definition = stack.pop()
+        # need to add parents/leafs
+        traversed_paths.add(cur_path if cur_path[-1] != "*" else cur_path[:-1])
+
+        if _ITEMS in prop_definition:
+            stack.append((cur_path + ("*",), prop_definition[_ITEMS]))
+            continue
+
+        if _PROPERTIES in prop_definition:
+            stack.extend(
+                (cur_path + (nested_name,), nested_definition)
+                for nested_name, nested_definition in prop_definition[
+                    _PROPERTIES
+                ].items()
+            )
 
-    while properties_replica:
-        property_name, property_definition = properties_replica.popitem()
-        __traverse(
-            property_name, property_definition, path + (property_name,), traversed_paths
-        )
+        # if combiners are specified then we need to squash variants
+        # and iterate over each sub schema
+        for combiner in (_ALL_OF, _ANY_OF, _ONE_OF):
+            if combiner in prop_definition:
+                stack.extend(
+                    (cur_path, sub_schema) for sub_schema in prop_definition[combiner]
+                )
+                break
     return ["/properties/" + "/".join(i) for i in traversed_paths]
 
 
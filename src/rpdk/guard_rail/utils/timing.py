@@ -0,0 +1,220 @@
+"""Module to measure pipeline stages.
+
+Stages of the compliance run (reading schemas, resolving refs, fetching
+property paths, diffing schemas, running guard per rule file, rendering
+guard output, displaying results) are wrapped with `stage`. Wall and CPU
+time of a stage is recorded into every active `Timings` recorder; if no
+recorder is active, `stage` does not measure anything.
+
+Recorders nest: the runner activates a recorder per evaluated schema,
+which is attached to its result, while stages still add up in recorders
+activated by the caller. Stages nest as well (e.g. `schema_diff` includes
+`resolve_schema`), so their times are not additive.
+CPU time is measured for the whole process.
+
+Other measurements hook into the same stages through observers
+(`observe_stages`), e.g. the memory report of `utils.memory`.
+
+Typical usage example:
+
+    from rpdk.guard_rail.utils.timing import record_timings
+
+    with record_timings() as timings:
+        results = exec_compliance(payload)
+    timings.display()
+    results[0].timings  # stages of the first schema
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import wraps
+from typing import Any, Dict, Iterator, Mapping, Optional, Protocol
+
+# active recorders, innermost last
+_ACTIVE = ContextVar("timings", default=())
+# active stage observers, innermost last
+_OBSERVERS = ContextVar("stage_observers", default=())
+
+
+@dataclass
+class StageTiming:
+    """Accumulated time of a single stage.
+
+    Attributes:
+        wall: wall clock time in seconds
+        cpu: process CPU time in seconds
+        calls: number of times the stage was entered
+    """
+
+    wall: float = 0.0
+    cpu: float = 0.0
+    calls: int = 0
+
+
+class Timings:
+    """Recorder of stage timings.
+
+    Attributes:
+        stages: accumulated timings per stage name
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, StageTiming] = {}
+
+    def add(self, name: str, wall: float, cpu: float, calls: int = 1):
+        """Adds measurement of the stage"""
+        timing = self.stages.get(name)
+        if timing is None:
+            timing = self.stages[name] = StageTiming()
+        timing.wall += wall
+        timing.cpu += cpu
+        timing.calls += calls
+
+    def update(self, stages: Mapping[str, Mapping[str, Any]]):
+        """Adds measurements in the form of `Timings.json`"""
+        for name, timing in stages.items():
+            self.add(name, timing["wall"], timing["cpu"], timing["calls"])
+
+    @property
+    def json(self) -> Dict[str, Dict[str, Any]]:
+        """Translates timings into JSON document"""
+        return {
+            name: {"wall": timing.wall, "cpu": timing.cpu, "calls": timing.calls}
+            for name, timing in self.stages.items()
+        }
+
+    def display(self, stderr: bool = True):
+        """Displays a table of stages, slowest first.
+
+        Args:
+            stderr (bool): whether to print to stderr, so results printed
+                to stdout stay machine readable
+        """
+        from rich.console import Console
+        from rich.table import Table
+
+        table = Table(title="Stage Timings")
+        table.add_column("Stage", style="cyan", overflow="fold")
+        table.add_column("Calls", justify="right")
+        table.add_column("Wall (s)", justify="right", style="magenta")
+        table.add_column("CPU (s)", justify="right", style="magenta")
+        table.add_column("Wall / Call (ms)", justify="right")
+
+        for name, timing in sorted(
+            self.stages.items(), key=lambda item: item[1].wall, reverse=True
+        ):
+            table.add_row(
+                name,
+                str(timing.calls),
+                f"{timing.wall:.4f}",
+                f"{timing.cpu:.4f}",
+                f"{timing.wall / timing.calls * 1000:.3f}",
+            )
+
+        Console(stderr=stderr).print(table)
+
+
+class StageObserver(Protocol):
+    """Receives enter and exit of every stage"""
+
+    def enter(self, name: str) -> Any:
+        """Called on stage enter, returns token passed to `exit`"""
+
+    def exit(self, name: str, token: Any):
+        """Called on stage exit"""
+
+
+def timings_enabled() -> bool:
+    """Returns whether any recorder is active"""
+    return bool(_ACTIVE.get())
+
+
+def stages_enabled() -> bool:
+    """Returns whether any recorder or observer is active"""
+    return bool(_ACTIVE.get() or _OBSERVERS.get())
+
+
+@contextmanager
+def observe_stages(observer: StageObserver) -> Iterator[StageObserver]:
+    """Activates stage observer for the enclosed code.
+
+    Observers are not measured by stage timings: they enter before
+    and exit after the measured part of the stage.
+
+    Args:
+        observer (StageObserver): observer to activate
+
+    Yields:
+        StageObserver: active observer
+    """
+    token = _OBSERVERS.set(_OBSERVERS.get() + (observer,))
+    try:
+        yield observer
+    finally:
+        _OBSERVERS.reset(token)
+
+
+@contextmanager
+def record_timings(timings: Optional[Timings] = None) -> Iterator[Timings]:
+    """Activates recorder of stage timings for the enclosed code.
+
+    Args:
+        timings (Optional[Timings]): recorder to activate, new one by default
+
+    Yields:
+        Timings: active recorder
+    """
+    timings = timings if timings is not None else Timings()
+    token = _ACTIVE.set(_ACTIVE.get() + (timings,))
+    try:
+        yield timings
+    finally:
+        _ACTIVE.reset(token)
+
+
+def add_timings(stages: Mapping[str, Mapping[str, Any]]):
+    """Adds measurements taken elsewhere (e.g. worker process) to active recorders"""
+    for timings in _ACTIVE.get():
+        timings.update(stages)
+
+
+@contextmanager
+def stage(name: str):
+    """Measures enclosed code as the stage if any recorder or observer is active.
+
+    Args:
+        name (str): name of the stage
+    """
+    recorders = _ACTIVE.get()
+    observers = _OBSERVERS.get()
+    if not recorders and not observers:
+        yield
+        return
+    tokens = [observer.enter(name) for observer in observers]
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    try:
+        yield
+    finally:
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+        for timings in recorders:
+            timings.add(name, wall, cpu)
+        for observer, token in zip(reversed(observers), reversed(tokens)):
+            observer.exit(name, token)
+
+
+def timed(name: str):
+    """Annotation measuring each call of the function as the stage"""
+
+    def decorator(func: object):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _ACTIVE.get() and not _OBSERVERS.get():
+                return func(*args, **kwargs)
+            with stage(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
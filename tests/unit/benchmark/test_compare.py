@@ -0,0 +1,132 @@
+"""unittest module to test benchmark comparison"""
+import json
+
+import pytest
+
+from rpdk.guard_rail.benchmark.cli import main
+from rpdk.guard_rail.benchmark.compare import (
+    FAILED,
+    IMPROVED,
+    MISSING,
+    NEW,
+    REGRESSED,
+    UNCHANGED,
+    Spread,
+    compare,
+    load_results,
+)
+
+
+def _write_results(path, entries):
+    path.write_text(json.dumps({"version": 1, "benchmarks": entries}), "utf-8")
+    return str(path)
+
+
+def _entry(name, data=None, stats=None, error=None):
+    entry = {"name": name, "fullname": f"module::{name}"}
+    if data is not None:
+        entry["data"] = data
+    if stats is not None:
+        entry["stats"] = stats
+    if error is not None:
+        entry["error"] = error
+    return entry
+
+
+def test_load_results(tmp_path):
+    """test spreads are computed from raw data, stats or missing for errors"""
+    path = _write_results(
+        tmp_path / "results.json",
+        [
+            _entry("raw", data=[1.0, 2.0, 3.0, 4.0, 5.0]),
+            _entry("stats", stats={"median": 2.0, "q1": 1.5, "q3": 2.5}),
+            _entry("median_only", stats={"median": 2.0}),
+            _entry("error", error="ValueError: boom"),
+        ],
+    )
+    assert load_results(path) == {
+        "module::raw": Spread(3.0, 2.0, 4.0),
+        "module::stats": Spread(2.0, 1.5, 2.5),
+        "module::median_only": Spread(2.0, 2.0, 2.0),
+        "module::error": None,
+    }
+
+
+@pytest.mark.parametrize(
+    "current,expected_status",
+    [
+        # slower beyond threshold with separated quartiles
+        (Spread(1.5, 1.4, 1.6), REGRESSED),
+        # slower beyond threshold, quartiles overlap - noise
+        (Spread(1.5, 1.0, 2.0), UNCHANGED),
+        # slower within threshold
+        (Spread(1.05, 1.02, 1.08), UNCHANGED),
+        (Spread(0.5, 0.4, 0.6), IMPROVED),
+        (Spread(0.5, 0.4, 1.0), UNCHANGED),
+    ],
+)
+def test_compare_status(current, expected_status):
+    """test regressions and improvements account for threshold and noise"""
+    baseline = {"bench": Spread(1.0, 0.99, 1.01)}
+    (comparison,) = compare(  # pylint: disable=W0632
+        baseline, {"bench": current}, threshold=10
+    )
+    assert comparison.status == expected_status
+    assert comparison.delta == pytest.approx((current.median - 1.0) * 100)
+
+
+def test_compare_missing_new_failed():
+    """test benchmarks present in one of results or failed"""
+    spread = Spread(1.0, 1.0, 1.0)
+    comparisons = compare(
+        {"a": spread, "b": spread, "c": None}, {"b": spread, "c": spread, "d": spread}
+    )
+    assert [(item.name, item.status) for item in comparisons] == [
+        ("a", MISSING),
+        ("b", UNCHANGED),
+        ("c", FAILED),
+        ("d", NEW),
+    ]
+    assert comparisons[0].delta is None
+    assert comparisons[0].json == {
+        "name": "a",
+        "status": MISSING,
+        "delta": None,
+        "baseline": {"median": 1.0, "q1": 1.0, "q3": 1.0},
+        "current": None,
+    }
+
+
+def test_cli_compare_exit_code(tmp_path, capsys):
+    """test compare command exits with 1 on regression only"""
+    baseline = _write_results(
+        tmp_path / "baseline.json",
+        [
+            _entry("fast", data=[1.0, 1.0, 1.1, 1.0]),
+            _entry("slow", data=[1.0, 1.0, 1.1, 1.0]),
+        ],
+    )
+    current = _write_results(
+        tmp_path / "current.json",
+        [
+            _entry("fast", data=[1.0, 1.05, 1.0, 1.0]),
+            _entry("slow", data=[2.0, 2.1, 2.0, 2.0]),
+        ],
+    )
+    assert main(["compare", baseline, current]) == 1
+    assert "regressed" in capsys.readouterr().out
+    assert main(["compare", baseline, current, "--threshold", "150"]) == 0
+    capsys.readouterr()
+    assert main(["compare", baseline, current, "-k", "fast", "--json"]) == 0
+    comparisons = json.loads(capsys.readouterr().out)
+    assert [comparison["name"] for comparison in comparisons] == ["module::fast"]
+
+
+def test_cli_compare_fail_on_missing(tmp_path):
+    """test missing benchmarks fail only if requested"""
+    baseline = _write_results(
+        tmp_path / "baseline.json", [_entry("gone", data=[1.0, 1.0])]
+    )
+    current = _write_results(tmp_path / "current.json", [])
+    assert main(["compare", baseline, current]) == 0
+    assert main(["compare", baseline, current, "--fail-on-missing"]) == 1
@@ -0,0 +1,138 @@
+"""unittest module to test synthetic schema generator"""
+import json
+
+import pytest
+
+from rpdk.guard_rail.benchmark.cli import main
+from rpdk.guard_rail.benchmark.generator import (
+    TAGGING_VARIANTS,
+    SchemaShape,
+    generate_schema,
+    next_version,
+)
+from rpdk.guard_rail.core.stateful import schema_diff
+from rpdk.guard_rail.utils.schema_utils import _fetch_all_paths, resolve_schema
+
+
+def test_generate_schema_deterministic():
+    """test same shape and seed produce the same schema"""
+    shape = SchemaShape(properties=50, depth=3, definitions=5, recursive=True)
+    assert generate_schema(shape) == generate_schema(shape)
+    assert generate_schema(shape) != generate_schema(
+        SchemaShape(properties=50, depth=3, definitions=5, recursive=True, seed=1)
+    )
+
+
+def test_generate_schema_shape():
+    """test generated schema has requested properties, definitions and permissions"""
+    schema = generate_schema(
+        SchemaShape(properties=20, definitions=4, fan_out=3, permissions=7)
+    )
+    assert schema["typeName"] == "Benchmark::Generated::Resource0"
+    assert {f"Property{index}" for index in range(20)} <= set(schema["properties"])
+    assert {f"Definition{index}" for index in range(4)} <= set(schema["definitions"])
+    assert all(
+        len(schema["definitions"][f"Definition{index}"]["properties"]) == 3
+        for index in range(4)
+    )
+    assert len(schema["handlers"]["read"]["permissions"]) == 7
+    assert schema["primaryIdentifier"] == ["/properties/Id"]
+    assert set(schema["createOnlyProperties"]).isdisjoint(schema["readOnlyProperties"])
+
+
+def test_generate_schema_depth():
+    """test nested properties reach requested depth"""
+    schema = generate_schema(SchemaShape(properties=50, depth=5))
+    paths = _fetch_all_paths(schema)
+    # five nested objects, the innermost one has a scalar `Nested` leaf
+    assert max(path.count("/Nested") for path in paths) == 5
+
+
+def test_generate_schema_recursive():
+    """test recursive definitions refer to themselves and resolve"""
+    schema = generate_schema(
+        SchemaShape(properties=10, definitions=3, recursive=True, seed=2)
+    )
+    definition = schema["definitions"]["Definition1"]
+    assert definition["properties"]["Children"]["items"] == {
+        "$ref": "#/definitions/Definition1"
+    }
+    resolved = resolve_schema(json.loads(json.dumps(schema)))
+    assert "properties" in resolved
+
+
+@pytest.mark.parametrize(
+    "tagging,expected_keys,has_tags",
+    [
+        ("full", {"tagging"}, True),
+        ("legacy", {"taggable"}, True),
+        ("not_taggable", {"tagging"}, False),
+        ("none", set(), False),
+    ],
+)
+def test_generate_schema_tagging(tagging, expected_keys, has_tags):
+    """test tagging variants"""
+    schema = generate_schema(SchemaShape(tagging=tagging))
+    assert {"tagging", "taggable"} & set(schema) == expected_keys
+    assert ("Tags" in schema["properties"]) == has_tags
+    assert (
+        "bench0:TagResource" in schema["handlers"]["create"]["permissions"]
+    ) == has_tags
+
+
+def test_schema_shape_validation():
+    """test invalid shapes are rejected"""
+    with pytest.raises(ValueError):
+        SchemaShape(tagging="sometimes")
+    with pytest.raises(ValueError):
+        SchemaShape(properties=-1)
+    assert len(TAGGING_VARIANTS) == 4
+
+
+def test_next_version():
+    """test next version is deterministic, differs and keeps previous schema"""
+    schema = generate_schema(SchemaShape(properties=30, definitions=3))
+    previous = json.loads(json.dumps(schema))
+    current = next_version(schema, changes=15, seed=4)
+    assert schema == previous
+    assert current == next_version(schema, changes=15, seed=4)
+    assert schema_diff(schema, current, print_diff_to_console=False)
+    assert next_version(schema, changes=0) == schema
+
+
+def test_cli_generate(tmp_path):
+    """test generate command writes schema and its next version"""
+    output = tmp_path / "schema.json"
+    next_output = tmp_path / "next.json"
+    main(
+        [
+            "generate",
+            "--properties",
+            "15",
+            "--definitions",
+            "2",
+            "--tagging",
+            "legacy",
+            "--seed",
+            "3",
+            "--output",
+            str(output),
+            "--next-output",
+            str(next_output),
+        ]
+    )
+    schema = json.loads(output.read_text(encoding="utf-8"))
+    assert schema == generate_schema(
+        SchemaShape(properties=15, definitions=2, tagging="legacy", seed=3)
+    )
+    assert json.loads(next_output.read_text(encoding="utf-8")) == next_version(
+        schema, 10, 3
+    )
+
+
+def test_cli_generate_stdout(capsys):
+    """test generate command prints schema without output file"""
+    main(["generate", "--properties", "2"])
+    assert json.loads(capsys.readouterr().out) == generate_schema(
+        SchemaShape(properties=2)
+    )
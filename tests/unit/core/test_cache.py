@@ -0,0 +1,129 @@
+"""
+Unit test for cache.py
+"""
+import os
+import time
+
+from rpdk.guard_rail.core.cache import ResultCache, cache_namespace, package_version
+from rpdk.guard_rail.core.data_types import GuardRuleResult, GuardRuleSetResult
+
+RESULT = GuardRuleSetResult(
+    compliant=["ensure_a"],
+    non_compliant={
+        "ensure_b": {
+            GuardRuleResult(check_id="UT001", message="b", path="/b"),
+            GuardRuleResult(check_id="UT002", message="b", path="/c"),
+        }
+    },
+    warning={"ensure_c": {GuardRuleResult(check_id="UT003", message="c", path="")}},
+    skipped=["ensure_d"],
+    schema_difference={"type": {"added": ["/properties/Foo"]}},
+)
+
+
+def test_cache_key():
+    """Test key depends on namespace and content but not on key order"""
+    assert ResultCache.key("ns", {"a": 1, "b": 2}) == ResultCache.key(
+        "ns", {"b": 2, "a": 1}
+    )
+    assert ResultCache.key("ns", {"a": 1}) != ResultCache.key("other", {"a": 1})
+    assert ResultCache.key("ns", {"a": 1}) != ResultCache.key("ns", {"a": 2})
+    assert ResultCache.key("ns", {"a": 1}, {}) != ResultCache.key("ns", {}, {"a": 1})
+
+
+def test_cache_namespace():
+    """Test namespace includes mode, rules and package version"""
+    assert cache_namespace("stateless", "abc") == f"stateless|abc|{package_version()}"
+
+
+def test_cache_roundtrip(tmp_path):
+    """Test cached result equals the original one"""
+    cache = ResultCache(str(tmp_path))
+    key = cache.key("ns", {"foo": "bar"})
+    assert cache.get(key) is None
+    cache.put(key, RESULT)
+    assert cache.get(key) == RESULT
+    assert not [
+        name
+        for _, _, names in os.walk(tmp_path)
+        for name in names
+        if name.endswith(".tmp")
+    ]
+
+
+def test_cache_skips_timings(tmp_path):
+    """Test timings of the run are not persisted"""
+    cache = ResultCache(str(tmp_path))
+    key = cache.key("ns", {"foo": "bar"})
+    cache.put(key, GuardRuleSetResult(compliant=["rule"], timings={"stage": {}}))
+    assert cache.get(key).timings == {}
+
+
+def test_cache_corrupted_entry(tmp_path):
+    """Test corrupted entry is treated as a miss"""
+    cache = ResultCache(str(tmp_path))
+    key = cache.key("ns", {"foo": "bar"})
+    cache.put(key, RESULT)
+    with open(cache._path(key), "w", encoding="utf-8") as file:  # pylint: disable=W0212
+        file.write("{not json")
+    assert cache.get(key) is None
+
+
+def test_cache_write_failure(tmp_path):
+    """Test failing write does not raise"""
+    cache = ResultCache(str(tmp_path))
+    blocker = tmp_path / "ab"
+    blocker.write_text("not a directory")
+    cache.put("ab" + "0" * 62, RESULT)
+    assert cache.get("ab" + "0" * 62) is None
+
+
+def test_cache_tracks_size_in_bytes(tmp_path):
+    """Test tracked size counts encoded bytes and replaced entries once"""
+    cache = ResultCache(str(tmp_path))
+    cache.put(cache.key("ns", {}), GuardRuleSetResult(compliant=["first"]))
+    key = cache.key("ns", {"foo": "bar"})
+    for message in ("ä" * 100, "ö" * 200, "ü" * 50):
+        cache.put(
+            key,
+            GuardRuleSetResult(
+                non_compliant={"rule": {GuardRuleResult(message=message)}}
+            ),
+        )
+    on_disk = sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, names in os.walk(tmp_path)
+        for name in names
+    )
+    assert cache._size == on_disk  # pylint: disable=W0212
+
+
+def test_cache_lru_eviction(tmp_path):
+    """Test least recently used entries are evicted over size limit"""
+    cache = ResultCache(str(tmp_path))
+    keys = [cache.key("ns", {"index": index}) for index in range(4)]
+    for index, key in enumerate(keys):
+        cache.put(key, RESULT)
+        past = time.time() - 100 + index
+        os.utime(cache._path(key), (past, past))  # pylint: disable=W0212
+    # reading the oldest entry makes it the most recently used one
+    assert cache.get(keys[0]) is not None
+
+    entry_size = os.path.getsize(cache._path(keys[0]))  # pylint: disable=W0212
+    cache.max_size = entry_size * 3
+    cache.put(cache.key("ns", {"index": 4}), RESULT)
+
+    remaining = [key for key in keys if cache.get(key) is not None]
+    assert keys[0] in remaining
+    assert keys[1] not in remaining
+    assert len(remaining) + 1 <= 3
+
+
+def test_cache_is_picklable(tmp_path):
+    """Test cache can be handed over to worker processes"""
+    import pickle  # pylint: disable=C0415
+
+    cache = ResultCache(str(tmp_path), max_size=10)
+    restored = pickle.loads(pickle.dumps(cache))
+    assert restored.cache_dir == cache.cache_dir
+    assert restored.max_size == 10
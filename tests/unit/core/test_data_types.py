@@ -1,8 +1,19 @@
 """
 Unit test for data_types.py
 """
+import sys
 
-from rpdk.guard_rail.core.data_types import GuardRuleResult, GuardRuleSetResult
+import pytest
+
+from rpdk.guard_rail.core.data_types import (
+    GuardRuleResult,
+    GuardRuleSetResult,
+    GuardRuleSetResultBuilder,
+    ResultTable,
+)
+
+FIRST_CHECK = GuardRuleResult(check_id="ID001", message="first", path="/a")
+SECOND_CHECK = GuardRuleResult(check_id="ID002", message="second", path="/b")
 
 
 def test_merge():
@@ -13,6 +24,103 @@ def test_merge():
         assert "cannot merge with non GuardRuleSetResult type" == str(e)
 
 
+def test_merge_unites_rule_results():
+    """Test GuardRuleSetResult merge unites results of the same rule"""
+    result = GuardRuleSetResult(
+        compliant=["a"], non_compliant={"rule": {FIRST_CHECK}}, warning={}
+    )
+    result.merge(
+        GuardRuleSetResult(
+            compliant=["b"],
+            non_compliant={"rule": [SECOND_CHECK], "other": {FIRST_CHECK}},
+            warning={"warn": {SECOND_CHECK}},
+            skipped=["c"],
+        )
+    )
+    assert result == GuardRuleSetResult(
+        compliant=["a", "b"],
+        non_compliant={"rule": {FIRST_CHECK, SECOND_CHECK}, "other": {FIRST_CHECK}},
+        warning={"warn": {SECOND_CHECK}},
+        skipped=["c"],
+    )
+
+
+def test_builder():
+    """Test GuardRuleSetResultBuilder accumulates and unites results"""
+    builder = GuardRuleSetResultBuilder()
+    builder.add_compliant(["a"])
+    builder.add_skipped(["b"])
+    builder.add_non_compliant("rule", FIRST_CHECK)
+    builder.add_non_compliant("rule", FIRST_CHECK)
+    builder.add_warning("warn", SECOND_CHECK)
+    builder.merge(
+        GuardRuleSetResult(
+            compliant=["c"], non_compliant={"rule": {SECOND_CHECK}}, skipped=["d"]
+        )
+    )
+    result = builder.build()
+    assert result == GuardRuleSetResult(
+        compliant=["a", "c"],
+        non_compliant={"rule": {FIRST_CHECK, SECOND_CHECK}},
+        warning={"warn": {SECOND_CHECK}},
+        skipped=["b", "d"],
+    )
+
+    # built result does not change with further accumulation
+    builder.add_non_compliant("rule", GuardRuleResult())
+    builder.add_compliant(["e"])
+    assert result.non_compliant == {"rule": {FIRST_CHECK, SECOND_CHECK}}
+    assert result.compliant == ["a", "c"]
+    assert builder.build().compliant == ["a", "c", "e"]
+
+    with pytest.raises(TypeError):
+        builder.merge({"compliant": []})
+
+
+def test_interned_results():
+    """Test equal check ids, messages and rule names share a single string"""
+    first = GuardRuleResult(check_id="".join(["ID", "001"]), message="a b".upper())
+    second = GuardRuleResult(check_id="".join(["ID", "001"]), message="a b".upper())
+    assert first.check_id is second.check_id
+    assert first.message is second.message
+
+    builder = GuardRuleSetResultBuilder()
+    builder.add_compliant(["".join(["rule", "_a"])])
+    builder.add_non_compliant("".join(["rule", "_b"]), first)
+    result = builder.build()
+    assert result.compliant[0] is sys.intern("rule_a")
+    assert next(iter(result.non_compliant)) is sys.intern("rule_b")
+
+
+def test_result_table():
+    """Test ResultTable stores failed checks of many schemas in columns"""
+    table = ResultTable()
+    first = GuardRuleSetResult(
+        compliant=["passed"],
+        non_compliant={"rule": {FIRST_CHECK, SECOND_CHECK}},
+        warning={"warn": {FIRST_CHECK}},
+    )
+    second = GuardRuleSetResult(non_compliant={"rule": {FIRST_CHECK}})
+    table.add(0, first)
+    table.add(1, second)
+
+    assert len(table) == 4
+    assert list(table.column("schema_idx")) == [0, 0, 0, 1]
+    assert table.values("rule_id") == ["rule", "warn"]
+    assert table.counts("check_id") == {"ID001": 3, "ID002": 1}
+    assert table.counts("schema_idx") == {0: 3, 1: 1}
+    assert table.failures(0) == GuardRuleSetResult(
+        non_compliant=first.non_compliant, warning=first.warning
+    )
+    assert table.failures(1) == second
+    assert table.failures(2) == GuardRuleSetResult()
+
+    with pytest.raises(KeyError):
+        table.column("unknown")
+    with pytest.raises(KeyError):
+        table.values("schema_idx")
+
+
 def test_err_result_str():
     """Test GuardRuleSetResult str fail scenario"""
     try:
@@ -39,3 +147,24 @@ def test_success_result_str():
         )
         == "GuardRuleSetResult(compliant=[], non_compliant={'ensure_old_property_not_turned_immutable': {GuardRuleResult(check_id='MI007', message='cannot remove minimum from properties', path='/minimum/removed')}}, warning={}, skipped=[], schema_difference={})"  # pylint: disable=C0301
     )
+
+
+def test_result_json_roundtrip():
+    """Test GuardRuleSetResult is restored from its json"""
+    result = GuardRuleSetResult(
+        compliant=["ensure_a"],
+        non_compliant={"ensure_b": {GuardRuleResult(check_id="UT001", path="/b")}},
+        warning={"ensure_c": {GuardRuleResult(check_id="UT002")}},
+        skipped=["ensure_d"],
+    )
+    assert GuardRuleSetResult.from_json(result.json) == result
+    assert GuardRuleSetResult.from_json({}) == GuardRuleSetResult()
+
+
+def test_result_json_timings():
+    """Test timings are part of the json only when recorded"""
+    assert "timings" not in GuardRuleSetResult(compliant=["ensure_a"]).json
+    timings = {"run_checks:ensure_a": {"wall": 0.5, "cpu": 0.25, "calls": 1}}
+    document = GuardRuleSetResult(compliant=["ensure_a"], timings=timings).json
+    assert document["timings"] == timings
+    assert GuardRuleSetResult.from_json(document).timings == timings
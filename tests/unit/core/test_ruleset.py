@@ -0,0 +1,205 @@
+"""
+Unit test for ruleset.py
+"""
+import pytest
+
+from rpdk.guard_rail.core.ruleset import (
+    RuleMessage,
+    RuleSet,
+    RuleSetView,
+    analyze_rule_dependencies,
+    bundle_ruleset,
+    fingerprint_rules,
+    parse_rule_message,
+    prepare_ruleset,
+    prune_rules,
+)
+
+
+@pytest.mark.parametrize(
+    "ruleset,expected_bundles",
+    [
+        (
+            ["rule ensure_a { a exists }", "rule ensure_b { b exists }"],
+            [["rule ensure_a { a exists }", "rule ensure_b { b exists }"]],
+        ),
+        (
+            ["rule ensure_a { a exists }", "rule ensure_a { b exists }"],
+            [["rule ensure_a { a exists }"], ["rule ensure_a { b exists }"]],
+        ),
+        (
+            [
+                "let x = a\nrule ensure_a { %x exists }",
+                "let x = a\nrule ensure_b { %x exists }",
+                "let x = b\nrule ensure_c { %x exists }",
+            ],
+            [
+                [
+                    "let x = a\nrule ensure_a { %x exists }",
+                    "let x = a\nrule ensure_b { %x exists }",
+                ],
+                ["let x = b\nrule ensure_c { %x exists }"],
+            ],
+        ),
+    ],
+)
+def test_bundle_ruleset(ruleset, expected_bundles):
+    """Test rule files are bundled only when names do not collide"""
+    assert bundle_ruleset(ruleset) == expected_bundles
+
+
+def test_fingerprint_rules_order_independent():
+    """Test fingerprint does not depend on order or duplicates"""
+    assert fingerprint_rules(["a", "b"]) == fingerprint_rules(["b", "a", "b"])
+    assert fingerprint_rules(["a", "b"]) != fingerprint_rules(["a", "c"])
+
+
+def test_ruleset_views():
+    """Test rule set views match rule library per mode"""
+    ruleset = RuleSet(rules=["rule ensure_custom { foo exists }"])
+    assert ruleset.stateless.rules == frozenset(
+        prepare_ruleset() | {"rule ensure_custom { foo exists }"}
+    )
+    assert ruleset.read_only.rules == frozenset(
+        prepare_ruleset(is_read_only=True) | {"rule ensure_custom { foo exists }"}
+    )
+    assert ruleset.stateful.rules == frozenset(
+        prepare_ruleset("stateful") | {"rule ensure_custom { foo exists }"}
+    )
+    assert ruleset.read_only.rules < ruleset.stateless.rules
+    assert ruleset.stateless.fingerprint != RuleSet().stateless.fingerprint
+    assert sum(len(bundle) for bundle in ruleset.stateless.bundles) == len(
+        ruleset.stateless.rules
+    )
+    assert "RuleSet(stateless=" in repr(ruleset)
+
+
+def test_ruleset_view_extend():
+    """Test view is extended only with new rules"""
+    view = RuleSetView.from_rules(["rule ensure_a { a exists }"])
+    assert view.extend([]) is view
+    assert view.extend(["rule ensure_a { a exists }"]) is view
+    extended = view.extend(["rule ensure_b { b exists }"])
+    assert extended.rules == {
+        "rule ensure_a { a exists }",
+        "rule ensure_b { b exists }",
+    }
+    assert extended.fingerprint != view.fingerprint
+
+
+def test_parse_rule_message():
+    """Test rule message is parsed once and reused"""
+    raw_message = """
+    {
+        "result": "WARNING",
+        "check_id": "UT001",
+        "message": "unit test message"
+    }
+    """
+    parsed = parse_rule_message(raw_message)
+    assert parsed == RuleMessage(
+        check_id="UT001", message="unit test message", result="WARNING"
+    )
+    assert parse_rule_message(raw_message) is parsed
+    assert parse_rule_message('{"check_id": "UT002", "message": "m"}').result is None
+
+
+def test_parse_rule_message_invalid():
+    """Test invalid rule message raises syntax error"""
+    with pytest.raises(SyntaxError):
+        parse_rule_message("{ not a literal")
+
+
+def test_rule_messages_parsed_on_load():
+    """Test messages are parsed when rules are loaded"""
+    parse_rule_message.cache_clear()
+    RuleSetView.from_rules(
+        [
+            """rule ensure_a { a exists
+            <<
+            {"check_id": "UT003", "message": "a must exist"}
+            >>
+            b exists
+            << plain text message >>
+            }"""
+        ]
+    )
+    assert parse_rule_message.cache_info().currsize == 1
+    parse_rule_message('{"check_id": "UT003", "message": "a must exist"}')
+    assert parse_rule_message.cache_info().hits == 1
+
+
+GATED_RULES = """let x = foo
+rule ensure_a when alpha exists {
+    alpha.value == "{"
+    <<
+    {"check_id": "UT004", "message": "} braces in messages are ignored"}
+    >>
+}
+
+rule ensure_b when beta.nested exists
+{
+    # comment with } brace
+    beta exists
+}
+
+rule ensure_c when %x !empty {
+    gamma exists
+}
+
+rule ensure_d when delta exists { delta exists }
+rule ensure_e when ensure_d { epsilon exists }
+"""
+
+
+def test_analyze_rule_dependencies():
+    """Test only rule blocks gated on key existence are extracted"""
+    dependencies = analyze_rule_dependencies(GATED_RULES)
+    assert dependencies.rule_count == 5
+    assert [(block.name, block.key) for block in dependencies.blocks] == [
+        ("ensure_a", "alpha"),
+        ("ensure_b", "beta"),
+    ]
+    for block in dependencies.blocks:
+        assert GATED_RULES[block.start : block.end].strip().startswith("rule")
+        assert GATED_RULES[block.start : block.end].endswith("}")
+
+
+@pytest.mark.parametrize(
+    "rules",
+    [
+        "rule ensure_a when alpha exists { alpha exists",
+        "rule ensure_a when alpha exists { alpha == 'a }",
+        "rule ensure_a when alpha exists { << message }",
+    ],
+)
+def test_analyze_rule_dependencies_unbalanced(rules):
+    """Test no block is reported if file cannot be split into blocks"""
+    assert not analyze_rule_dependencies(rules).blocks
+
+
+def test_prune_rules_multiline_when():
+    """Test no rule is pruned if some rule header is not recognized"""
+    rules = (
+        "rule a when tagging exists { tagging.taggable == true }\n"
+        "rule b when\n    properties exists {\n    properties.Name exists\n}\n"
+    )
+    dependencies = analyze_rule_dependencies(rules)
+    assert dependencies.rule_count == 2
+    assert not dependencies.blocks
+    assert prune_rules(rules, {"properties": {}}) == (rules, ())
+
+
+def test_prune_rules():
+    """Test gated blocks are removed when their keys are absent"""
+    assert prune_rules(GATED_RULES, {"alpha": 1, "beta": 2}) == (GATED_RULES, ())
+
+    pruned, skipped = prune_rules(GATED_RULES, {"beta": 2})
+    assert skipped == ("ensure_a",)
+    assert "ensure_a" not in pruned
+    assert pruned.startswith("let x = foo")
+    assert "rule ensure_b" in pruned and "rule ensure_e" in pruned
+
+    assert prune_rules(
+        "rule ensure_a when alpha exists { alpha exists }", {"beta": 2}
+    ) == (None, ("ensure_a",))
@@ -5,8 +5,15 @@ from unittest import mock
 
 import pytest
 
+from rpdk.guard_rail.core import runner
 from rpdk.guard_rail.core.data_types import Stateful, Stateless
-from rpdk.guard_rail.core.runner import exec_compliance, prepare_ruleset
+from rpdk.guard_rail.core.ruleset import RuleSet
+from rpdk.guard_rail.core.runner import (
+    exec_compliance,
+    iter_compliance,
+    prepare_ruleset,
+)
+from rpdk.guard_rail.utils.timing import record_timings
 
 
 def test_prepare_ruleset():
@@ -15,6 +22,46 @@ def test_prepare_ruleset():
     assert prepare_ruleset("stateful")
 
 
+@pytest.mark.parametrize("is_read_only", [False, True])
+def test_exec_compliance_stateless_single_pass(is_read_only):
+    """Test single pass evaluation produces the same result as per file one"""
+    schema = {
+        "typeName": "AWS::Test::Resource",
+        "properties": {"Id": {"type": "string"}, "Tags": {"type": "array"}},
+        "primaryIdentifier": ["/properties/Id"],
+        "readOnlyProperties": ["/properties/Id"],
+    }
+    per_file = exec_compliance(
+        Stateless(schemas=[dict(schema)], is_read_only=is_read_only)
+    )
+    single_pass = exec_compliance(
+        Stateless(schemas=[dict(schema)], is_read_only=is_read_only),
+        single_pass=True,
+    )
+    assert sorted(per_file[0].compliant) == sorted(single_pass[0].compliant)
+    assert sorted(per_file[0].skipped) == sorted(single_pass[0].skipped)
+    assert per_file[0].non_compliant == single_pass[0].non_compliant
+    assert per_file[0].warning == single_pass[0].warning
+
+
+@mock.patch("rpdk.guard_rail.core.runner.schema_diff")
+@mock.patch("rpdk.guard_rail.core.runner.cfn_guard_rs.run_checks")
+def test_exec_compliance_single_pass_fallback(mock_run_checks, mock_schema_diff):
+    """Test bundle falls back to per file evaluation if guard fails"""
+    mock_schema_diff.return_value = {
+        "properties": {"removed": ["/properties/Foo"]},
+        "default": {"removed": ["/properties/Foo"]},
+    }
+    result = mock.Mock(compliant=["ensure_a"], not_compliant={}, not_applicable=[])
+    mock_run_checks.side_effect = [ValueError("cannot evaluate"), result, result]
+    compliance_result = exec_compliance(
+        Stateful(previous_schema={}, current_schema={}, print_diff_to_console=False),
+        single_pass=True,
+    )
+    assert mock_run_checks.call_count == 3
+    assert compliance_result[0].compliant == ["ensure_a", "ensure_a"]
+
+
 @pytest.mark.parametrize(
     "collected_schemas,collected_rules",
     [
@@ -100,3 +147,162 @@ def test_exec_compliance_readonly_with_mock_schema():
     assert hasattr(compliance_result[0], "compliant")
     assert hasattr(compliance_result[0], "warning")
     assert hasattr(compliance_result[0], "skipped")
+
+
+@mock.patch("rpdk.guard_rail.core.runner.prepare_ruleset")
+def test_exec_compliance_with_ruleset(mock_prepare_ruleset):
+    """Test exec_compliance reuses preloaded rules"""
+    ruleset = RuleSet()
+    first = exec_compliance(Stateless(schemas=[{"foo": "bar"}]), ruleset=ruleset)
+    second = exec_compliance(
+        Stateless(schemas=[{"foo": "bar"}], is_read_only=True), ruleset=ruleset
+    )
+    third = exec_compliance(
+        Stateful(previous_schema={}, current_schema={}, print_diff_to_console=False),
+        ruleset=ruleset,
+        single_pass=True,
+    )
+    mock_prepare_ruleset.assert_not_called()
+    assert "check_if_taggable_is_used" in first[0].compliant
+    assert second[0] is not None
+    assert third[0] is not None
+
+
+def test_exec_compliance_stateless_workers():
+    """Test parallel evaluation returns results in the order of schemas"""
+    schemas = [
+        {"foo": "bar"},
+        {"properties": {"Id": {"type": "string"}}, "primaryIdentifier": []},
+        {"primaryIdentifier": ["/properties/Id"]},
+    ]
+    sequential = exec_compliance(Stateless(schemas=[dict(s) for s in schemas]))
+    parallel = exec_compliance(
+        Stateless(schemas=[dict(s) for s in schemas]), workers=2, single_pass=True
+    )
+    assert len(parallel) == len(schemas)
+    for expected, actual in zip(sequential, parallel):
+        assert sorted(expected.compliant) == sorted(actual.compliant)
+        assert expected.non_compliant == actual.non_compliant
+
+
+def test_worker_evaluates_with_preloaded_rules(monkeypatch):
+    """Test worker evaluates schema with rules set up by its initializer"""
+    # initializer sets module state of the worker, restored after the test
+    monkeypatch.setattr(
+        runner, "_WORKER_CONTEXT", runner._WORKER_CONTEXT  # pylint: disable=W0212
+    )
+    runner.__init_worker__(RuleSet().stateless.bundles)
+    result = runner.__evaluate_in_worker__({"foo": "bar"})
+    assert "check_if_taggable_is_used" in result.compliant
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_iter_compliance_stateless(workers):
+    """Test streaming evaluation yields every schema with its index"""
+    schemas = ({"foo": str(index)} for index in range(5))
+    results = dict(iter_compliance(Stateless(schemas=schemas), workers=workers))
+    assert sorted(results) == [0, 1, 2, 3, 4]
+    for result in results.values():
+        assert "check_if_taggable_is_used" in result.compliant
+
+
+def test_iter_compliance_stateless_ordered():
+    """Test ordered streaming evaluation keeps the order of schemas"""
+    schemas = [{"foo": str(index)} for index in range(7)]
+    indexes = [
+        index
+        for index, _ in iter_compliance(
+            Stateless(schemas=schemas), workers=3, ordered=True
+        )
+    ]
+    assert indexes == list(range(7))
+
+
+def test_iter_compliance_stateful():
+    """Test streaming evaluation of a schema difference"""
+    results = list(
+        iter_compliance(
+            Stateful(previous_schema={}, current_schema={}, print_diff_to_console=False)
+        )
+    )
+    assert len(results) == 1
+    assert results[0][0] == 0
+
+
+def test_iter_compliance_not_supported():
+    """Test iter_compliance rejects unknown payloads"""
+    with pytest.raises(NotImplementedError):
+        iter_compliance({"foo": "bar"})
+
+
+@mock.patch("rpdk.guard_rail.core.runner.schema_diff")
+@mock.patch("rpdk.guard_rail.core.runner.cfn_guard_rs.run_checks")
+def test_exec_compliance_skips_gated_rules(mock_run_checks, mock_schema_diff):
+    """Test rule files with all blocks gated on absent keys are not evaluated"""
+    mock_schema_diff.return_value = {"title": {"added": ["foo"]}}
+    compliance_result = exec_compliance(
+        Stateful(previous_schema={}, current_schema={}, print_diff_to_console=False)
+    )
+    mock_run_checks.assert_not_called()
+    assert "ensure_default_values_have_not_changed" in compliance_result[0].skipped
+    assert "ensure_primary_identifier_not_changed" in compliance_result[0].skipped
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_exec_compliance_stateless_cache(tmp_path, workers):
+    """Test cached results are returned without evaluating schemas"""
+    schemas = [{"foo": "bar"}, {"foo": "baz"}]
+    first = exec_compliance(
+        Stateless(schemas=[dict(s) for s in schemas]),
+        workers=workers,
+        cache_dir=str(tmp_path),
+    )
+    with mock.patch("rpdk.guard_rail.core.runner.add_paths_to_schema") as mock_add:
+        second = exec_compliance(
+            Stateless(schemas=[dict(s) for s in schemas]), cache_dir=str(tmp_path)
+        )
+        mock_add.assert_not_called()
+    assert first == second
+
+
+@mock.patch("rpdk.guard_rail.core.runner.print_schema_diff")
+@mock.patch("rpdk.guard_rail.core.runner.schema_diff")
+def test_exec_compliance_stateful_cache(mock_schema_diff, mock_print, tmp_path):
+    """Test cached stateful result skips schema diff"""
+    mock_schema_diff.return_value = {"primaryIdentifier": {"added": ["a"]}}
+    payload = Stateful(previous_schema={"a": 1}, current_schema={"a": 2})
+    first = exec_compliance(payload, cache_dir=str(tmp_path))
+    second = exec_compliance(payload, cache_dir=str(tmp_path))
+    assert mock_schema_diff.call_count == 1
+    mock_print.assert_called_once_with(first[0].schema_difference)
+    assert first[0] == second[0]
+    assert second[0].schema_difference == first[0].schema_difference
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_exec_compliance_stateless_timings(workers):
+    """Test stage timings are attached to results and add up in the recorder"""
+    schemas = [{"properties": {"Id": {"type": "string"}}}, {"foo": "bar"}]
+    assert not exec_compliance(Stateless(schemas=[dict(schemas[0])]))[0].timings
+
+    with record_timings() as timings:
+        results = exec_compliance(
+            Stateless(schemas=[dict(schema) for schema in schemas]), workers=workers
+        )
+    for result in results:
+        assert {"resolve_schema", "fetch_all_paths", "render"} <= set(result.timings)
+        assert any(name.startswith("run_checks:") for name in result.timings)
+        assert "timings" in result.json
+    assert timings.stages["resolve_schema"].calls == len(schemas)
+    assert timings.stages["render"].calls == sum(
+        result.timings["render"]["calls"] for result in results
+    )
+
+
+def test_exec_compliance_stateful_timings():
+    """Test stage timings of the stateful assessment"""
+    with record_timings():
+        (result,) = exec_compliance(
+            Stateful(previous_schema={}, current_schema={}, print_diff_to_console=False)
+        )
+    assert {"schema_diff", "resolve_schema"} <= set(result.timings)
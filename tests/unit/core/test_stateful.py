@@ -5,7 +5,7 @@ Unit test for stateful.py
 """
 import pytest
 
-from rpdk.guard_rail.core.stateful import schema_diff
+from rpdk.guard_rail.core.stateful import _meta_path, schema_diff
 
 
 @pytest.mark.parametrize(
@@ -1259,3 +1259,169 @@ def test_schema_diff_tagging_metadata_changes(
     for key in expected_diff:
         assert key in actual_diff, f"Expected key '{key}' not found in diff"
         assert actual_diff[key] == expected_diff[key], f"Mismatch for key '{key}'"
+
+
+@pytest.mark.parametrize(
+    "schema_variant1, schema_variant2, expected_diff",
+    [
+        # Test Case #1: reordered list constructs are not a change
+        (
+            {
+                "required": ["Foo", "Bar"],
+                "readOnlyProperties": ["/properties/Foo", "/properties/Bar"],
+                "properties": {"Foo": {"type": ["string", "integer"]}},
+            },
+            {
+                "required": ["Bar", "Foo"],
+                "readOnlyProperties": ["/properties/Bar", "/properties/Foo"],
+                "properties": {"Foo": {"type": ["integer", "string"]}},
+            },
+            {},
+        ),
+        # Test Case #2: replaced list items are reported as removed and added
+        (
+            {"properties": {"Foo": {"type": "integer", "enum": [100, 200]}}},
+            {"properties": {"Foo": {"type": "integer", "enum": [100, 210]}}},
+            {"enum": {"added": [210], "removed": [200]}},
+        ),
+        # Test Case #3: numbers are compared regardless of int/float type
+        (
+            {"properties": {"Foo": {"type": "number", "maximum": 10}}},
+            {"properties": {"Foo": {"type": "number", "maximum": 10.0}}},
+            {},
+        ),
+        # Test Case #4: sub schema of combiner changed in place
+        (
+            {
+                "properties": {
+                    "Foo": {
+                        "anyOf": [
+                            {"type": "string", "maxLength": 5},
+                            {"type": "integer"},
+                        ]
+                    }
+                }
+            },
+            {
+                "properties": {
+                    "Foo": {
+                        "anyOf": [
+                            {"type": "integer"},
+                            {"type": "string", "maxLength": 4},
+                        ]
+                    }
+                }
+            },
+            {
+                "maxLength": {
+                    "changed": [
+                        {
+                            "property": "/properties/Foo/anyOf",
+                            "old_value": 5,
+                            "new_value": 4,
+                        }
+                    ]
+                }
+            },
+        ),
+        # Test Case #5: sub schemas of combiner reordered and changed in place
+        # are paired by similarity, not by position
+        (
+            {
+                "properties": {
+                    "Foo": {
+                        "oneOf": [
+                            {
+                                "type": "object",
+                                "properties": {"A": {"type": "string"}},
+                                "required": ["A"],
+                            },
+                            {
+                                "type": "object",
+                                "properties": {"B": {"type": "string"}},
+                                "required": ["B"],
+                            },
+                        ]
+                    }
+                }
+            },
+            {
+                "properties": {
+                    "Foo": {
+                        "oneOf": [
+                            {
+                                "type": "object",
+                                "properties": {"B": {"type": "string", "maxLength": 5}},
+                                "required": ["B"],
+                            },
+                            {
+                                "type": "object",
+                                "properties": {"A": {"type": "string", "maxLength": 3}},
+                                "required": ["A"],
+                            },
+                        ]
+                    }
+                }
+            },
+            {
+                "maxLength": {
+                    "added": ["/properties/Foo/oneOf/A", "/properties/Foo/oneOf/B"]
+                }
+            },
+        ),
+        # Test Case #6: replaced required property of the same length
+        # is reported as removed and added, not as changed
+        (
+            {
+                "properties": {"Foo": {"type": "string"}, "Bar": {"type": "string"}},
+                "required": ["Foo"],
+            },
+            {
+                "properties": {"Foo": {"type": "string"}, "Bar": {"type": "string"}},
+                "required": ["Bar"],
+            },
+            {"required": {"added": ["Bar"], "removed": ["Foo"]}},
+        ),
+    ],
+)
+def test_schema_diff_list_semantics(schema_variant1, schema_variant2, expected_diff):
+    """Unit test to verify lists other than primary identifier are compared as sets"""
+    assert expected_diff == schema_diff(schema_variant1, schema_variant2, False)
+
+
+def test_schema_diff_unpaired_combiner_items():
+    """Unit test to verify sub schemas without common keys are replaced, not paired"""
+    with pytest.raises(NotImplementedError):
+        schema_diff(
+            {"properties": {"Foo": {"anyOf": [{"type": "string"}]}}},
+            {"properties": {"Foo": {"anyOf": [{"$comment": "any"}]}}},
+            False,
+        )
+
+
+@pytest.mark.parametrize(
+    "path, expected_meta_path",
+    [
+        ((), []),
+        (("primaryIdentifier",), ["primaryIdentifier"]),
+        (("properties",), ["properties"]),
+        (("properties", "Foo", "type"), ["properties", "Foo", "type"]),
+        (("properties", "Foo", "properties"), ["properties", "Foo", "properties"]),
+        (("properties", "Foo", "properties", "Bar"), ["properties", "Foo", "Bar"]),
+        (
+            ("properties", "Foo", "properties", "properties", "type"),
+            ["properties", "Foo", "properties", "type"],
+        ),
+        (
+            ("properties", "Foo", "items", "properties", "Bar", "type"),
+            ["properties", "Foo", "*", "Bar", "type"],
+        ),
+        (
+            ("properties", "Foo", "items", "type"),
+            ["properties", "Foo", "items", "type"],
+        ),
+    ],
+)
+def test_meta_path(path, expected_meta_path):
+    """Unit test to verify path of the change is translated into meta diff steps"""
+    assert expected_meta_path == _meta_path(path)
@@ -0,0 +1,62 @@
+"""
+Unit test for summary.py
+"""
+import pytest
+
+from rpdk.guard_rail.core.data_types import GuardRuleResult, GuardRuleSetResult
+from rpdk.guard_rail.core.summary import ComplianceAggregator
+
+FIRST_CHECK = GuardRuleResult(check_id="ID001", message="first", path="/a")
+SECOND_CHECK = GuardRuleResult(check_id="ID001", message="first", path="/b")
+THIRD_CHECK = GuardRuleResult(check_id="ID002", message="third", path="/c")
+
+
+def test_aggregator_counts():
+    """Test statuses are counted once per schema, per rule and per check id"""
+    aggregator = ComplianceAggregator()
+    aggregator.extend(
+        [
+            GuardRuleSetResult(
+                compliant=["passing"],
+                non_compliant={"failing": {FIRST_CHECK, SECOND_CHECK}},
+                warning={"warning": {THIRD_CHECK}},
+                skipped=["skipped"],
+            ),
+            GuardRuleSetResult(
+                compliant=["passing", "failing"], skipped=["skipped", "warning"]
+            ),
+        ]
+    )
+    assert aggregator.json == {
+        "schemas": 2,
+        "compliant_schemas": 1,
+        "rules": {
+            "failing": {"passed": 1, "failed": 1, "warning": 0, "skipped": 0},
+            "passing": {"passed": 2, "failed": 0, "warning": 0, "skipped": 0},
+            "skipped": {"passed": 0, "failed": 0, "warning": 0, "skipped": 2},
+            "warning": {"passed": 0, "failed": 0, "warning": 1, "skipped": 1},
+        },
+        "checks": {
+            "ID001": {"failed": 1, "warning": 0},
+            "ID002": {"failed": 0, "warning": 1},
+        },
+    }
+
+
+def test_aggregator_rejects_non_result():
+    """Test only compliance results are aggregated"""
+    with pytest.raises(TypeError):
+        ComplianceAggregator().add({"compliant": []})
+
+
+def test_aggregator_display(capsys):
+    """Test histogram tables list rules and checks"""
+    aggregator = ComplianceAggregator()
+    aggregator.display()
+    aggregator.add(GuardRuleSetResult(non_compliant={"failing": {FIRST_CHECK}}))
+    aggregator.display()
+    out = capsys.readouterr().out
+    assert "0 of 1 schemas compliant" in out
+    assert "failing" in out
+    assert "ID001" in out
+    assert "█" * 20 in out
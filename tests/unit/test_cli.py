@@ -1,13 +1,29 @@
 """
 Unit test for cli.py
 """
+import json
+import os
+import subprocess
+import sys
 from typing import Dict, List
 from unittest import mock
 
 import pytest
 
-from cli import main
+import cli
+from cli import main, stream_list
 from rpdk.guard_rail.core.data_types import GuardRuleResult, GuardRuleSetResult
+from rpdk.guard_rail.utils.timing import stage
+
+# dependencies slow to import, loaded only on code paths that need them;
+# checked by loaded modules rather than by time, which is flaky on busy machines
+HEAVY_MODULES = ["deepdiff", "jsonschema", "multiprocessing", "rich", "strenum"]
+
+IMPORTED_MODULES_SCRIPT = """
+import json, sys
+{statement}
+print(json.dumps(sorted(name for name in {modules} if name in sys.modules)))
+"""
 
 RULE_RESULT: GuardRuleResult = GuardRuleResult(check_id="id", message="rule message")
 NON_COMPLIANT: Dict[str, List[GuardRuleResult]] = {"non-compliant rule": [RULE_RESULT]}
@@ -21,9 +37,10 @@ COMPLIANCE_RESULT = GuardRuleSetResult(
 )
 
 
-@mock.patch("cli.exec_compliance")
+@mock.patch("rpdk.guard_rail.core.runner.iter_compliance")
 @mock.patch("cli.argument_validation")
 @mock.patch("cli.collect_rules")
+@mock.patch("cli.iter_schemas")
 @mock.patch("cli.collect_schemas")
 @pytest.mark.parametrize(
     "args",
@@ -73,19 +90,271 @@ COMPLIANCE_RESULT = GuardRuleSetResult(
                 "--json",
             ]
         ),
+        (
+            [
+                "--schema",
+                "file://path1",
+                "--single-pass",
+            ]
+        ),
+        (
+            [
+                "--schema",
+                "file://path1",
+                "--schema",
+                "file://path2",
+                "--jobs",
+                "2",
+            ]
+        ),
+        (
+            [
+                "--schema",
+                "file://path1",
+                "--cache-dir",
+                "/tmp/guard-rail-cache",
+            ]
+        ),
     ],
 )
 def test_main_cli(
     mock_collect_schemas,
+    mock_iter_schemas,
     mock_collect_rules,
     mock_argument_validation,
-    mock_exec_compliance,
+    mock_iter_compliance,
     args,
 ):
     """Main cli unit test with downstream mocked"""
     mock_collect_schemas.return_value = [{"foo": "bar"}, {"foo": "bar"}]
-    mock_exec_compliance.return_value = [COMPLIANCE_RESULT]
+    mock_iter_schemas.return_value = iter([{"foo": "bar"}, {"foo": "bar"}])
+    mock_iter_compliance.return_value = iter([(0, COMPLIANCE_RESULT)])
     mock_argument_validation.return_value = True
     mock_collect_rules.return_value = []
     main(args_in=args)
     assert True
+
+
+@pytest.mark.parametrize(
+    "items,expected",
+    [
+        ([], "[]\n"),
+        ([COMPLIANCE_RESULT], str([COMPLIANCE_RESULT]) + "\n"),
+        ([{"a": 1}, {"b": [2]}], str([{"a": 1}, {"b": [2]}]) + "\n"),
+    ],
+)
+def test_stream_list(capsys, items, expected):
+    """Streamed list output matches printing the whole list at once"""
+    stream_list(iter(items))
+    assert capsys.readouterr().out == expected
+
+
+@mock.patch("rpdk.guard_rail.server.serve")
+@mock.patch("rpdk.guard_rail.core.ruleset.RuleSet")
+@mock.patch("cli.collect_rules")
+def test_main_cli_serve(mock_collect_rules, mock_ruleset, mock_serve):
+    """Serve command starts the server with preloaded rules"""
+    mock_collect_rules.return_value = ["rule"]
+    main(args_in=["serve", "--stdio", "--single-pass"])
+    mock_ruleset.assert_called_once_with()
+    context = mock_serve.call_args.kwargs["context"]
+    assert context.ruleset == mock_ruleset.return_value
+    assert context.rules == ["rule"]
+    assert context.single_pass
+    assert context.cache_dir is None
+
+
+def test_main_cli_serve_requires_transport():
+    """Serve command fails without transport specified"""
+    with pytest.raises(SystemExit):
+        main(args_in=["serve"])
+
+
+def _imported_heavy_modules(statement):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [os.path.dirname(cli.__file__), env.get("PYTHONPATH")])
+    )
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            IMPORTED_MODULES_SCRIPT.format(statement=statement, modules=HEAVY_MODULES),
+        ],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+@pytest.mark.parametrize(
+    "statement,loaded_modules",
+    [
+        (
+            "from cli import main\ntry:\n    main(['--version'])\n"
+            "except SystemExit:\n    pass",
+            [],
+        ),
+        ("import rpdk.guard_rail", []),
+        ("import rpdk.guard_rail.core.runner", []),
+        (
+            "from rpdk.guard_rail.core.data_types import GuardRuleSetResult\n"
+            "GuardRuleSetResult(compliant=['rule']).display()",
+            ["rich"],
+        ),
+        (
+            "from rpdk.guard_rail.core.data_types import GuardRuleSetResult\n"
+            "GuardRuleSetResult(compliant=['rule']).display(renderer='plain')",
+            [],
+        ),
+    ],
+)
+def test_cold_import_modules(statement, loaded_modules):
+    """Heavy dependencies are loaded only on code paths that need them"""
+    assert _imported_heavy_modules(statement) == loaded_modules
+
+
+@pytest.mark.parametrize(
+    "args,parse",
+    [
+        (["--json"], json.loads),
+        (["--output-format", "json"], json.loads),
+        (
+            ["--output-format", "ndjson"],
+            lambda out: [json.loads(line) for line in out.splitlines()],
+        ),
+    ],
+)
+@mock.patch("rpdk.guard_rail.core.runner.iter_compliance")
+@mock.patch("cli.iter_schemas")
+def test_main_cli_output_format(
+    mock_iter_schemas, mock_iter_compliance, args, parse, capsys
+):
+    """Results are written as valid JSON array or one JSON document per line"""
+    mock_iter_schemas.return_value = iter([{}, {}])
+    mock_iter_compliance.return_value = iter(
+        [(0, COMPLIANCE_RESULT), (1, COMPLIANCE_RESULT)]
+    )
+    main(
+        args_in=["--schema", "file://path1.json", "--schema", "file://path2.json"]
+        + args
+    )
+    assert parse(capsys.readouterr().out) == [COMPLIANCE_RESULT.json] * 2
+
+
+@pytest.mark.parametrize(
+    "args,parse",
+    [
+        ([], None),
+        (["--json"], json.loads),
+        (["--output-format", "ndjson"], lambda out: [json.loads(out)]),
+    ],
+)
+@mock.patch("rpdk.guard_rail.core.runner.iter_compliance")
+@mock.patch("cli.iter_schemas")
+def test_main_cli_summary(mock_iter_schemas, mock_iter_compliance, args, parse, capsys):
+    """Only counts aggregated over all schemas are printed"""
+    mock_iter_schemas.return_value = iter([{}, {}])
+    mock_iter_compliance.return_value = iter(
+        [(0, COMPLIANCE_RESULT), (1, COMPLIANCE_RESULT)]
+    )
+    main(
+        args_in=["--schema", "file://path1.json", "--schema", "file://path2.json"]
+        + ["--summary"]
+        + args
+    )
+    out = capsys.readouterr().out
+    if parse is None:
+        assert "Compliance Summary (0 of 2 schemas compliant)" in out
+        return
+    (summary,) = parse(out)  # pylint: disable=W0632
+    assert summary["schemas"] == 2
+    assert summary["rules"]["non-compliant rule"]["failed"] == 2
+    assert summary["checks"] == {"id": {"failed": 2, "warning": 2}}
+
+
+@pytest.mark.parametrize(
+    "args,expected_lines",
+    [
+        (
+            ["--renderer", "stream"],
+            [
+                "Rule Name\tCheck Id\tMessage\tPath\tStatus",
+                "skipped rule\t-\t-\t-\tskipped",
+                "compliant rule\t-\t-\t-\tpassed",
+                "warning rule\tid\trule message\t-\twarning",
+                "non-compliant rule\tid\trule message\tunidentified\tfailed",
+            ],
+        ),
+        (
+            ["--format", "--renderer", "stream", "--max-rows", "2"],
+            [
+                "Rule Name\tCheck Id\tMessage\tPath\tStatus",
+                "skipped rule\t-\t-\t-\tskipped",
+                "compliant rule\t-\t-\t-\tpassed",
+                "... 2 more rows not shown (--max-rows)",
+            ],
+        ),
+    ],
+)
+@mock.patch("rpdk.guard_rail.core.runner.iter_compliance")
+@mock.patch("cli.iter_schemas")
+def test_main_cli_renderer(
+    mock_iter_schemas, mock_iter_compliance, args, expected_lines, capsys
+):
+    """Results are displayed with the selected renderer, capped if requested"""
+    mock_iter_schemas.return_value = iter([{}])
+    mock_iter_compliance.return_value = iter([(0, COMPLIANCE_RESULT)])
+    main(args_in=["--schema", "file://path1.json"] + args)
+    assert capsys.readouterr().out.split("\n") == [""] + expected_lines + ["", ""]
+
+
+@mock.patch("rpdk.guard_rail.core.runner.iter_compliance")
+@mock.patch("cli.iter_schemas")
+def test_main_cli_timings(mock_iter_schemas, mock_iter_compliance, capsys):
+    """Timings summary is printed to stderr after the results"""
+
+    def __iter_compliance(payload, **kwargs):
+        with stage("run_checks:rule"):
+            yield 0, COMPLIANCE_RESULT
+
+    mock_iter_schemas.return_value = iter([{}])
+    mock_iter_compliance.side_effect = __iter_compliance
+    main(args_in=["--schema", "file://path1.json", "--json", "--timings"])
+    captured = capsys.readouterr()
+    assert captured.out.startswith("[{")
+    assert "Stage Timings" in captured.err
+    assert "run_checks:rule" in captured.err
+
+
+@mock.patch("rpdk.guard_rail.core.runner.iter_compliance")
+@mock.patch("cli.iter_schemas")
+def test_main_cli_memory_report(mock_iter_schemas, mock_iter_compliance, capsys):
+    """Memory report is printed to stderr after the results"""
+
+    def __iter_compliance(payload, **kwargs):
+        with stage("run_checks:rule"):
+            yield 0, COMPLIANCE_RESULT
+
+    mock_iter_schemas.return_value = iter([{}])
+    mock_iter_compliance.side_effect = __iter_compliance
+    main(args_in=["--schema", "file://path1.json", "--json", "--memory-report"])
+    captured = capsys.readouterr()
+    assert captured.out.startswith("[{")
+    assert "Stage Memory" in captured.err
+    assert "run_checks:rule" in captured.err
+    assert "Stage Timings" not in captured.err
+
+
+@mock.patch("rpdk.guard_rail.core.runner.iter_compliance")
+@mock.patch("cli.iter_schemas")
+def test_main_cli_profile(mock_iter_schemas, mock_iter_compliance, tmp_path):
+    """Profile of the run is written with collapsed stacks next to it"""
+    mock_iter_schemas.return_value = iter([{}])
+    mock_iter_compliance.return_value = iter([(0, COMPLIANCE_RESULT)])
+    path = tmp_path / "run.prof"
+    main(args_in=["--schema", "file://path1.json", "--json", "--profile", str(path)])
+    assert path.exists()
+    assert (tmp_path / "run.collapsed").exists()
@@ -0,0 +1,310 @@
+"""
+Unit test for lsp.py
+"""
+import io
+import json
+from unittest import mock
+
+import pytest
+
+from rpdk.guard_rail.core.data_types import GuardRuleResult, GuardRuleSetResult
+from rpdk.guard_rail.core.ruleset import RuleSet
+from rpdk.guard_rail.lsp import (
+    SEVERITY_ERROR,
+    SEVERITY_WARNING,
+    LanguageServer,
+    apply_change,
+    locate_pointers,
+    offset_to_position,
+    position_to_offset,
+    read_message,
+    result_diagnostics,
+    serve,
+)
+from rpdk.guard_rail.server import METHOD_NOT_FOUND
+
+URI = "file:///schema.json"
+
+SCHEMA = {
+    "typeName": "AWS::Test::Resource",
+    "properties": {"Name": {"type": "string"}},
+    "primaryIdentifier": ["/properties/Name"],
+}
+
+
+@pytest.fixture(name="ruleset", scope="module")
+def fixture_ruleset():
+    """Rules loaded once for the module"""
+    return RuleSet()
+
+
+def _frame(message):
+    body = json.dumps(message).encode("utf-8")
+    return f"Content-Length: {len(body)}\r\n\r\n".encode("ascii") + body
+
+
+def _read_all(output_stream):
+    stream = io.BytesIO(output_stream.getvalue())
+    messages = []
+    while True:
+        message = read_message(stream)
+        if message is None:
+            return messages
+        messages.append(message)
+
+
+def _published(output_stream):
+    return [
+        message["params"]
+        for message in _read_all(output_stream)
+        if message.get("method") == "textDocument/publishDiagnostics"
+    ]
+
+
+def _server(ruleset, debounce=0):
+    output_stream = io.BytesIO()
+    server = LanguageServer(output_stream, ruleset=ruleset, debounce=debounce)
+    server.handle({"jsonrpc": "2.0", "id": 0, "method": "initialize", "params": {}})
+    return server, output_stream
+
+
+def _open(server, text, version=1):
+    server.handle(
+        {
+            "jsonrpc": "2.0",
+            "method": "textDocument/didOpen",
+            "params": {
+                "textDocument": {
+                    "uri": URI,
+                    "languageId": "json",
+                    "version": version,
+                    "text": text,
+                }
+            },
+        }
+    )
+
+
+def _change(server, changes, version):
+    server.handle(
+        {
+            "jsonrpc": "2.0",
+            "method": "textDocument/didChange",
+            "params": {
+                "textDocument": {"uri": URI, "version": version},
+                "contentChanges": changes,
+            },
+        }
+    )
+
+
+def test_locate_pointers():
+    """Members are located by keys, array items and root by values"""
+    text = '{"a": {"b/c": [1, {"d": "x"}]}, "e": null}'
+    locations = locate_pointers(text)
+    assert text[slice(*locations[""])] == text
+    assert text[slice(*locations["/a"])] == '"a"'
+    assert text[slice(*locations["/a/b~1c"])] == '"b/c"'
+    assert text[slice(*locations["/a/b~1c/0"])] == "1"
+    assert text[slice(*locations["/a/b~1c/1"])] == '{"d": "x"}'
+    assert text[slice(*locations["/a/b~1c/1/d"])] == '"d"'
+    assert text[slice(*locations["/e"])] == '"e"'
+
+
+@pytest.mark.parametrize(
+    "text,offset,position",
+    [
+        ("{}", 1, {"line": 0, "character": 1}),
+        ('{\n  "a": 1\n}', 4, {"line": 1, "character": 2}),
+        ('{\r\n"a": 1}', 4, {"line": 1, "character": 1}),
+        ('{"\U0001f600": 1}', 3, {"line": 0, "character": 4}),
+    ],
+)
+def test_positions(text, offset, position):
+    """Offsets convert to UTF-16 based positions and back"""
+    assert offset_to_position(text, offset) == position
+    assert position_to_offset(text, position) == offset
+
+
+def test_apply_change():
+    """Ranged changes are spliced, full changes replace the text"""
+    text = '{\n  "a": 1\n}'
+    change = {
+        "range": {
+            "start": {"line": 1, "character": 7},
+            "end": {"line": 1, "character": 8},
+        },
+        "text": "2",
+    }
+    assert apply_change(text, change) == '{\n  "a": 2\n}'
+    assert apply_change(text, {"text": "{}"}) == "{}"
+
+
+def test_result_diagnostics():
+    """Diagnostics are ranged at the result paths"""
+    text = json.dumps(SCHEMA, indent=2)
+    result = GuardRuleSetResult(
+        non_compliant={
+            "rule": {GuardRuleResult(check_id="C001", message="m", path="/properties")}
+        },
+        warning={
+            "rule": {
+                GuardRuleResult(
+                    check_id="W001", message="w", path="/handlers/create/permissions"
+                )
+            }
+        },
+    )
+    diagnostics = result_diagnostics(text, result)
+    assert len(diagnostics) == 2
+    error, warning = diagnostics[0], diagnostics[1]
+    assert error["severity"] == SEVERITY_ERROR
+    assert error["code"] == "C001"
+    assert error["range"] == {
+        "start": {"line": 2, "character": 2},
+        "end": {"line": 2, "character": 14},
+    }
+    # missing path is reported on the closest located parent
+    assert warning["severity"] == SEVERITY_WARNING
+    assert warning["range"]["start"] == {"line": 0, "character": 0}
+
+
+def test_validate_on_open(ruleset):
+    """Opened document is validated immediately"""
+    server, output_stream = _server(ruleset)
+    _open(server, json.dumps(SCHEMA, indent=2))
+
+    (published,) = _published(output_stream)
+    assert published["uri"] == URI
+    assert published["version"] == 1
+    assert published["diagnostics"]
+    assert all(
+        diagnostic["source"] == "guard-rail" for diagnostic in published["diagnostics"]
+    )
+
+
+def test_syntax_error(ruleset):
+    """Syntax errors are reported without evaluating rules"""
+    server, output_stream = _server(ruleset)
+    with mock.patch("rpdk.guard_rail.lsp.exec_compliance") as mock_exec:
+        _open(server, '{\n  "typeName": \n}')
+    mock_exec.assert_not_called()
+
+    (published,) = _published(output_stream)
+    (diagnostic,) = published["diagnostics"]
+    assert diagnostic["severity"] == SEVERITY_ERROR
+    assert diagnostic["range"]["start"] == {"line": 2, "character": 0}
+
+
+def test_formatting_change_reuses_result(ruleset):
+    """Rules are not evaluated if the schema did not change"""
+    server, output_stream = _server(ruleset)
+    _open(server, json.dumps(SCHEMA))
+    with mock.patch("rpdk.guard_rail.lsp.exec_compliance") as mock_exec:
+        _change(server, [{"text": json.dumps(SCHEMA, indent=4)}], version=2)
+    mock_exec.assert_not_called()
+
+    published = _published(output_stream)
+    assert len(published) == 2
+    first, second = published[0], published[1]
+    assert len(first["diagnostics"]) == len(second["diagnostics"])
+    assert second["version"] == 2
+
+
+def test_changes_are_debounced(ruleset):
+    """Burst of changes schedules a single validation"""
+    server, output_stream = _server(ruleset, debounce=60)
+    _open(server, "{}")
+    with mock.patch.object(server, "validate") as mock_validate:
+        for version in range(2, 5):
+            _change(
+                server,
+                [
+                    {
+                        "range": {
+                            "start": {"line": 0, "character": 1},
+                            "end": {"line": 0, "character": 1},
+                        },
+                        "text": " ",
+                    }
+                ],
+                version=version,
+            )
+        timer = server._timers[URI]  # pylint: disable=W0212
+        server.cancel_pending()
+        mock_validate.assert_not_called()
+    assert not timer.is_alive() or timer.finished.is_set()
+    assert server.documents[URI].text == "{   }"
+    assert server.documents[URI].version == 4
+    assert len(_published(output_stream)) == 1
+
+
+def test_debounced_validation_publishes(ruleset):
+    """Debounced validation publishes diagnostics of the latest version"""
+    server, output_stream = _server(ruleset, debounce=0.01)
+    _open(server, "{}")
+    _change(server, [{"text": "{"}], version=2)
+    server._timers[URI].join(5)  # pylint: disable=W0212
+
+    published = _published(output_stream)
+    assert len(published) == 2
+    first, second = published[0], published[1]
+    assert first["version"] == 1
+    assert second["version"] == 2
+    assert second["diagnostics"][0]["severity"] == SEVERITY_ERROR
+
+
+def test_close_clears_diagnostics(ruleset):
+    """Closing the document clears its diagnostics"""
+    server, output_stream = _server(ruleset)
+    _open(server, "{")
+    server.handle(
+        {
+            "jsonrpc": "2.0",
+            "method": "textDocument/didClose",
+            "params": {"textDocument": {"uri": URI}},
+        }
+    )
+    assert URI not in server.documents
+    assert _published(output_stream)[-1]["diagnostics"] == []
+
+
+def test_unknown_method(ruleset):
+    """Unknown requests are answered with an error"""
+    server, output_stream = _server(ruleset)
+    server.handle({"jsonrpc": "2.0", "id": 7, "method": "textDocument/hover"})
+    response = _read_all(output_stream)[-1]
+    assert response["id"] == 7
+    assert response["error"]["code"] == METHOD_NOT_FOUND
+
+
+def test_serve(ruleset):
+    """Server handles messages until exit"""
+    messages = [
+        {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {}},
+        {"jsonrpc": "2.0", "method": "initialized", "params": {}},
+        {
+            "jsonrpc": "2.0",
+            "method": "textDocument/didOpen",
+            "params": {
+                "textDocument": {"uri": URI, "version": 1, "text": "[]"},
+            },
+        },
+        {"jsonrpc": "2.0", "id": 2, "method": "shutdown"},
+        {"jsonrpc": "2.0", "method": "exit"},
+        {"jsonrpc": "2.0", "id": 3, "method": "shutdown"},
+    ]
+    input_stream = io.BytesIO(b"".join(_frame(message) for message in messages))
+    output_stream = io.BytesIO()
+    server = LanguageServer(output_stream, ruleset=ruleset, debounce=0)
+    serve(input_stream=input_stream, output_stream=output_stream, server=server)
+
+    messages = _read_all(output_stream)
+    assert len(messages) == 3
+    initialize, published, shutdown = messages[0], messages[1], messages[2]
+    assert initialize["result"]["capabilities"]["textDocumentSync"]["change"] == 2
+    assert published["params"]["diagnostics"][0]["message"] == (
+        "schema must be an object"
+    )
+    assert shutdown == {"jsonrpc": "2.0", "id": 2, "result": None}
+    assert not server.running
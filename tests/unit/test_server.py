@@ -0,0 +1,177 @@
+"""
+Unit test for server.py
+"""
+import io
+import json
+
+import pytest
+
+from rpdk.guard_rail.core.data_types import Stateful, Stateless
+from rpdk.guard_rail.core.ruleset import RuleSet
+from rpdk.guard_rail.core.runner import exec_compliance
+from rpdk.guard_rail.server import (
+    INTERNAL_ERROR,
+    INVALID_PARAMS,
+    INVALID_REQUEST,
+    METHOD_NOT_FOUND,
+    PARSE_ERROR,
+    ServerContext,
+    handle_request,
+    serve,
+)
+
+SCHEMA = {
+    "typeName": "AWS::Test::Resource",
+    "properties": {"Name": {"type": "string"}},
+    "primaryIdentifier": ["/properties/Name"],
+}
+
+
+@pytest.fixture(name="context", scope="module")
+def fixture_context():
+    """Server context with rules loaded once for the module"""
+    return ServerContext(ruleset=RuleSet())
+
+
+def _request(method, params=None, request_id=1):
+    request = {"jsonrpc": "2.0", "method": method, "params": params or {}}
+    if request_id is not None:
+        request["id"] = request_id
+    return json.dumps(request)
+
+
+def _normalize(results):
+    # rule results are collected in sets, order of checks is not stable
+    return [
+        {
+            key: (
+                {
+                    rule: sorted(map(json.dumps, checks))
+                    for rule, checks in value.items()
+                }
+                if isinstance(value, dict)
+                else sorted(value)
+            )
+            for key, value in result.items()
+        }
+        for result in results
+    ]
+
+
+def test_stateless_request(context, tmp_path):
+    """Stateless results match in process compliance run"""
+    schema_file = tmp_path / "schema.json"
+    schema_file.write_text(json.dumps({**SCHEMA, "tagging": {"taggable": False}}))
+    response = handle_request(
+        context,
+        _request("stateless", {"schemas": [SCHEMA, "file:/" + str(schema_file)]}),
+    )
+    assert response["id"] == 1
+    expected = exec_compliance(
+        Stateless(schemas=[SCHEMA, {**SCHEMA, "tagging": {"taggable": False}}])
+    )
+    assert _normalize(response["result"]) == _normalize(
+        [result.json for result in expected]
+    )
+
+
+def test_stateful_request(context):
+    """Stateful results match in process compliance run"""
+    current = {**SCHEMA, "primaryIdentifier": ["/properties/Id"]}
+    response = handle_request(
+        context,
+        _request("stateful", {"previous_schema": SCHEMA, "current_schema": current}),
+    )
+    expected = exec_compliance(
+        Stateful(
+            previous_schema=SCHEMA, current_schema=current, print_diff_to_console=False
+        )
+    )
+    assert _normalize(response["result"]) == _normalize(
+        [result.json for result in expected]
+    )
+    assert response["result"][0]["non_compliant"]
+
+
+def test_validate_request(context):
+    """Validate runs both modes when both are requested"""
+    response = handle_request(
+        context,
+        _request(
+            "validate",
+            {"schemas": [SCHEMA], "previous_schema": SCHEMA, "current_schema": SCHEMA},
+        ),
+    )
+    assert set(response["result"]) == {"stateless", "stateful"}
+    assert len(response["result"]["stateless"]) == 1
+    assert len(response["result"]["stateful"]) == 1
+
+
+@pytest.mark.parametrize(
+    "message,code",
+    [
+        ("{not json", PARSE_ERROR),
+        ("[]", INVALID_REQUEST),
+        (json.dumps({"jsonrpc": "2.0", "id": 1}), INVALID_REQUEST),
+        (_request("unknown"), METHOD_NOT_FOUND),
+        (
+            json.dumps(
+                {"jsonrpc": "2.0", "id": 1, "method": "stateless", "params": []}
+            ),
+            INVALID_PARAMS,
+        ),
+        (_request("stateless", {"schemas": "file://schema.json"}), INVALID_PARAMS),
+        (_request("stateless", {"schemas": [1]}), INVALID_PARAMS),
+        (_request("stateless", {"schemas": ["schema.json"]}), INVALID_PARAMS),
+        (_request("stateless", {"schemas": ["file://missing.json"]}), INVALID_PARAMS),
+        (_request("stateful", {"previous_schema": SCHEMA}), INVALID_PARAMS),
+        (_request("validate", {}), INVALID_PARAMS),
+        (
+            _request(
+                "stateful",
+                {
+                    "previous_schema": SCHEMA,
+                    "current_schema": {
+                        **SCHEMA,
+                        "properties": {"Name": {"anyOf": [{"type": "string"}]}},
+                    },
+                },
+            ),
+            INTERNAL_ERROR,
+        ),
+    ],
+)
+def test_request_errors(context, message, code):
+    """Invalid requests are answered with JSON-RPC errors"""
+    response = handle_request(context, message)
+    assert response["error"]["code"] == code
+    assert "result" not in response
+
+
+def test_notification_is_not_answered(context):
+    """Requests without id do not get a response"""
+    assert handle_request(context, _request("stateless", {"schemas": []}, None)) is None
+
+
+def test_serve(context):
+    """Server answers every request in order and stops on shutdown"""
+    input_stream = io.StringIO(
+        "\n".join(
+            [
+                _request("stateless", {"schemas": [SCHEMA]}, 1),
+                "",
+                _request("unknown", request_id=2),
+                _request("shutdown", request_id=3),
+                _request("stateless", {"schemas": [SCHEMA]}, 4),
+            ]
+        )
+        + "\n"
+    )
+    output_stream = io.StringIO()
+    serve(input_stream, output_stream, context=ServerContext(ruleset=context.ruleset))
+
+    responses = [json.loads(line) for line in output_stream.getvalue().splitlines()]
+    assert [response["id"] for response in responses] == [1, 2, 3]
+    assert "result" in responses[0]
+    assert responses[1]["error"]["code"] == METHOD_NOT_FOUND
+    assert responses[2]["result"] is None
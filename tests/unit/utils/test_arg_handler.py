@@ -2,6 +2,7 @@
 import argparse
 import os
 from pathlib import Path
+from unittest import mock
 
 import pytest
 
@@ -9,6 +10,8 @@ from rpdk.guard_rail.utils.arg_handler import (
     argument_validation,
     collect_rules,
     collect_schemas,
+    iter_schemas,
+    positive_int,
     rule_input_path_validation,
     schema_input_path_validation,
     setup_args,
@@ -20,6 +23,38 @@ def test_arg_parse_setup():
     assert setup_args()
 
 
+def test_logging_args():
+    """test logging is off unless level or file is specified"""
+    args = setup_args().parse_args(["--schema", "file://schema.json"])
+    assert args.log_level is None
+    assert args.log_file is None
+    args = setup_args().parse_args(
+        [
+            "--schema",
+            "file://schema.json",
+            "--log-level",
+            "debug",
+            "--log-file",
+            "x.log",
+        ]
+    )
+    assert args.log_level == "DEBUG"
+    assert args.log_file == "x.log"
+
+
+@pytest.mark.parametrize("value,expected", [("1", 1), ("8", 8)])
+def test_positive_int(value, expected):
+    """test positive integer argument type"""
+    assert positive_int(value) == expected
+
+
+@pytest.mark.parametrize("value", ["0", "-2"])
+def test_positive_int_invalid(value):
+    """test positive integer argument type rejects non positive values"""
+    with pytest.raises(argparse.ArgumentTypeError):
+        positive_int(value)
+
+
 @pytest.mark.parametrize(
     "schemas,stateful,expect_to_pass",
     [
@@ -123,6 +158,18 @@ def test_collect_empty_schemas_argument():
     assert not collect_schemas(schemas=[])
 
 
+@mock.patch("rpdk.guard_rail.utils.arg_handler.read_json")
+def test_iter_schemas_lazy(mock_read_json):
+    """test schemas are validated upfront and read on demand"""
+    mock_read_json.return_value = {"foo": "bar"}
+    schemas = iter_schemas(schemas=["file://dir/a.json", "file://dir/b.json"])
+    mock_read_json.assert_not_called()
+    assert next(schemas) == {"foo": "bar"}
+    mock_read_json.assert_called_once()
+    with pytest.raises(AssertionError):
+        iter_schemas(schemas=["file://dir/a.json", "file://dir/b.jpeg"])
+
+
 @pytest.mark.parametrize(
     "rules,expected_rules",
     [
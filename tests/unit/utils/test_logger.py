@@ -0,0 +1,60 @@
+"""unittest module to test logger"""
+import logging
+from unittest import mock
+
+import pytest
+
+from rpdk.guard_rail.utils.logger import (
+    LOG,
+    PACKAGE_LOGGER,
+    configure_logging,
+    logdebug,
+    stop_logging,
+)
+
+
+@logdebug
+def _add(left, right):
+    return left + right
+
+
+@pytest.fixture(autouse=True)
+def fixture_stop_logging():
+    """Restores default (disabled) logging after each test"""
+    yield
+    stop_logging()
+
+
+def test_logging_off_by_default():
+    """test decorated function does not log when logging is off"""
+    configure_logging()
+    assert not logging.getLogger(PACKAGE_LOGGER).handlers
+    with mock.patch.object(LOG, "debug") as mock_debug:
+        assert _add(1, 2) == 3
+    mock_debug.assert_not_called()
+
+
+def test_logging_to_file(tmp_path):
+    """test records are written to the log file through the queue"""
+    log_file = tmp_path / "guard-rail.log"
+    configure_logging(level="DEBUG", log_file=str(log_file))
+    assert _add(1, 2) == 3
+    stop_logging()
+
+    content = log_file.read_text(encoding="utf-8")
+    assert "_add started" in content
+    assert "_add complete" in content
+    assert not logging.getLogger(PACKAGE_LOGGER).handlers
+
+
+def test_logging_level(tmp_path):
+    """test records below configured level are dropped"""
+    log_file = tmp_path / "guard-rail.log"
+    configure_logging(level="INFO", log_file=str(log_file))
+    _add(1, 2)
+    LOG.info("info record")
+    stop_logging()
+
+    content = log_file.read_text(encoding="utf-8")
+    assert "info record" in content
+    assert "_add started" not in content
@@ -0,0 +1,81 @@
+"""unittest module to test memory report"""
+import tracemalloc
+
+from rpdk.guard_rail.utils.memory import record_memory
+from rpdk.guard_rail.utils.timing import stage, stages_enabled
+
+_RETAINED = []
+
+
+def _allocate(size):
+    return [bytearray(1024) for _ in range(size)]
+
+
+def test_record_memory():
+    """test peak and retained memory are recorded per stage"""
+    assert not tracemalloc.is_tracing()
+    with record_memory() as report:
+        assert tracemalloc.is_tracing()
+        assert stages_enabled()
+        with stage("outer"):
+            with stage("temporary"):
+                _allocate(2048)
+            with stage("retained"):
+                _RETAINED.append(_allocate(512))
+        with stage("temporary"):
+            _allocate(256)
+    _RETAINED.clear()
+    assert not tracemalloc.is_tracing()
+    assert not stages_enabled()
+
+    stages = report.stages
+    assert stages["temporary"].calls == 2
+    assert stages["temporary"].peak >= 2048 * 1024
+    assert stages["temporary"].retained < 64 * 1024
+    assert stages["retained"].retained >= 512 * 1024
+    # nested stages are included in the outer one
+    assert stages["outer"].peak >= stages["temporary"].peak
+    assert stages["outer"].retained >= stages["retained"].retained
+    assert report.peak >= stages["outer"].peak
+
+
+def test_record_memory_sites():
+    """test allocation sites are reported for outermost stages"""
+    with record_memory(top=3) as report:
+        with stage("retained"):
+            with stage("nested"):
+                _RETAINED.append(_allocate(512))
+    _RETAINED.clear()
+
+    assert not report.stages["nested"].sites
+    (stage_name, site, size), *_ = report.top_sites()
+    assert stage_name == "retained"
+    assert site.startswith(__file__)
+    assert size >= 512 * 1024
+    assert len(report.top_sites()) <= 3
+    document = report.json
+    assert document["stages"]["retained"]["calls"] == 1
+    assert document["top_sites"][0]["site"] == site
+
+
+def test_record_memory_nested():
+    """test nested reports reuse the active one"""
+    with record_memory() as outer:
+        with record_memory() as inner:
+            assert inner is outer
+        assert tracemalloc.is_tracing()
+    assert not tracemalloc.is_tracing()
+
+
+def test_record_memory_display(capsys):
+    """test report tables are printed to stderr"""
+    with record_memory() as report:
+        with stage("retained"):
+            _RETAINED.append(_allocate(16))
+    _RETAINED.clear()
+    report.display()
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert "Stage Memory" in captured.err
+    assert "Top Allocation Sites" in captured.err
+    assert "test_memory.py" in captured.err
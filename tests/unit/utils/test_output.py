@@ -0,0 +1,76 @@
+"""unittest module to test output writer"""
+import io
+import json
+from unittest import mock
+
+import pytest
+
+from rpdk.guard_rail.utils.output import json_encoder, write_documents
+
+DOCUMENTS = [
+    {"compliant": ["rule"], "non_compliant": {}},
+    {"compliant": [], "non_compliant": {"rule": [{"path": "/properties/Ä"}]}},
+]
+
+
+class _Stream(io.StringIO):
+    """records content at every flush"""
+
+    def __init__(self):
+        super().__init__()
+        self.flushed = []
+
+    def flush(self):
+        self.flushed.append(self.getvalue())
+
+
+@pytest.mark.parametrize("documents", [[], DOCUMENTS])
+def test_write_json(documents):
+    """test json output is a valid JSON array"""
+    stream = _Stream()
+    write_documents(iter(documents), "json", stream=stream)
+    assert json.loads(stream.getvalue()) == documents
+    assert stream.getvalue().endswith("\n")
+
+
+def test_write_ndjson():
+    """test ndjson output is a document per line, flushed one by one"""
+    stream = _Stream()
+    write_documents(iter(DOCUMENTS), "ndjson", stream=stream)
+    lines = stream.getvalue().splitlines()
+    assert [json.loads(line) for line in lines] == DOCUMENTS
+    assert stream.flushed == [lines[0] + "\n", lines[0] + "\n" + lines[1] + "\n"]
+
+
+def test_write_documents_streams():
+    """test documents are written before the next one is produced"""
+    stream = _Stream()
+
+    def __documents():
+        for document in DOCUMENTS:
+            yield document
+            assert stream.flushed[-1].endswith(json_encoder()(document))
+
+    write_documents(__documents(), "json", stream=stream)
+
+
+def test_write_documents_invalid_format():
+    """test unknown output format is rejected"""
+    with pytest.raises(ValueError):
+        write_documents([], "yaml", stream=io.StringIO())
+
+
+def test_json_encoder_fallback():
+    """test standard library encoder is used without orjson"""
+    with mock.patch.dict("sys.modules", {"orjson": None}):
+        encode = json_encoder()
+    assert encode({"a": {"b"}, "c": "Ä"}) == '{"a":["b"],"c":"Ä"}'
+    with pytest.raises(TypeError):
+        encode({"a": object()})
+
+
+def test_json_encoder():
+    """test available encoder produces compact JSON of sets"""
+    encode = json_encoder()
+    assert json.loads(encode({"a": {"b"}, "c": [1, 2]})) == {"a": ["b"], "c": [1, 2]}
+    assert " " not in encode({"a": [1, 2]})
@@ -0,0 +1,98 @@
+"""unittest module to test profiling"""
+import os
+import pstats
+
+from rpdk.guard_rail.utils.profiling import (
+    PROFILE_ENV,
+    collapse_stacks,
+    collapsed_path,
+    profile,
+    profiled,
+)
+
+
+def _leaf():
+    return sum(range(20000))
+
+
+def _branch():
+    return _leaf() + _leaf()
+
+
+@profiled
+def _run():
+    return _branch()
+
+
+def _read_collapsed(path):
+    with open(collapsed_path(path), "r", encoding="utf-8") as file:
+        return [line.rsplit(" ", 1) for line in file.read().splitlines()]
+
+
+def test_collapsed_path():
+    """test collapsed stacks are written next to the pstats file"""
+    assert collapsed_path("/tmp/out.prof") == "/tmp/out.collapsed"
+    assert collapsed_path("out") == "out.collapsed"
+
+
+def test_profile(tmp_path):
+    """test profile writes pstats and collapsed stacks"""
+    path = str(tmp_path / "out.prof")
+    with profile(path):
+        _branch()
+
+    assert pstats.Stats(path).total_calls > 0
+    lines = _read_collapsed(path)
+    assert lines
+    assert all(int(value) > 0 for _, value in lines)
+    assert any(
+        "_branch (test_profiling.py" in stack and stack.endswith(")")
+        for stack, _ in lines
+    )
+
+
+def test_profile_disabled(tmp_path, monkeypatch):
+    """test nothing is profiled without path"""
+    monkeypatch.delenv(PROFILE_ENV, raising=False)
+    monkeypatch.chdir(tmp_path)
+    with profile():
+        _branch()
+    assert _run() == 2 * sum(range(20000))
+    assert not os.listdir(tmp_path)
+
+
+def test_profiled_env(tmp_path, monkeypatch):
+    """test environment variable enables profiling, nested profiles are skipped"""
+    path = str(tmp_path / "env.prof")
+    monkeypatch.setenv(PROFILE_ENV, path)
+    with profile():
+        _run()
+    assert os.path.exists(path)
+    # nested run did not overwrite profile of the outer one
+    assert pstats.Stats(path).total_calls > 0
+    assert sorted(os.listdir(tmp_path)) == ["env.collapsed", "env.prof"]
+
+
+def test_collapse_stacks_splits_shared_callee():
+    """test time of a callee is split between its callers"""
+    root = ("main.py", 1, "main")
+    left = ("main.py", 10, "left")
+    right = ("main.py", 20, "right")
+    shared = ("lib.py", 5, "shared")
+    stats_data = {
+        root: (1, 1, 0.0, 4.0, {}),
+        left: (1, 1, 0.0, 1.0, {root: (1, 1, 0.0, 1.0)}),
+        right: (1, 1, 1.0, 3.0, {root: (1, 1, 1.0, 3.0)}),
+        shared: (
+            2,
+            2,
+            3.0,
+            3.0,
+            {left: (1, 1, 1.0, 1.0), right: (1, 1, 2.0, 2.0)},
+        ),
+    }
+    assert collapse_stacks(stats_data) == {
+        "main (main.py:1);left (main.py:10);shared (lib.py:5)": 1_000_000,
+        "main (main.py:1);right (main.py:20)": 1_000_000,
+        "main (main.py:1);right (main.py:20);shared (lib.py:5)": 2_000_000,
+    }
@@ -0,0 +1,115 @@
+"""unittest module to test result renderers"""
+import io
+
+import pytest
+
+from rpdk.guard_rail.core.data_types import GuardRuleResult, GuardRuleSetResult
+from rpdk.guard_rail.utils.render import MAX_COLUMN_WIDTH, PLAIN_COLUMNS, render, rows
+
+RESULT = GuardRuleSetResult(
+    compliant=["passing"],
+    non_compliant={
+        "failing": [GuardRuleResult(check_id="ID001", message="failed", path="/a")]
+    },
+    warning={"warning": [GuardRuleResult(check_id="ID002", message="warned")]},
+    skipped=["skipped"],
+)
+
+
+def _render(renderer, result=RESULT, max_rows=None):
+    stream = io.StringIO()
+    render(result, renderer=renderer, max_rows=max_rows, stream=stream)
+    return stream.getvalue()
+
+
+def test_rows():
+    """test rows are ordered by status as in the rich table"""
+    assert list(rows(RESULT)) == [
+        ("skipped", "-", "-", "-", "skipped"),
+        ("passing", "-", "-", "-", "passed"),
+        ("warning", "ID002", "warned", "-", "warning"),
+        ("failing", "ID001", "failed", "/a", "failed"),
+    ]
+
+
+def test_render_plain():
+    """test plain renderer pads columns to the widest value"""
+    assert _render("plain").splitlines() == [
+        "Schema Compliance Report",
+        "Rule Name  Check Id  Status   Path  Message",
+        "---------  --------  -------  ----  -------",
+        "skipped    -         skipped  -     -",
+        "passing    -         passed   -     -",
+        "warning    ID002     warning  -     warned",
+        "failing    ID001     failed   /a    failed",
+    ]
+
+
+def test_render_plain_long_values():
+    """test long rule names are truncated, paths and messages are kept in full"""
+    long_rule = "ensure_" + "a" * 100
+    long_message = "property must not be updated " * 5
+    long_path = "/properties/" + "/".join(["Nested"] * 20)
+    result = GuardRuleSetResult(
+        compliant=["passing"],
+        non_compliant={
+            long_rule: [
+                GuardRuleResult(check_id="ID001", message=long_message, path=long_path)
+            ]
+        },
+    )
+    header, separator, *lines = _render("plain", result).splitlines()[1:]
+    starts = [header.index(column) for column in PLAIN_COLUMNS]
+    assert starts[1] == MAX_COLUMN_WIDTH + 2
+    for line in [separator] + lines:
+        for start in starts[1:]:
+            # every column is preceded by the two spaces separating columns
+            assert line[start - 2 : start] == "  " and line[start] != " "
+    assert lines[1].startswith(long_rule[: MAX_COLUMN_WIDTH - 1] + "…")
+    assert lines[1][starts[3] :].startswith(long_path + "  ")
+    assert lines[1].endswith(long_message.rstrip())
+
+
+def test_render_stream_escapes_values():
+    """test tabs and newlines in values do not split stream rows or columns"""
+    result = GuardRuleSetResult(
+        non_compliant={
+            "rule": [
+                GuardRuleResult(
+                    check_id="ID001", message="first\tsecond\nthird", path="C:\\a"
+                )
+            ]
+        },
+    )
+    lines = _render("stream", result).splitlines()
+    assert len(lines) == 2
+    assert lines[1].split("\t") == [
+        "rule",
+        "ID001",
+        "first\\tsecond\\nthird",
+        "C:\\\\a",
+        "failed",
+    ]
+
+
+@pytest.mark.parametrize("renderer", ["rich", "plain", "stream"])
+def test_render_max_rows(renderer):
+    """test renderers cap rows and count the omitted ones"""
+    output = _render(renderer, max_rows=1)
+    assert "skipped" in output
+    assert "failing" not in output
+    assert "... 3 more rows not shown (--max-rows)" in output
+    assert "more rows not shown" not in _render(renderer, max_rows=4)
+
+
+def test_render_rich():
+    """test rich renderer lists all rows"""
+    output = _render("rich")
+    assert "Schema Compliance Report" in output
+    assert all(rule in output for rule in ("skipped", "passing", "warning", "failing"))
+
+
+def test_render_unknown_renderer():
+    """test unknown renderers are rejected"""
+    with pytest.raises(ValueError):
+        render(RESULT, renderer="html")
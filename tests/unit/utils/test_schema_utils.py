@@ -1,11 +1,18 @@
 """unittest module to test schema utils"""
 import os
+import sys
 from pathlib import Path
+from unittest import mock
 
 import pytest
+from jsonschema import RefResolver
 
 from rpdk.guard_rail.utils.arg_handler import collect_schemas
-from rpdk.guard_rail.utils.schema_utils import add_paths_to_schema, resolve_schema
+from rpdk.guard_rail.utils.schema_utils import (
+    _resolve_local_ref,
+    add_paths_to_schema,
+    resolve_schema,
+)
 
 
 @pytest.mark.parametrize(
@@ -153,3 +160,132 @@ def test_add_tag_path(schema, result):
     schema_with_paths = add_paths_to_schema(collected_schemas_to_resolve[0])
     assert "TaggingPath" in schema_with_paths
     assert schema_with_paths["TaggingPath"] == "/properties/Description/Tags"
+
+
+def test_resolve_schema_shared_definitions():
+    """Unit test to verify shared definitions are resolved once"""
+    schema = {
+        "definitions": {
+            "Tag": {
+                "type": "object",
+                "properties": {
+                    "Key": {"type": "string"},
+                    "Value": {"$ref": "#/definitions/Value"},
+                },
+            },
+            "Value": {"type": "string", "maxLength": 256},
+        },
+        "properties": {
+            "Tags": {"type": "array", "items": {"$ref": "#/definitions/Tag"}},
+            "OtherTags": {"type": "array", "items": {"$ref": "#/definitions/Tag"}},
+            "Tag": {"$ref": "#/definitions/Tag", "description": "single tag"},
+        },
+    }
+    expected_tag = {
+        "type": "object",
+        "properties": {
+            "Key": {"type": "string"},
+            "Value": {"type": "string", "maxLength": 256},
+        },
+    }
+    with mock.patch(
+        "rpdk.guard_rail.utils.schema_utils._resolve_local_ref",
+        side_effect=_resolve_local_ref,
+    ) as mock_resolve, mock.patch.object(RefResolver, "resolve") as mock_resolver:
+        resolved = resolve_schema(schema)
+
+    assert mock_resolve.call_count == 2
+    mock_resolver.assert_not_called()
+    assert resolved == {
+        "properties": {
+            "Tags": {"type": "array", "items": expected_tag},
+            "OtherTags": {"type": "array", "items": expected_tag},
+            "Tag": {**expected_tag, "description": "single tag"},
+        }
+    }
+
+
+def test_resolve_schema_recursive_definitions():
+    """Unit test to verify recursive refs are expanded once per branch"""
+    schema = {
+        "definitions": {
+            "Node": {
+                "type": "object",
+                "properties": {
+                    "Name": {"type": "string"},
+                    "Children": {
+                        "type": "array",
+                        "items": {"$ref": "#/definitions/Node"},
+                    },
+                },
+            },
+        },
+        "properties": {
+            "Root": {"$ref": "#/definitions/Node"},
+            "Other": {"$ref": "#/definitions/Node"},
+        },
+    }
+    resolved = resolve_schema(schema)
+
+    for name in ("Root", "Other"):
+        children = resolved["properties"][name]["properties"]["Children"]
+        assert children == {"type": "array", "items": {}}
+
+
+def test_resolve_schema_deep_ref_chain():
+    """Unit test to verify refs nested deeper than recursion limit are resolved"""
+    depth = sys.getrecursionlimit() * 2
+    definitions = {
+        f"Node{index}": {
+            "type": "object",
+            "properties": {"Next": {"$ref": f"#/definitions/Node{index + 1}"}},
+        }
+        for index in range(depth)
+    }
+    definitions[f"Node{depth}"] = {"type": "string"}
+    schema = {
+        "definitions": definitions,
+        "properties": {"Root": {"$ref": "#/definitions/Node0"}},
+    }
+    node = resolve_schema(schema)["properties"]["Root"]
+    for _ in range(depth):
+        node = node["properties"]["Next"]
+    assert node == {"type": "string"}
+
+
+def test_add_paths_to_deeply_nested_schema():
+    """Unit test to verify schema nested deeper than recursion limit is traversed"""
+    depth = sys.getrecursionlimit() + 500
+    nested = {"type": "string"}
+    for _ in range(depth):
+        nested = {"type": "object", "properties": {"Nested": nested}}
+    schema = {"properties": {"Root": {"type": "array", "items": nested}}}
+
+    paths = add_paths_to_schema(schema)["paths"]
+
+    assert len(paths) == depth + 1
+    assert "/properties/Root/" + "/".join(["*"] + ["Nested"] * depth) in paths
+
+
+@pytest.mark.parametrize(
+    "reference_path,result",
+    [
+        ("#/definitions/Tag", {"type": "object"}),
+        ("#/definitions/a~1b~0c", {"type": "string"}),
+        ("#/definitions/with%20space", {"type": "integer"}),
+        ("#/definitions/List/1", {"type": "number"}),
+        ("#/definitions/Missing", None),
+        ("other.json#/definitions/Tag", None),
+    ],
+)
+def test_resolve_local_ref(reference_path, result):
+    """Unit test to verify refs into the schema are resolved without jsonschema"""
+    schema = {
+        "definitions": {
+            "Tag": {"type": "object"},
+            "a/b~c": {"type": "string"},
+            "with space": {"type": "integer"},
+            "List": [{"type": "null"}, {"type": "number"}],
+        }
+    }
+    assert _resolve_local_ref(schema, reference_path) == result
@@ -0,0 +1,108 @@
+"""unittest module to test timing"""
+import pytest
+
+from rpdk.guard_rail.utils.timing import (
+    Timings,
+    add_timings,
+    observe_stages,
+    record_timings,
+    stage,
+    stages_enabled,
+    timed,
+    timings_enabled,
+)
+
+
+@timed("add")
+def _add(left, right):
+    return left + right
+
+
+def test_stage_without_recorder():
+    """test stages are not measured unless a recorder is active"""
+    assert not timings_enabled()
+    with stage("noop"):
+        pass
+    assert _add(1, 2) == 3
+
+
+def test_nested_recorders():
+    """test stages add up in every active recorder"""
+    with record_timings() as outer:
+        assert timings_enabled()
+        with stage("outer"):
+            with record_timings() as inner:
+                assert _add(1, 2) == 3
+                assert _add(2, 3) == 5
+    assert not timings_enabled()
+
+    assert set(inner.stages) == {"add"}
+    assert inner.stages["add"].calls == 2
+    assert set(outer.stages) == {"add", "outer"}
+    assert outer.stages["add"].calls == 2
+    assert outer.stages["outer"].wall >= outer.stages["add"].wall
+
+
+def test_stage_records_failures():
+    """test stage is measured when enclosed code raises"""
+    with record_timings() as timings:
+        with pytest.raises(ValueError):
+            with stage("failing"):
+                raise ValueError()
+    assert timings.stages["failing"].calls == 1
+
+
+def test_timings_json_roundtrip():
+    """test timings restored from JSON document add up"""
+    timings = Timings()
+    timings.add("stage", wall=1.0, cpu=0.5)
+    restored = Timings()
+    restored.update(timings.json)
+    restored.update(timings.json)
+    assert restored.json == {"stage": {"wall": 2.0, "cpu": 1.0, "calls": 2}}
+
+    with record_timings() as active:
+        add_timings(timings.json)
+    assert active.json == timings.json
+
+
+def test_timings_display(capsys):
+    """test summary table is printed to stderr"""
+    timings = Timings()
+    timings.add("run_checks:rule", wall=0.5, cpu=0.25)
+    timings.display()
+    captured = capsys.readouterr()
+    assert not captured.out
+    assert "run_checks:rule" in captured.err
+
+
+def test_observe_stages():
+    """test observers are notified on enter and exit of every stage"""
+
+    class __Observer:
+        def __init__(self):
+            self.events = []
+
+        def enter(self, name):
+            """records enter"""
+            self.events.append(("enter", name))
+            return name.upper()
+
+        def exit(self, name, token):
+            """records exit"""
+            self.events.append(("exit", name, token))
+
+    observer = __Observer()
+    assert not stages_enabled()
+    with observe_stages(observer):
+        assert stages_enabled()
+        assert not timings_enabled()
+        with stage("outer"):
+            assert _add(1, 2) == 3
+    assert not stages_enabled()
+    assert observer.events == [
+        ("enter", "outer"),
+        ("enter", "add"),
+        ("exit", "add", "ADD"),
+        ("exit", "outer", "OUTER"),
+    ]